@@ -0,0 +1,469 @@
+"""
+Performance benchmarks over a config0.json scale trigger set.
+
+    python -m test.benchmarks
+    python -m test.benchmarks --update-baseline
+    python -m test.benchmarks --only dispatch --output results.json
+
+Every benchmark reports seconds per operation, the best of a few repeats.
+Results are written as JSON and compared against test/benchmark_baseline.json:
+a benchmark more than --tolerance slower than its baseline fails the run.
+Baselines are machine specific: the committed ones were measured on one
+developer machine, and on another a run commonly reports several benchmarks
+as SLOWER without anything having regressed. Refresh them with
+--update-baseline on the machine the comparison runs on, before the change
+being measured.
+"""
+import os
+import re
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import ujson as json
+
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG = os.path.join(ROOT, "config0.json")
+BASELINE = os.path.join(ROOT, "test", "benchmark_baseline.json")
+
+FILLER = [
+    "You hit a gnoll for 12 points of damage.",
+    "Bob tells the guild, 'inc'",
+    "a gnoll hits YOU for 5 points of damage.",
+    "You have entered Blackburrow.",
+    "Auction: WTS Fine Steel Sword 5pp",
+    "Your faction standing with Guards got worse.",
+]
+
+BENCHMARKS = []
+
+def benchmark(name, repeat=3, qt=False):
+    def register(function):
+        BENCHMARKS.append((name, function, repeat, qt))
+        return function
+    return register
+
+
+def load_config():
+    with open(CONFIG, 'r') as openfile:
+        return json.load(openfile)
+
+def trigger_items(config):
+    items = []
+    def walk(item):
+        if item["type"] == "Trigger":
+            items.append(item)
+        else:
+            for child in item["children"]:
+                walk(child)
+    for item in config["trigger_groups"]:
+        walk(item)
+    return items
+
+def synthetic_lines(config, count, match_ratio=0.05, seed=1):
+    """
+    EQ log lines, mostly common chatter plus match_ratio of lines built from
+    the plain text triggers of the config so a share of them fire.
+    """
+    texts = [re.sub(r"\{[A-Za-z]\d?\}", "Bob", item["search_text"]).replace("*", "word")
+             for item in trigger_items(config) if not item["use_regex"]]
+    rng = random.Random(seed)
+    timestamp = datetime(2024, 8, 11, 20, 0, 0)
+    lines = []
+    for i in range(count):
+        if i % 4 == 0:
+            timestamp += timedelta(seconds=1)
+        text = rng.choice(texts) if rng.random() < match_ratio else rng.choice(FILLER)
+        lines.append((timestamp, text))
+    return lines
+
+def search_texts(config):
+    texts = []
+    for item in trigger_items(config):
+        text = item["search_text"]
+        if not item["use_regex"]:
+            text = text.replace("*", "\\w+")
+        texts.append(text)
+    return texts
+
+
+@benchmark("regex_compile")
+def bench_regex_compile(context):
+    """Compiling every trigger pattern of the config."""
+    from volt.utils.regex_engine import RegexEngine
+    texts = search_texts(context["config"])
+    re.purge()
+    start = time.perf_counter()
+    for text in texts:
+        RegexEngine().compile(text)
+    return time.perf_counter() - start
+
+@benchmark("regex_compile_cached")
+def bench_regex_compile_cached(context):
+    """Compiling every trigger pattern of the config from a warm PatternCache."""
+    from volt.utils.regex_engine import RegexEngine, translation_version
+    from volt.utils.pattern_cache import PatternCache
+    texts = search_texts(context["config"])
+    with tempfile.TemporaryDirectory() as directory:
+        cache = PatternCache(os.path.join(directory, "pattern_cache.json"), translation_version(), flush_interval=3600)
+        try:
+            RegexEngine.cache = cache
+            for text in texts:
+                RegexEngine().compile(text)
+            re.purge()
+            start = time.perf_counter()
+            for text in texts:
+                RegexEngine().compile(text)
+            elapsed = time.perf_counter() - start
+        finally:
+            RegexEngine.cache = None
+            cache.timer.cancel()
+    return elapsed
+
+@benchmark("regex_match_execute")
+def bench_regex_match_execute(context):
+    """One match and execute of a matching line, per call."""
+    from volt.utils.regex_engine import RegexEngine
+    lines = [text for timestamp, text in synthetic_lines(context["config"], 2000, match_ratio=1)]
+    engines = []
+    for text in search_texts(context["config"]):
+        engine = RegexEngine()
+        engine.compile(text)
+        engines.append(engine)
+    samples = []
+    for text in lines:
+        for engine in engines:
+            if engine.match(text):
+                samples.append((engine, text))
+                break
+    start = time.perf_counter()
+    for engine, text in samples:
+        engine.execute("{s} - {1}", matches=engine.match(text))
+    return (time.perf_counter() - start) / len(samples)
+
+@benchmark("timestamp_parse")
+def bench_timestamp_parse(context):
+    """Parsing one log timestamp, a handful of lines per second as in a busy raid log."""
+    from volt.utils.timestamp_parser import TimestampParser
+    value = datetime(2024, 8, 11, 20, 0, 0)
+    dates = []
+    for i in range(100000):
+        if i % 5 == 0:
+            value += timedelta(seconds=1)
+        dates.append(value.strftime('%a %b %d %H:%M:%S %Y'))
+    parser = TimestampParser()
+    start = time.perf_counter()
+    for sdate in dates:
+        parser.parse(sdate)
+    return (time.perf_counter() - start) / len(dates)
+
+@benchmark("replay_dispatch")
+def bench_replay_dispatch(context):
+    """Qt free dispatch of one line through every trigger, see volt.replay."""
+    from collections import Counter
+    from volt.replay import load_triggers, replay
+    stats = Counter()
+    triggers = load_triggers(context["config"])
+    lines = synthetic_lines(context["config"], 20000)
+    start = time.perf_counter()
+    replay(triggers, lines, stats)
+    return (time.perf_counter() - start) / len(lines)
+
+@benchmark("sqlite_store_save")
+def bench_sqlite_store_save(context):
+    """Saving the config to the SQLite store after renaming one trigger."""
+    from volt.utils.config_store import SqliteConfigStore
+    config = json.loads(json.dumps(context["config"]))
+    with tempfile.TemporaryDirectory() as directory:
+        store = SqliteConfigStore(os.path.join(directory, "config.db"))
+        store.save(config)
+        trigger_items(config)[0]["name"] += " (renamed)"
+        start = time.perf_counter()
+        store.save(config)
+        return time.perf_counter() - start
+
+
+class QtContext():
+    """A full App loaded with config0.json, every trigger enabled, in a temp directory."""
+    def __init__(self, config):
+        self.directory = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.directory, "data"))
+        self.log_file = os.path.join(self.directory, "eqlog_Bench_P1999Green.txt")
+        open(self.log_file, 'w').close()
+
+        config = dict(config)
+        trigger_ids = [item["trigger_id"] for item in trigger_items(config)]
+        config["profiles"] = [{"name": "Bench", "log_file": self.log_file, "trigger_ids": trigger_ids}]
+        with open(os.path.join(self.directory, "data", "config.json"), 'w') as outfile:
+            outfile.write(json.dumps(config))
+
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)
+
+        from volt.app import App
+        self.app = App([os.path.join(ROOT, "main.py")])
+        self.window = [widget for widget in self.app.topLevelWidgets() if type(widget).__name__ == "MainWindow"][0]
+        self.profile = self.window.profiles_manager.profile_list.item(0)
+        self.app.current_profile = self.profile
+
+    def pump(self, seconds):
+        from PySide6.QtCore import QEventLoop, QTimer
+        loop = QEventLoop()
+        QTimer.singleShot(int(seconds * 1000), loop.quit)
+        loop.exec()
+
+    def clearTimers(self):
+        for overlay in self.window.overlays_manager.timer_overlays:
+            for timer in list(overlay.triggers):
+                timer.destroy()
+        for overlay in self.window.overlays_manager.text_overlays:
+            for text in list(overlay.triggers):
+                text.destroy()
+        self.pump(0.1)
+
+    def close(self):
+        self.window.destroy()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+@benchmark("dispatch", qt=True)
+def bench_dispatch(context):
+    """One line through the TriggerDispatcher and Trigger.onLogUpdate."""
+    qt = context["qt"]
+    lines = synthetic_lines(context["config"], 2000)
+    start = time.perf_counter()
+    qt.app.trigger_dispatcher.onLogLines(qt.profile, lines)
+    elapsed = time.perf_counter() - start
+    qt.clearTimers()
+    return elapsed / len(lines)
+
+@benchmark("config_load", repeat=2, qt=True)
+def bench_config_load(context):
+    """Rebuilding the trigger tree from the config."""
+    qt = context["qt"]
+    triggers_manager = qt.window.triggers_manager
+    triggers_manager.clear()
+    start = time.perf_counter()
+    triggers_manager.load(context["config"]["trigger_groups"])
+    return time.perf_counter() - start
+
+@benchmark("config_load_lazy", repeat=2, qt=True)
+def bench_config_load_lazy(context):
+    """Rebuilding the trigger tree with no trigger enabled, groups left to populate on expand."""
+    qt = context["qt"]
+    triggers_manager = qt.window.triggers_manager
+    triggers_manager.clear()
+    start = time.perf_counter()
+    triggers_manager.load(context["config"]["trigger_groups"], trigger_ids=set())
+    elapsed = time.perf_counter() - start
+    triggers_manager.clear()
+    triggers_manager.load(context["config"]["trigger_groups"])
+    return elapsed
+
+@benchmark("group_toggle", qt=True)
+def bench_group_toggle(context):
+    """Unchecking and checking back the largest top level trigger group."""
+    from PySide6.QtCore import Qt
+    qt = context["qt"]
+    qt.window.profiles_manager.selected_profile = qt.profile
+    trigger_list = qt.window.triggers_manager.trigger_list
+    groups = [trigger_list.topLevelItem(i) for i in range(trigger_list.topLevelItemCount())]
+    group = max(groups, key=lambda group: group.childCount())
+    state = group.checkState(0)
+    start = time.perf_counter()
+    group.setCheckState(0, Qt.Unchecked)
+    group.setCheckState(0, Qt.Checked)
+    elapsed = time.perf_counter() - start
+    group.setCheckState(0, state)
+    return elapsed
+
+@benchmark("profile_switch", qt=True)
+def bench_profile_switch(context):
+    """Switching to a profile with a tenth of the triggers disabled and back."""
+    from volt.models.profile import Profile
+    qt = context["qt"]
+    profiles_manager = qt.window.profiles_manager
+    trigger_ids = qt.profile.trigger_ids
+    other = Profile(profiles_manager.profile_list, name="Other", log_file="",
+                    trigger_ids=[trigger_id for i, trigger_id in enumerate(trigger_ids) if i % 10])
+    profiles_manager.setTriggers(qt.profile)
+    start = time.perf_counter()
+    profiles_manager.setTriggers(other)
+    profiles_manager.setTriggers(qt.profile)
+    elapsed = time.perf_counter() - start
+    profiles_manager.profile_list.takeItem(profiles_manager.profile_list.row(other))
+    return elapsed / 2
+
+@benchmark("config_save", qt=True)
+def bench_config_save(context):
+    """GUI thread time of a save, the snapshot handed to the writer thread."""
+    qt = context["qt"]
+    config_manager = qt.window.config_manager
+    start = time.perf_counter()
+    config_manager.save()
+    config_manager.flush()
+    elapsed = time.perf_counter() - start
+    config_manager.writer.wait()
+    return elapsed
+
+@benchmark("config_write", qt=True)
+def bench_config_write(context):
+    """Serializing and writing a snapshot on the writer thread."""
+    qt = context["qt"]
+    config_manager = qt.window.config_manager
+    config_manager.save()
+    config_manager.flush(wait=True)
+    return config_manager.saveMetrics()["last_ms"] / 1000
+
+@benchmark("trigger_log_add", qt=True)
+def bench_trigger_log_add(context):
+    """Logging a fire to a full trigger log on screen, in bursts of 20 per event loop pass."""
+    qt = context["qt"]
+    trigger_log_manager = qt.window.trigger_log_manager
+    qt.window.tabs.setCurrentWidget(trigger_log_manager.tab)
+    for i in range(1000):
+        trigger_log_manager.addItem("2024-08-11 10:51:53 AM", f"Group / Trigger {i}", "You have slain a gnoll!")
+    qt.pump(0.1)
+    start = time.perf_counter()
+    for i in range(200):
+        trigger_log_manager.addItem("2024-08-11 10:51:53 AM", f"Group / Trigger {i}", "You have slain a gnoll!")
+        if i % 20 == 19:
+            qt.pump(0)
+    return (time.perf_counter() - start) / 200
+
+def timer_ticks(context, count):
+    """CPU seconds spent per wall clock second with count timers running."""
+    qt = context["qt"]
+    overlay = qt.window.overlays_manager.timer_overlays[0]
+    category = qt.window.categories_manager.category_list.item(0)
+    trigger = qt.window.triggers_manager.triggers()[0]
+    for i in range(count):
+        timer = overlay.addTimer(f"Timer {i}", 3600 + i, trigger=trigger, category=category, profile=qt.profile)
+        qt.app._signals['timers'].append(timer)
+        trigger.runtime(qt.profile).timers.append(timer)
+    qt.pump(0.2)
+    start = time.process_time()
+    qt.pump(3.0)
+    elapsed = (time.process_time() - start) / 3.0
+    qt.clearTimers()
+    return elapsed
+
+@benchmark("timer_insert_500", qt=True)
+def bench_timer_insert(context):
+    """Adding 500 timers to a timer overlay sorted by timer text."""
+    qt = context["qt"]
+    overlay = qt.window.overlays_manager.timer_overlays[0]
+    category = qt.window.categories_manager.category_list.item(0)
+    trigger = qt.window.triggers_manager.triggers()[0]
+    sort_method = overlay.data_model.sort_method
+    overlay.data_model.sort_method = "Timer Text"
+    rng = random.Random(1)
+    labels = [f"Spawn {rng.randrange(1000)}" for i in range(500)]
+    start = time.perf_counter()
+    for label in labels:
+        timer = overlay.addTimer(label, 3600, trigger=trigger, category=category, profile=qt.profile)
+        qt.app._signals['timers'].append(timer)
+        trigger.runtime(qt.profile).timers.append(timer)
+    elapsed = time.perf_counter() - start
+    overlay.data_model.sort_method = sort_method
+    qt.clearTimers()
+    return elapsed
+
+for count in (50, 200, 500):
+    benchmark(f"timer_ticks_{count}", repeat=1, qt=True)(
+        lambda context, count=count: timer_ticks(context, count))
+
+
+def run(names=None, repeat=None):
+    context = {"config": load_config()}
+    results = {}
+    for name, function, default_repeat, qt in BENCHMARKS:
+        if names and not any(part in name for part in names):
+            continue
+        if qt and "qt" not in context:
+            try:
+                context["qt"] = QtContext(context["config"])
+            except ImportError as e:
+                print(f"Skipping Qt benchmarks: {e}")
+                context["qt"] = None
+        if qt and context["qt"] is None:
+            continue
+        value = min(function(context) for i in range(repeat or default_repeat))
+        results[name] = value
+        print(f"{name:<24} {format_seconds(value)}")
+    if context.get("qt"):
+        context["qt"].close()
+    return results
+
+def format_seconds(value):
+    if value < 1e-3:
+        return f"{value * 1e6:10.2f} us"
+    if value < 1:
+        return f"{value * 1e3:10.2f} ms"
+    return f"{value:10.2f} s"
+
+def compare(results, baseline, tolerance):
+    """Prints the change against the baseline, returns the regressed names."""
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        ratio = value / baseline[name] if baseline[name] else 1
+        if ratio > 1 + tolerance:
+            status = "SLOWER"
+            regressions.append(name)
+        elif ratio < 1 - tolerance:
+            status = "faster"
+        else:
+            status = "ok"
+        print(f"{name:<24} {format_seconds(baseline[name])} -> {format_seconds(value)}  {ratio:6.2f}x  {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m test.benchmarks")
+    parser.add_argument("--only", nargs="*", help="only run benchmarks whose name contains one of these")
+    parser.add_argument("--repeat", type=int, help="override the number of repeats")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown as a fraction (default 0.25)")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.only, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            outfile.write(json.dumps(results, indent=4))
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.isfile(args.baseline):
+            with open(args.baseline, 'r') as openfile:
+                baseline = json.load(openfile)
+        baseline.update(results)
+        with open(args.baseline, 'w') as outfile:
+            outfile.write(json.dumps(baseline, indent=4))
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline, 'r') as openfile:
+        baseline = json.load(openfile)
+    print()
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"Slower than baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import unittest
+
+from types import SimpleNamespace
+
+from volt.utils.category_router import CategoryRouter
+
+def overlay(name):
+    return SimpleNamespace(data_model=SimpleNamespace(name=name))
+
+def category(name, timer_overlay, text_overlay):
+    return SimpleNamespace(name=name, timer_overlay=timer_overlay, text_overlay=text_overlay)
+
+class CategoryRouterTest(unittest.TestCase):
+    def setUp(self):
+        self.categories = [category("Default", "Timers", "Text"), category("Raid", "Raid", "Text")]
+        self.timer_overlays = [overlay("Timers"), overlay("Raid")]
+        # Overlay names are not unique, both get the texts
+        self.text_overlays = [overlay("Text"), overlay("Text")]
+        self.router = CategoryRouter(lambda: self.categories, lambda: self.timer_overlays,
+                                     lambda: self.text_overlays)
+
+    def test_routes(self):
+        routes = self.router.routes("Raid")
+        self.assertEqual(len(routes), 1)
+        self.assertIs(routes[0].category, self.categories[1])
+        self.assertEqual(routes[0].timer_overlays, [self.timer_overlays[1]])
+        self.assertEqual(routes[0].text_overlays, self.text_overlays)
+        self.assertEqual(self.router.routes("Missing"), ())
+
+    def test_invalidate(self):
+        self.router.routes("Default")
+        self.categories[0].timer_overlay = "Raid"
+        self.assertEqual(self.router.routes("Default")[0].timer_overlays, [self.timer_overlays[0]])
+        self.router.invalidate()
+        self.assertEqual(self.router.routes("Default")[0].timer_overlays, [self.timer_overlays[1]])
+
+    def test_removed_category(self):
+        removed = self.categories.pop()
+        self.router.invalidate()
+        self.assertEqual(self.router.routes("Raid"), ())
+        self.assertEqual(self.router.route(removed).timer_overlays, [self.timer_overlays[1]])
+        self.assertIs(self.router.route(self.categories[0]), self.router.routes("Default")[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import ujson as json
+
+from volt.utils.config_store import JsonConfigStore, SqliteConfigStore, main
+
+CONFIG = {
+    "top": 10,
+    "left": 20,
+    "profiles": [{"name": "Test", "log_file": "eqlog_Test.txt", "trigger_ids": ["a", "b"]}],
+    "overlays": [{"name": "Default", "type": "Timer"}, {"name": "Default", "type": "Text"}],
+    "categories": [{"name": "Default"}],
+    "webhooks": [],
+    "trigger_groups": [
+        {"type": "TriggerGroup", "group_id": 0, "name": "One", "children": [
+            {"type": "Trigger", "trigger_id": "a", "name": "A", "search_text": "a"},
+            {"type": "TriggerGroup", "group_id": 0, "name": "Two", "children": [
+                {"type": "Trigger", "trigger_id": "b", "name": "B", "search_text": "b"}
+            ]},
+            {"type": "Trigger", "trigger_id": "c", "name": "C", "search_text": "c"}
+        ]},
+        {"type": "TriggerGroup", "group_id": 5, "name": "Three", "children": []}
+    ]
+}
+
+class SqliteConfigStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "config.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        SqliteConfigStore(self.path).save(CONFIG)
+        self.assertEqual(SqliteConfigStore(self.path).load(), CONFIG)
+
+    def test_save_writes_changed_rows(self):
+        store = SqliteConfigStore(self.path)
+        store.save(CONFIG)
+        self.assertEqual(store.changes, 12)
+
+        config = json.loads(json.dumps(CONFIG))
+        config["trigger_groups"][0]["children"][0]["name"] = "Renamed"
+        del config["trigger_groups"][1]
+        store.save(config)
+        self.assertEqual(store.changes, 2)
+        store.save(config)
+        self.assertEqual(store.changes, 0)
+
+        self.assertEqual(SqliteConfigStore(self.path).load(), config)
+
+    def test_import_export(self):
+        json_path = os.path.join(self.directory.name, "config.json")
+        export_path = os.path.join(self.directory.name, "export.json")
+        JsonConfigStore(json_path).save(CONFIG)
+        self.assertEqual(main(["import", json_path, self.path]), 0)
+        self.assertEqual(main(["export", self.path, export_path]), 0)
+        self.assertEqual(JsonConfigStore(export_path).load(), CONFIG)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+import ujson as json
+
+from volt.utils.config_writer import ConfigWriter
+from volt.utils.config_store import JsonConfigStore
+
+class ConfigWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "config.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write(self):
+        writer = ConfigWriter(JsonConfigStore(self.path))
+        writer.write({"profiles": [{"name": "Test"}]})
+        self.assertTrue(writer.wait(5))
+        writer.stop()
+        with open(self.path, 'r') as f:
+            self.assertEqual(json.load(f), {"profiles": [{"name": "Test"}]})
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        self.assertEqual(writer.metrics()["saves"], 1)
+
+    def test_latest_snapshot_wins(self):
+        writer = ConfigWriter(JsonConfigStore(self.path))
+        for i in range(50):
+            writer.write({"version": i})
+        writer.stop()
+        with open(self.path, 'r') as f:
+            self.assertEqual(json.load(f), {"version": 49})
+        self.assertLessEqual(writer.metrics()["saves"], 50)
+
+    def test_failed_write_keeps_previous(self):
+        with open(self.path, 'w') as f:
+            f.write('{"version": 1}')
+        writer = ConfigWriter(JsonConfigStore(self.path))
+        writer.write({"version": object()})
+        self.assertTrue(writer.wait(5))
+        with open(self.path, 'r') as f:
+            self.assertEqual(json.load(f), {"version": 1})
+
+        writer.write({"version": 2})
+        writer.stop()
+        with open(self.path, 'r') as f:
+            self.assertEqual(json.load(f), {"version": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from volt.utils.fire_history import FireHistory
+from volt.models.fire_history_model import FireHistoryModel
+
+class FireHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.history = FireHistory(os.path.join(self.directory.name, "fire_history.db"), flush_interval=60)
+
+    def tearDown(self):
+        self.history.stop()
+        self.directory.cleanup()
+
+    def record(self):
+        for i in range(25):
+            profile = "Alpha" if i % 2 else "Beta"
+            self.history.record(f"2024-08-11 10:{i:02}:00", f"id{i % 5}", f"Group / Trigger {i % 5}",
+                                profile, f"You have slain gnoll {i}", ["gnoll"])
+
+    def test_flush_writes_one_batch(self):
+        self.record()
+        self.assertTrue(self.history.flush(5))
+        self.assertEqual(self.history.written, 25)
+        rows = self.history.query(limit=1000)
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[0][1:], ("2024-08-11 10:24:00", "Group / Trigger 4", "Beta", "You have slain gnoll 24"))
+
+    def test_unwritable_path(self):
+        history = FireHistory(os.path.join(self.directory.name, "missing", "fire_history.db"))
+        history.record("2024-08-11 10:51:53", "a", "Slain", "Alpha", "You have slain a gnoll!")
+        writer = history.thread
+        writer.join(5)
+        started = threading.active_count()
+        for i in range(10):
+            history.record("2024-08-11 10:51:54", "a", "Slain", "Alpha", "You have slain a gnoll!")
+        # One writer tried to open the database, the later fires are dropped
+        self.assertTrue(history.failed)
+        self.assertIs(history.thread, writer)
+        self.assertEqual(threading.active_count(), started)
+        self.assertEqual(history.pending, [])
+        history.stop()
+
+    def test_record_after_stop(self):
+        self.history.stop()
+        self.history.record("2024-08-11 10:51:53", "a", "Slain", "Alpha", "You have slain a gnoll!")
+        self.assertIsNone(self.history.thread)
+        self.assertEqual(self.history.pending, [])
+
+    def test_filters(self):
+        self.record()
+        self.history.flush(5)
+        self.assertEqual(len(self.history.query(profile="Alpha")), 12)
+        self.assertEqual(len(self.history.query(trigger_id="id3")), 5)
+        self.assertEqual(len(self.history.query(trigger_name="Trigger 3", text="gnoll 1")), 2)
+        self.assertEqual(len(self.history.query(since="2024-08-11 10:20", until="2024-08-11 10:22")), 2)
+
+    def test_model_pages(self):
+        self.record()
+        self.history.flush(5)
+        model = FireHistoryModel(self.history, page_size=10)
+        model.setFilters(profile="Beta")
+        self.assertEqual(model.rowCount(), 10)
+        self.assertTrue(model.canFetchMore())
+        model.fetchMore()
+        self.assertEqual(model.rowCount(), 13)
+        self.assertFalse(model.canFetchMore())
+        self.assertEqual(model.data(model.index(12, 3)), "You have slain gnoll 0")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from volt.utils.regex_engine import RegexEngine
+from volt.utils.literal_prefilter import LiteralPrefilter
+
+class LiteralPrefilterTest(unittest.TestCase):
+    def literals(self, text):
+        engine = RegexEngine()
+        engine.compile(text)
+        return engine.literals
+
+    def test_plain_text(self):
+        self.assertEqual(self.literals("Your Spirit of Wolf spell has worn off."),
+                         {"your spirit of wolf spell has worn off"})
+
+    def test_tags_split_literals(self):
+        self.assertEqual(self.literals("^{s1} tells the guild, 'R(ez|EZ) -- {s2}'$"),
+                         {" tells the guild, 'r"})
+
+    def test_branch(self):
+        self.assertEqual(self.literals("({s} has been slain by|you have slain {s1}!)"),
+                         {" has been slain by", "you have slain "})
+
+    def test_optional_parts_are_skipped(self):
+        self.assertEqual(self.literals("^(?:(?:[^ ]+) tells the guil)d, 'TASH(?>ED)?\\s+-+\\s+{s}\\s*'$"),
+                         {" tells the guild, 'tash"})
+
+    def test_negative_lookahead_is_skipped(self):
+        self.assertEqual(self.literals("^(?!a skeleton )(.+?) has been slain by"),
+                         {" has been slain by"})
+
+    def test_no_literal(self):
+        self.assertIsNone(self.literals("^{s}$"))
+        self.assertIsNone(self.literals("(a|.+)"))
+
+    def test_scan_overlapping(self):
+        prefilter = LiteralPrefilter(["he", "she", "his", "hers"])
+        self.assertEqual(prefilter.scan("uSHErs"), {"he", "she", "hers"})
+        self.assertEqual(prefilter.scan("nothing"), set())
+
+    def test_wants_matching_lines(self):
+        cases = [
+            ("^(?<caster>[^ ]+) (?:(?:tell(?>s the g(?>uild|roup)| your party)|say(?:s?(?> out of character)?| to your guild)|shouts?|auctions?)), '(?<num>(\\w+)) CH - (?<target>.*?)'$",
+             "Caster tells the guild, '001 CH - Player'"),
+            ("^{s}(?: has be)en poisoned\\.$", "Player has been poisoned."),
+            ("x{TS}-{S};", "x10:00-something; is not online at this time."),
+            ("^You (backstab) .* for (\\d+) points of damage\\.$", "You backstab Mob for 100 points of damage."),
+        ]
+        for text, line in cases:
+            engine = RegexEngine()
+            engine.compile(text)
+            prefilter = LiteralPrefilter(engine.literals)
+            self.assertTrue(engine.match(line))
+            self.assertTrue(engine.wants(prefilter.scan(line)))
+            self.assertFalse(engine.wants(prefilter.scan("You feel the spirit of wolf enter you.")))
@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+
+from volt.utils.log_checkpoints import LogCheckpoints, file_signature
+
+class LogCheckpointsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.directory.name, "eqlog_Test.txt")
+        self.path = os.path.join(self.directory.name, "log_checkpoints.json")
+        with open(self.log_file, 'w') as f:
+            f.write("[Sun Aug 11 10:51:53 2024] Welcome to EverQuest!\n" * 4)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        checkpoints = LogCheckpoints(self.path, flush_interval=60)
+        checkpoints.update("log", 100, file_signature(self.log_file))
+        self.assertFalse(os.path.exists(self.path))
+        checkpoints.flush()
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+        checkpoints = LogCheckpoints(self.path)
+        self.assertEqual(checkpoints.resumeOffset("log", self.log_file, 600), 100)
+        self.assertIsNone(checkpoints.resumeOffset("log", self.log_file, -1))
+        self.assertIsNone(checkpoints.resumeOffset("other", self.log_file, 600))
+
+    def test_replaced_file(self):
+        checkpoints = LogCheckpoints(self.path)
+        checkpoints.update("log", 100, file_signature(self.log_file))
+        with open(self.log_file, 'r+') as f:
+            f.write("[Mon Aug 12 10:51:53 2024]")
+        self.assertIsNone(checkpoints.resumeOffset("log", self.log_file, 600))
+
+    def test_truncated_file(self):
+        checkpoints = LogCheckpoints(self.path)
+        checkpoints.update("log", os.path.getsize(self.log_file) + 1, file_signature(self.log_file))
+        self.assertIsNone(checkpoints.resumeOffset("log", self.log_file, 600))
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from datetime import datetime
+
+from PySide6.QtWidgets import QApplication
+
+from volt.utils.log_reader import LogFileReader, LogReader, normalize_path
+from volt.utils.log_reader_signals import LogReaderSignals
+
+LINE = "[Sun Aug 11 10:51:53 2024] You have slain a gnoll!\n"
+
+class LogFileReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.directory.name, "eqlog_Test.txt")
+        self.write("", "w")
+        self.reader = LogFileReader(self.log_file, None)
+
+    def tearDown(self):
+        self.reader.close()
+        self.directory.cleanup()
+
+    def write(self, data, mode="a"):
+        with open(self.log_file, mode + "b") as f:
+            f.write(data.encode("utf-8"))
+
+    def test_partial_line(self):
+        self.assertEqual(self.reader.read_new_lines(), [])
+        self.write(LINE[:20])
+        self.assertEqual(self.reader.read_new_lines(), [])
+        self.assertEqual(self.reader.file_position, 0)
+        self.write(LINE[20:] + "[Sun Aug 11 10:51:54 2024] Bob tells you, 'h")
+        self.assertEqual(self.reader.read_new_lines(), [(datetime(2024, 8, 11, 10, 51, 53), "You have slain a gnoll!")])
+        self.assertEqual(self.reader.file_position, len(LINE))
+        self.write("i'\r\n")
+        self.assertEqual(self.reader.read_new_lines(), [(datetime(2024, 8, 11, 10, 51, 54), "Bob tells you, 'hi'")])
+
+    def test_split_multibyte(self):
+        self.reader.read_new_lines()
+        data = "[Sun Aug 11 10:51:53 2024] Zoë tells you, 'hi'\n".encode("utf-8")
+        split = data.index(b"\xc3") + 1
+        with open(self.log_file, "ab") as f:
+            f.write(data[:split])
+        self.assertEqual(self.reader.read_new_lines(), [])
+        with open(self.log_file, "ab") as f:
+            f.write(data[split:])
+        self.assertEqual(self.reader.read_new_lines()[0][1], "Zoë tells you, 'hi'")
+
+    def test_truncated(self):
+        self.reader.read_new_lines()
+        self.write(LINE * 3)
+        self.assertEqual(len(self.reader.read_new_lines()), 3)
+        self.write(LINE, "w")
+        self.assertEqual(len(self.reader.read_new_lines()), 1)
+        self.assertEqual(self.reader.file_position, len(LINE))
+
+    def test_replaced(self):
+        self.reader.read_new_lines()
+        self.write(LINE)
+        replacement = self.log_file + ".new"
+        with open(replacement, "w") as f:
+            f.write(LINE * 2)
+        os.replace(replacement, self.log_file)
+        self.assertEqual(len(self.reader.read_new_lines()), 3)
+        self.assertEqual(self.reader.file_position, len(LINE) * 2)
+
+    def test_backlog(self):
+        app = QApplication.instance() or QApplication()
+        app._signals = {"logreader": LogReaderSignals()}
+        emitted = []
+        app._signals["logreader"].backlog_lines.connect(lambda profile, lines: emitted.append(("backlog", lines)))
+        app._signals["logreader"].new_lines.connect(lambda profile, lines: emitted.append(("new", lines)))
+
+        self.write(LINE + "[Sun Aug 11 10:52:00 2024] You have slain an orc!\n")
+        self.reader.file_position = 0
+        self.reader.backlog = True
+        log_reader = LogReader()
+        log_reader.readers[normalize_path(self.log_file)] = self.reader
+        log_reader.started_at = datetime(2024, 8, 11, 10, 52)
+
+        # Only the lines logged before the reader started are backlog
+        log_reader.process(self.log_file)
+        self.write(LINE)
+        log_reader.process(self.log_file)
+        self.assertEqual([(kind, [text for timestamp, text in lines]) for kind, lines in emitted],
+                         [("backlog", ["You have slain a gnoll!"]), ("new", ["You have slain an orc!"]),
+                          ("new", ["You have slain a gnoll!"])])
+
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from volt.utils.regex_engine import RegexEngine, translation_version
+from volt.utils.pattern_cache import PatternCache
+
+TEXTS = [
+    "^({s}|You) shouts?, 'GG +([\\dA-Za-z]+) +CH +-- +({s}) *'$",
+    "{s} tells you, '{s}'",
+    "Your {S} spell has worn off",
+    "You have slain (.+)!",
+    "unbalanced (paren",
+]
+
+class PatternCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "pattern_cache.json")
+
+    def tearDown(self):
+        RegexEngine.cache = None
+        self.directory.cleanup()
+
+    def compile(self, cache):
+        RegexEngine.cache = cache
+        engines = []
+        for text in TEXTS:
+            engine = RegexEngine()
+            engine.compile(text)
+            engines.append((engine.expression.pattern, engine.replace_char, engine.literals))
+        return engines
+
+    def test_cached_compile_matches_uncached(self):
+        uncached = self.compile(None)
+        cache = PatternCache(self.path, translation_version())
+        self.assertEqual(self.compile(cache), uncached)
+        cache.flush()
+
+        cache = PatternCache(self.path, translation_version())
+        self.assertEqual(len(cache.entries), len(TEXTS))
+        self.assertEqual(self.compile(cache), uncached)
+        self.assertFalse(cache.dirty)
+
+    def test_version_change_drops_entries(self):
+        cache = PatternCache(self.path, "1")
+        self.compile(cache)
+        cache.flush()
+        self.assertEqual(len(PatternCache(self.path, "1").entries), len(TEXTS))
+        self.assertEqual(PatternCache(self.path, "2").entries, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -32,6 +32,15 @@ class RegexEngineTest(unittest.TestCase):
         result = engine.execute("TASH - {s}", matches=matches)
         self.assertEqual(result, "TASH - Player")
 
+    def test_execute_profile(self):
+        # {c} comes from the profile passed in, never from the app
+        self.app.current_profile = Profile(name="Other")
+        engine = RegexEngine()
+        engine.compile("^{s} tells you, 'hi'$")
+        matches = engine.match("Bob tells you, 'hi'")
+        self.assertEqual(engine.execute("{c}: {s}", matches=matches, profile=Profile(name="Caster")), "Caster: Bob")
+        self.assertEqual(engine.execute("{c}: {s}", matches=matches), "{c}: Bob")
+
     def test_character_name_replace(self):
         profile = Profile(name="Caster")
 
@@ -0,0 +1,49 @@
+import unittest
+
+from collections import Counter
+from datetime import datetime
+
+from volt.replay import load_triggers, replay
+
+CONFIG = {
+    "profiles": [{"name": "Caster", "log_file": "", "trigger_ids": [1]}],
+    "trigger_groups": [{
+        "type": "TriggerGroup", "name": "Raid", "children": [
+            {"type": "Trigger", "trigger_id": 1, "name": "Slain", "search_text": "You have slain {s}!",
+             "use_regex": False, "timer_name": "{s}", "duration": 60,
+             "timer_end_early_triggers": [{"text": "{s} has been resurrected", "use_regex": False}]},
+            {"type": "Trigger", "trigger_id": 2, "name": "Tell", "search_text": "^{s} tells you, '(.+)'$",
+             "use_regex": True, "cooldown_duration": 10}
+        ]
+    }]
+}
+
+def lines():
+    return [
+        (datetime(2024, 8, 11, 10, 0, 0), "You have slain a gnoll!"),
+        (datetime(2024, 8, 11, 10, 0, 1), "Bob tells you, 'hi'"),
+        (datetime(2024, 8, 11, 10, 0, 2), "Bob tells you, 'again'"),
+        (datetime(2024, 8, 11, 10, 0, 30), "Bob tells you, 'later'"),
+        (datetime(2024, 8, 11, 10, 0, 31), "a gnoll has been resurrected"),
+        (datetime(2024, 8, 11, 10, 0, 32), "You hit a gnoll for 12 points of damage."),
+    ]
+
+class ReplayTest(unittest.TestCase):
+    def test_fired(self):
+        stats = Counter()
+        fired, latencies = replay(load_triggers(CONFIG), lines(), stats)
+        self.assertEqual(fired, {"Raid / Slain": 1, "Raid / Tell": 2})
+        self.assertEqual(stats["lines"], 6)
+        self.assertEqual(sum(latencies.values()), 6)
+
+    def test_prefilter_skips_evaluations(self):
+        stats = Counter()
+        fired = replay(load_triggers(CONFIG), lines(), stats)[0]
+        unfiltered = Counter()
+        self.assertEqual(replay(load_triggers(CONFIG), lines(), unfiltered, prefilter=False)[0], fired)
+        self.assertLess(stats["evaluations"], unfiltered["evaluations"])
+
+    def test_profile(self):
+        self.assertEqual([trigger.name for trigger in load_triggers(CONFIG, "Caster")], ["Raid / Slain"])
+        with self.assertRaises(ValueError):
+            load_triggers(CONFIG, "Nobody")
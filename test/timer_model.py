@@ -0,0 +1,50 @@
+import unittest
+
+from volt.models.timer_model import TimerModel, Descending
+from volt.triggers.timer import natural_key
+
+class FakeTimer():
+    def __init__(self, label):
+        self.label = label
+        self.row = None
+
+class TimerModelTest(unittest.TestCase):
+    def labels(self, model):
+        return [timer.label for timer in model.timers]
+
+    def test_insert_sorted(self):
+        model = TimerModel([])
+        for label in ["Timer 10", "Timer 9", "timer 1", "Timer 9"]:
+            model.insertTimer(FakeTimer(label), natural_key(label))
+        self.assertEqual(self.labels(model), ["timer 1", "Timer 9", "Timer 9", "Timer 10"])
+        self.assertEqual([timer.row for timer in model.timers], [0, 1, 2, 3])
+        self.assertEqual(model.rowCount(), 4)
+
+    def test_descending(self):
+        model = TimerModel([])
+        for label in ["b", "c", "a"]:
+            model.insertTimer(FakeTimer(label), Descending(label))
+        self.assertEqual(self.labels(model), ["c", "b", "a"])
+
+    def test_move_and_remove(self):
+        model = TimerModel([])
+        timers = [FakeTimer(str(i)) for i in range(4)]
+        for i, timer in enumerate(timers):
+            model.insertTimer(timer, i)
+        model.moveTimer(timers[0], 10)
+        self.assertEqual(self.labels(model), ["1", "2", "3", "0"])
+        model.moveTimer(timers[2], 1.5)
+        self.assertEqual(self.labels(model), ["1", "2", "3", "0"])
+        model.removeTimer(timers[1])
+        self.assertEqual(self.labels(model), ["2", "3", "0"])
+        self.assertEqual([timer.row for timer in model.timers], [0, 1, 2])
+        self.assertIsNone(timers[1].row)
+
+    def test_resort(self):
+        model = TimerModel([])
+        for label in ["a", "c", "b"]:
+            model.insertTimer(FakeTimer(label), 0)
+        model.sortTimers(lambda timer: Descending(timer.label))
+        self.assertEqual(self.labels(model), ["c", "b", "a"])
+        model.insertTimer(FakeTimer("bb"), Descending("bb"))
+        self.assertEqual(self.labels(model), ["c", "bb", "b", "a"])
@@ -0,0 +1,30 @@
+import unittest
+
+from datetime import datetime, timedelta
+
+from volt.utils.timestamp_parser import TimestampParser
+
+FORMAT = '%a %b %d %H:%M:%S %Y'
+
+class TimestampParserTest(unittest.TestCase):
+    def test_matches_strptime(self):
+        parser = TimestampParser()
+        value = datetime(2024, 1, 1)
+        for i in range(2000):
+            sdate = value.strftime(FORMAT)
+            self.assertEqual(parser.parse(sdate), datetime.strptime(sdate, FORMAT))
+            value += timedelta(hours=4, minutes=23, seconds=17)
+
+    def test_repeated_second(self):
+        parser = TimestampParser()
+        first = parser.parse("Sun Aug 11 10:51:53 2024")
+        self.assertIs(parser.parse("Sun Aug 11 10:51:53 2024"), first)
+        self.assertEqual(parser.parse("Sun Aug 11 10:51:54 2024"), datetime(2024, 8, 11, 10, 51, 54))
+
+    def test_fallback(self):
+        parser = TimestampParser()
+        self.assertEqual(parser.parse("Sun Aug 1 10:51:53 2024"), datetime(2024, 8, 1, 10, 51, 53))
+        with self.assertRaises(ValueError):
+            parser.parse("Sun Foo 11 10:51:53 2024")
+        with self.assertRaises(ValueError):
+            parser.parse("not a date")
@@ -0,0 +1,39 @@
+import unittest
+
+from volt.models.trigger_log_model import TriggerLogModel
+
+class TriggerLogModelTest(unittest.TestCase):
+    def triggers(self, model):
+        return [row[1] for row in model.rows]
+
+    def test_newest_first(self):
+        model = TriggerLogModel(limit=10)
+        inserts = []
+        model.rowsInserted.connect(lambda parent, first, last: inserts.append((first, last)))
+        for name in ["a", "b", "c"]:
+            model.addRow("time", name, "text")
+        self.assertEqual(model.rowCount(), 0)
+        model.flush()
+        self.assertEqual(self.triggers(model), ["c", "b", "a"])
+        self.assertEqual(inserts, [(0, 2)])
+        self.assertEqual(model.data(model.index(0, 2)), "text")
+
+    def test_limit(self):
+        model = TriggerLogModel(limit=3)
+        for name in ["a", "b"]:
+            model.addRow("time", name, "text")
+        model.flush()
+        for name in ["c", "d", "e", "f", "g"]:
+            model.addRow("time", name, "text")
+        model.flush()
+        self.assertEqual(self.triggers(model), ["g", "f", "e"])
+
+        model.setLimit(2)
+        self.assertEqual(self.triggers(model), ["g", "f"])
+        model.addRow("time", "h", "text")
+        model.flush()
+        self.assertEqual(self.triggers(model), ["h", "g"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from types import SimpleNamespace
+
+from PySide6.QtWidgets import QApplication
+
+from volt.models.trigger import Trigger
+from volt.models.trigger_spec import TriggerSpec, TriggerExpressions, TriggerRuntime
+
+ITEM = {
+    "type": "Trigger", "trigger_id": "a", "name": "Tell", "search_text": "^{s} tells you, '(.+)'$",
+    "use_regex": True, "timer_name": "Tell {counter}", "duration": 30, "cooldown_duration": 10,
+    "counter_duration": 60,
+    "timer_end_early_triggers": [{"text": "{s} has left", "use_regex": False}],
+    "variables": [{"name": "who", "search": "{s} waves", "value": "{s}"}]
+}
+
+class TriggerSpecTest(unittest.TestCase):
+    def test_round_trip(self):
+        spec = TriggerSpec.deserialize(ITEM)
+        self.assertEqual(spec.duration, 30.0)
+        self.assertEqual(spec.timer_start_behavior, "Start a new timer")
+        self.assertEqual(TriggerSpec.deserialize(spec.serialize()).serialize(), spec.serialize())
+        self.assertFalse(hasattr(spec, "__dict__"))
+
+    def test_runtime(self):
+        runtime = TriggerRuntime(TriggerSpec.deserialize(ITEM))
+        runtime.compile()
+        self.assertEqual(len(runtime.regexEngines()), 3)
+
+        self.assertTrue(runtime.match("Bob tells you, 'hi'", None, 100))
+        self.assertIsNone(runtime.match("Bob tells you, 'hi'", None, 105))
+        self.assertTrue(runtime.match("Bob tells you, 'hi'", None, 111))
+        self.assertEqual(runtime.counter, 2)
+        self.assertTrue(runtime.match("Bob tells you, 'hi'", None, 300))
+        self.assertEqual(runtime.counter, 1)
+        self.assertIsNone(runtime.match("Bob says, 'hi'", None, 400))
+
+        self.assertTrue(runtime.endedEarly("Bob has left", None))
+        runtime.updateVariables("Joe waves", None, SimpleNamespace(name="Alpha"))
+        self.assertEqual(runtime.variable_values, {"who": "Joe"})
+
+    def test_runtime_per_profile(self):
+        spec = TriggerSpec.deserialize(ITEM)
+        expressions = TriggerExpressions(spec)
+        expressions.compile()
+        alpha, beta = TriggerRuntime(spec, expressions), TriggerRuntime(spec, expressions)
+
+        # A fire for one character does not cool the trigger down for another
+        self.assertTrue(alpha.match("Bob tells you, 'hi'", None, 100))
+        self.assertTrue(beta.match("Bob tells you, 'hi'", None, 101))
+        self.assertIsNone(alpha.match("Bob tells you, 'hi'", None, 102))
+        self.assertEqual((alpha.counter, beta.counter), (1, 1))
+        alpha.updateVariables("Joe waves", None, SimpleNamespace(name="Alpha"))
+        self.assertEqual(beta.variable_values, {})
+
+    def test_trigger_enders_per_profile(self):
+        QApplication.instance() or QApplication()
+        trigger = Trigger(TriggerSpec.deserialize(ITEM), defer_compile=True)
+        trigger.ensureCompiled()
+        alpha, beta = SimpleNamespace(name="Alpha"), SimpleNamespace(name="Beta")
+        destroyed = []
+        for profile in (alpha, beta):
+            runtime = trigger.runtime(profile)
+            timer = SimpleNamespace(profile=profile)
+            timer.destroy = lambda timer=timer, runtime=runtime: (destroyed.append(timer.profile.name),
+                                                                  runtime.timers.remove(timer))
+            runtime.timers.append(timer)
+
+        trigger.onLogUpdate(None, "Bob has left", 100, None, alpha)
+        self.assertEqual(destroyed, ["Alpha"])
+        self.assertEqual(len(trigger.runtime(beta).timers), 1)
+        self.assertEqual(len(trigger.getTimers()), 1)
+
+
+    def test_replay_fires_nothing(self):
+        QApplication.instance() or QApplication()
+        trigger = Trigger(TriggerSpec.deserialize(ITEM), defer_compile=True)
+        trigger.ensureCompiled()
+        profile = SimpleNamespace(name="Alpha")
+        trigger.onLogReplay("Bob tells you, 'hi'", 100, None, profile)
+        trigger.onLogReplay("Joe waves", 101, None, profile)
+        runtime = trigger.runtime(profile)
+        self.assertEqual((runtime.counter, runtime.last_fired_at, runtime.timers), (1, 100, []))
+        self.assertEqual(runtime.variable_values, {"who": "Joe"})
+        # Still cooling down from the line logged before Volt started
+        self.assertIsNone(runtime.match("Bob tells you, 'hi'", None, 105))
+
+
+if __name__ == '__main__':
+    unittest.main()
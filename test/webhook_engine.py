@@ -0,0 +1,228 @@
+import os
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from types import SimpleNamespace
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from volt.utils.webhook_engine import WebhookEngine, WebhookRequest, payload, coalescing, MAX_COALESCE_WINDOW
+from volt.utils.webhook_outbox import WebhookOutbox
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.client_address[1], json.loads(body),
+                                    self.headers.get("Authorization")))
+            hits = server.hits[self.path] = server.hits.get(self.path, 0) + 1
+
+        if self.path == "/slow":
+            time.sleep(1)
+        if self.path == "/limited" and hits == 1:
+            self.reply(429, {"retry_after": 0.2}, {"Retry-After": "0.2"})
+        elif self.path == "/fail" or (self.path == "/flaky" and hits == 1):
+            self.reply(500, {"message": "oops"})
+        else:
+            self.reply(204)
+
+    def reply(self, status, payload=None, headers=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class WebhookEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.hits = {}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def request(self, path, message="hello"):
+        return WebhookRequest("Test", "POST", self.url + path, {"Content-Type": "application/json"},
+                              {"json": {"content": message}})
+
+    def test_reuses_connection(self):
+        engine = WebhookEngine(workers=1)
+        for i in range(5):
+            engine.submit(self.request("/ok", str(i)))
+        self.assertTrue(engine.wait(5))
+        engine.stop(2)
+        self.assertEqual([r[2]["content"] for r in self.server.requests], ["0", "1", "2", "3", "4"])
+        self.assertEqual(len({r[1] for r in self.server.requests}), 1)
+        self.assertEqual(engine.metrics()["sent"], 5)
+
+    def test_honors_retry_after(self):
+        engine = WebhookEngine(workers=2, backoff=30)
+        engine.submit(self.request("/limited"))
+        self.assertTrue(engine.wait(5))
+        engine.stop(2)
+        self.assertEqual(self.server.hits["/limited"], 2)
+        self.assertEqual(engine.metrics()["retried"], 1)
+        self.assertEqual(engine.metrics()["sent"], 1)
+
+    def test_retries_with_backoff(self):
+        engine = WebhookEngine(retries=2, backoff=0.05)
+        engine.submit(self.request("/flaky"))
+        engine.submit(self.request("/fail"))
+        self.assertTrue(engine.wait(5))
+        engine.stop(2)
+        self.assertEqual(self.server.hits, {"/flaky": 2, "/fail": 3})
+        metrics = engine.metrics()
+        self.assertEqual((metrics["sent"], metrics["failed"], metrics["retried"]), (1, 1, 3))
+
+    def test_overflow(self):
+        # Without workers nothing leaves the queue
+        engine = WebhookEngine(workers=0, queue_size=2)
+        for i in range(4):
+            self.assertTrue(engine.submit(self.request("/ok", str(i))))
+        self.assertEqual([r.body["json"]["content"] for r in engine.queue], ["2", "3"])
+
+        engine = WebhookEngine(workers=0, queue_size=2, overflow="drop_newest")
+        results = [engine.submit(self.request("/ok", str(i))) for i in range(4)]
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual([r.body["json"]["content"] for r in engine.queue], ["0", "1"])
+        self.assertEqual(engine.metrics()["dropped"], 2)
+
+    def test_outbox_resumes(self):
+        directory = tempfile.TemporaryDirectory()
+        path = os.path.join(directory.name, "webhook_outbox.db")
+        webhooks = {
+            1: self.webhook(coalesce_window=0, auth_type="Bearer Token", auth_value="secret"),
+            2: self.webhook(webhook_id=2, url=self.url + "/fail", coalesce_window=0)
+        }
+
+        # Stopped before anything was sent
+        engine = WebhookEngine(WebhookOutbox(path), workers=0)
+        for i in range(3):
+            engine.send(webhooks[1], f"gnoll {i}")
+        engine.send(webhooks[2], "lost")
+        engine.send(self.webhook(webhook_id=3, coalesce_window=0), "deleted")
+        engine.stop()
+
+        connection = sqlite3.connect(path)
+        self.assertEqual(connection.execute("SELECT DISTINCT headers FROM outbox").fetchall(), [("{}",)])
+        connection.close()
+
+        # The headers come from the webhook as it is when resuming
+        webhooks[1].auth_value = "rotated"
+        engine = WebhookEngine(WebhookOutbox(path), workers=1, retries=0)
+        self.assertEqual(engine.resume(webhooks.get), 4)
+        self.assertTrue(engine.wait(5))
+        metrics = engine.metrics()
+        engine.stop(2)
+
+        self.assertEqual([(r[2]["content"], r[3]) for r in self.server.requests],
+                         [(f"gnoll {i}", "Bearer rotated") for i in range(3)] + [("lost", None)])
+        self.assertEqual((metrics["sent"], metrics["failed"], metrics["queued"]), (3, 1, 0))
+        self.assertGreater(metrics["latency_max"], 0)
+        connection = sqlite3.connect(path)
+        states = connection.execute("SELECT state, attempts FROM outbox ORDER BY id").fetchall()
+        connection.close()
+        self.assertEqual(states, [("sent", 1)] * 3 + [("failed", 1), ("dropped", 0)])
+        engine = WebhookEngine(WebhookOutbox(path))
+        self.assertEqual(engine.resume(webhooks.get), 0)
+        engine.stop()
+        directory.cleanup()
+
+    def test_stop_deadline(self):
+        directory = tempfile.TemporaryDirectory()
+        path = os.path.join(directory.name, "webhook_outbox.db")
+        outbox = WebhookOutbox(path)
+        engine = WebhookEngine(outbox, workers=4)
+        for i in range(4):
+            engine.submit(self.request("/slow", str(i)))
+        time.sleep(0.2)
+
+        # One deadline for all the workers, not one each
+        started = time.monotonic()
+        engine.stop(0.3)
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertEqual(len(engine.threads), 4)
+
+        # The outbox stays open for the workers still delivering
+        for thread in engine.threads:
+            thread.join(5)
+        connection = sqlite3.connect(path)
+        states = connection.execute("SELECT state FROM outbox").fetchall()
+        connection.close()
+        self.assertEqual(states, [("sent",)] * 4)
+        outbox.close()
+        directory.cleanup()
+
+    def webhook(self, **settings):
+        webhook = SimpleNamespace(webhook_id=1, name="Test", url=self.url + "/ok", method="POST",
+                                  content_type="application/json", auth_type="None", auth_header="",
+                                  auth_value="", custom_headers={}, coalesce_window=0.3, coalesce_count=10,
+                                  coalesce_size=2000)
+        webhook.__dict__.update(settings)
+        return webhook
+
+    def test_coalesces_burst(self):
+        engine = WebhookEngine()
+        webhook = self.webhook()
+        for i in range(25):
+            engine.send(webhook, f"gnoll {i} has been slain")
+        self.assertTrue(engine.wait(5))
+        engine.stop(2)
+        contents = [r[2]["content"].split("\n") for r in self.server.requests]
+        self.assertEqual(sorted(len(lines) for lines in contents), [5, 10, 10])
+        self.assertEqual(sorted(line for lines in contents for line in lines),
+                         sorted(f"gnoll {i} has been slain" for i in range(25)))
+
+    def test_coalesce_size(self):
+        engine = WebhookEngine(workers=1)
+        webhook = self.webhook(coalesce_size=20)
+        for letter in "abcde":
+            engine.send(webhook, letter * 8)
+        self.assertTrue(engine.wait(5))
+        engine.stop(2)
+        self.assertEqual([r[2]["content"] for r in self.server.requests],
+                         ["aaaaaaaa\nbbbbbbbb", "cccccccc\ndddddddd", "eeeeeeee"])
+
+    def test_coalescing_limits(self):
+        self.assertEqual(coalescing(self.webhook()), (0.3, 10, 2000))
+        self.assertEqual(coalescing(self.webhook(coalesce_window=3600)), (MAX_COALESCE_WINDOW, 10, 2000))
+        for window in (float("inf"), float("nan"), "inf", -1, None, "soon"):
+            self.assertEqual(coalescing(self.webhook(coalesce_window=window))[0], 0.0)
+        self.assertEqual(coalescing(self.webhook(coalesce_count=0, coalesce_size=-5)), (0.3, 1, 1))
+
+        # An infinite window from the config sends each message alone
+        engine = WebhookEngine(workers=1)
+        engine.send(self.webhook(coalesce_window=float("inf")), "hello")
+        self.assertTrue(engine.wait(5))
+        engine.stop(2)
+        self.assertEqual([r[2]["content"] for r in self.server.requests], ["hello"])
+
+    def test_payload(self):
+        self.assertEqual(payload("application/json", ["a"]), {"json": {"content": "a"}})
+        self.assertEqual(payload("application/json", ['{"embeds": []}']), {"json": {"embeds": []}})
+        self.assertEqual(payload("application/json", ['{"embeds": []}', "b"]),
+                         {"json": [{"embeds": []}, {"content": "b"}]})
+        self.assertEqual(payload("application/x-www-form-urlencoded", ["a", "b"]), {"data": {"message": "a\nb"}})
+        self.assertEqual(payload("text/plain", ["a", "b"]), {"data": "a\nb"})
+
+
+if __name__ == '__main__':
+    unittest.main()
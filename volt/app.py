@@ -6,8 +6,13 @@ from PySide6.QtWidgets import QApplication
 
 from volt.windows import main_window
 from volt.utils.helpers import resource_path
-from volt.utils.log_reader_signals import LogReaderSignals
-from volt.utils.regex_engine import RegexEngine
+from volt.utils.log_reader_signals import LogReaderSignals, each_line
+from volt.utils.regex_engine import RegexEngine, translation_version
+from volt.utils.pattern_cache import PatternCache
+from volt.utils.trigger_dispatcher import TriggerDispatcher
+from volt.utils.tick_scheduler import TickScheduler
+from volt.utils.webhook_engine import WebhookEngine
+from volt.utils.webhook_outbox import WebhookOutbox
 
 try:
    from plugins.nParse.helpers import resource_path, config
@@ -36,7 +41,15 @@ class App(QApplication):
         self._signals['logreader'] = LogReaderSignals()
         self._signals['timers'] = []
 
+        self.trigger_dispatcher = TriggerDispatcher(self._signals['logreader'])
+        self.tick_scheduler = TickScheduler()
+        self.webhook_engine = WebhookEngine(WebhookOutbox(resource_path("data/webhook_outbox.db")))
+
+        self.pattern_cache = PatternCache(resource_path("data/pattern_cache.json"), translation_version())
+        RegexEngine.cache = self.pattern_cache
+
         self.config_manager = None
+        self.current_profile = None
 
         try:
             self._signals['settings'] = SettingsSignals()
@@ -44,11 +57,11 @@ class App(QApplication):
             QApplication.instance()._discord = Discord()
             QApplication.instance()._map = Maps()
             #QApplication.instance()._spells = Spells()
-            QApplication.instance()._signals["logreader"].new_line.connect(
-                QApplication.instance()._map.parse
+            QApplication.instance()._signals["logreader"].new_lines.connect(
+                each_line(QApplication.instance()._map.parse)
             )
-            #QApplication.instance()._signals["logreader"].new_line.connect(
-            #    QApplication.instance()._spells.parse
+            #QApplication.instance()._signals["logreader"].new_lines.connect(
+            #    each_line(QApplication.instance()._spells.parse)
             #)
             self.setStyleSheet(open(resource_path(os.path.join('data', 'ui', '_.css'))).read())
         except:
@@ -56,8 +69,8 @@ class App(QApplication):
 
         try:
             QApplication.instance()._dps = DpsWindow()
-            QApplication.instance()._signals["logreader"].new_line.connect(
-                QApplication.instance()._dps.parse
+            QApplication.instance()._signals["logreader"].new_lines.connect(
+                each_line(QApplication.instance()._dps.parse)
             )
         except:
             pass
@@ -65,6 +78,7 @@ class App(QApplication):
         application_path = os.path.dirname(os.path.abspath(*args[0]))
 
         w = main_window.MainWindow(application_path)
+        self.webhook_engine.resume(w.webhooks_manager.getWebhookById)
         self.loaded = True
         w.show()
 
@@ -6,6 +6,8 @@ from volt.utils.color_button import ColorButton
 
 from volt.models.category import Category
 
+from volt.utils.category_router import CategoryRouter
+
 class CategoriesManager(QWidget):
     def __init__(self, parent):
         super(CategoriesManager, self).__init__()
@@ -27,6 +29,9 @@ class CategoriesManager(QWidget):
         self.category_layout.addLayout(button_layout, 0, 0)
 
         self.category_list = QListWidget()
+        self.router = CategoryRouter(self.categories,
+                                     lambda: self._parent.overlays_manager.timer_overlays,
+                                     lambda: self._parent.overlays_manager.text_overlays)
         self.category_list.setFixedWidth(200)
         self.category_list.itemClicked.connect(self.onCategorySelect)
         self.category_layout.addWidget(self.category_list, 1, 0)
@@ -83,11 +88,16 @@ class CategoriesManager(QWidget):
         for text_overlay in self._parent.overlays_manager.text_overlays:
             self.category_text_overlays.addItem(text_overlay.data_model.name)
 
+        self.router.invalidate()
+
         if self.category_list.count() > 0:
             self.category_list.setCurrentRow(0)
             self.onCategorySelect(self.category_list.currentItem())
 
 
+    def categories(self):
+        return [self.category_list.item(i) for i in range(self.category_list.count())]
+
     def serialize(self):
         categories = []
         for i in range(self.category_list.count()):
@@ -113,14 +123,17 @@ class CategoriesManager(QWidget):
         item.timer_font_color = self.timer_color_picker_font.color()
         item.timer_bar_color = self.timer_color_picker_bar.color()
         item.text_font_color = self.text_color_picker_font.color()
+        self.router.invalidate()
         QApplication.instance().save()
 
     def addCategory(self, event):
         category = Category(name="New Category")
         self.category_list.addItem(category)
+        self.router.invalidate()
         QApplication.instance().save()
 
     def removeCategory(self, event):
         item = self.category_list.currentItem()
         self.category_list.takeItem(self.category_list.row(item))
+        self.router.invalidate()
         QApplication.instance().save()
@@ -2,23 +2,41 @@
 import ujson as json
 import sys
 import os
+import time
 import xml.etree.ElementTree as ET
 
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication, QWidget, QFileDialog
 
 from volt.utils.helpers import resource_path
+from volt.utils.config_writer import ConfigWriter
+from volt.utils.config_store import JsonConfigStore, SqliteConfigStore
 from volt.models.trigger_group import TriggerGroup
 from volt.models.trigger import Trigger
+from volt.models.trigger_spec import TriggerSpec
 from volt.models.category import Category
 from volt.models.profile import Profile
 
 class ConfigManager(QWidget):
+    # Saves requested within this many milliseconds are written once
+    SAVE_DELAY = 500
+
     def __init__(self, parent):
         super(ConfigManager, self).__init__()
 
         self._parent = parent
         QApplication.instance().config_manager = self
 
+        self.dirty = False
+        self.snapshot_ms = 0
+        self.store = self.openStore()
+        self.writer = ConfigWriter(self.store)
+
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(self.SAVE_DELAY)
+        self.save_timer.timeout.connect(self.flush)
+
     def toggleMap(self):
         QApplication.instance()._map.toggle()
 
@@ -26,7 +44,70 @@ class ConfigManager(QWidget):
         QApplication.instance()._dps.toggle()
 
     def save(self):
-        config = {
+        """Marks the config dirty, it is written SAVE_DELAY ms after the last call."""
+        self.dirty = True
+        self.save_timer.start()
+
+    def flush(self, wait=False):
+        """
+        Snapshots the config now if it is dirty and hands it to the writer
+        thread. With wait, blocks until it is on disk.
+        """
+        self.save_timer.stop()
+        if self.dirty:
+            self.dirty = False
+            start = time.perf_counter()
+            config = self.snapshot()
+            self.snapshot_ms = (time.perf_counter() - start) * 1000
+            self.writer.write(config)
+        if wait:
+            self.writer.wait()
+
+    def stop(self):
+        self.flush()
+        self.writer.stop()
+
+    def openStore(self):
+        """The SQLite store once config.db exists, config.json otherwise."""
+        if os.path.isfile(resource_path("data/config.db")):
+            return SqliteConfigStore(resource_path("data/config.db"))
+        return JsonConfigStore(resource_path("data/config.json"))
+
+    def useSqliteStore(self, enabled):
+        """
+        Moves the config into config.db, or back into config.json, and saves
+        through that store from now on.
+        """
+        self.flush(wait=True)
+        if enabled:
+            store = SqliteConfigStore(resource_path("data/config.db"))
+        else:
+            store = JsonConfigStore(resource_path("data/config.json"))
+        try:
+            store.save(self.snapshot())
+            if not enabled:
+                os.remove(resource_path("data/config.db"))
+        except Exception as e:
+            print(f"Could not switch config store: {e}")
+            return False
+        self.store = store
+        self.writer.store = store
+        return True
+
+    def exportConfig(self):
+        filename, _ = QFileDialog.getSaveFileName(None, "Export Config", "config.json", "JSON (*.json)")
+        if filename:
+            try:
+                JsonConfigStore(filename).save(self.snapshot())
+            except OSError as e:
+                print(f"Could not export config: {e}")
+
+    def saveMetrics(self):
+        """Save durations in milliseconds, the snapshot taken on the GUI thread and the write."""
+        return {"snapshot_ms": self.snapshot_ms} | self.writer.metrics()
+
+    def snapshot(self):
+        return {
             "top": self._parent.geometry().y(),
             "left": self._parent.geometry().x(),
             "width": self._parent.geometry().width(),
@@ -35,32 +116,31 @@ class ConfigManager(QWidget):
             "overlays": self._parent.overlays_manager.serialize(),
             "trigger_groups": self._parent.triggers_manager.serialize(),
             "categories": self._parent.categories_manager.serialize(),
-            "webhooks": self._parent.webhooks_manager.serialize()
+            "webhooks": self._parent.webhooks_manager.serialize(),
+            "resume_from_checkpoint": self._parent.home_manager.resume_checkbox.isChecked(),
+            "max_catch_up": self._parent.profiles_manager.logreader.max_catch_up,
+            "trigger_log_limit": self._parent.trigger_log_manager.model.limit
         }
 
-        json_out = json.dumps(config, indent=4)
-        with open(resource_path("data/config.json"), "w") as outfile:
-            outfile.write(json_out)
-
-
-    def load(self):
-        if not os.path.isfile(resource_path("data/config.json")):
-            json_out = json.dumps({}, indent=4)
-            with open(resource_path("data/config.json"), "w") as outfile:
-                outfile.write(json_out)
-
 
-        with open(resource_path("data/config.json"), 'r') as openfile:
-            json_object = json.load(openfile)
+    def load(self, startup_timer=None):
+        json_object = self.store.load()
+        if startup_timer:
+            startup_timer.mark("config read")
 
-            self.setGeometry(json_object.get("left", 10),
-                             json_object.get("top", 10),
-                             json_object.get("width", 800),
-                             json_object.get("height", 600))
+        self.setGeometry(json_object.get("left", 10),
+                         json_object.get("top", 10),
+                         json_object.get("width", 800),
+                         json_object.get("height", 600))
 
-            self._parent.home_manager.load(json_object)
-            self._parent.overlays_manager.load(json_object)
-            self._parent.categories_manager.load(json_object)
+        self._parent.home_manager.load(json_object, startup_timer)
+        self._parent.overlays_manager.load(json_object)
+        if startup_timer:
+            startup_timer.mark("overlays")
+        self._parent.categories_manager.load(json_object)
+        if startup_timer:
+            startup_timer.mark("categories")
+        self._parent.trigger_log_manager.load(json_object)
 
 
     def importSpellsUsConfig(self):
@@ -74,7 +154,6 @@ class ConfigManager(QWidget):
             root = TriggerGroup(group_id="9999999",
                                 name="Spells",
                                 comments="Import from spells_us.txt")
-            self._parent.triggers_manager.trigger_list.addTopLevelItem(root)
 
             with open(filename) as spell_file:
                 for line in spell_file:
@@ -85,32 +164,33 @@ class ConfigManager(QWidget):
                     effect_text_worn_off = values[8]
                     duration = int(values[17])
 
-                    node = Trigger(parent=self,
-                                   name=f"{name} - YOU",
-                                   timer_name=f"{name} (YOU)",
-                                   duration=duration,
-                                   search_text=effect_text_you,
-                                   use_regex=False,
-                                   category="Default",
-                                   timer_type="RestartTimer",
-                                   use_text=True,
-                                   display_text=f"{name} (YOU)",
-                                   use_text_to_voice=False,
-                                   text_to_voice_text="",
-                                   interrupt_speech=False,
-                                   play_sound_file=False,
-                                   sound_file_path="",
-                                   restart_timer_matches=False,
-                                   restart_timer_regardless=False,
-                                   timer_end_early_triggers=[
-                                       {
-                                           "text": effect_text_worn_off,
-                                           "use_regex": True
-                                       }
-                                   ])
+                    spec = TriggerSpec(name=f"{name} - YOU",
+                                       timer_name=f"{name} (YOU)",
+                                       duration=float(duration),
+                                       search_text=effect_text_you,
+                                       use_regex=False,
+                                       category="Default",
+                                       timer_type="RestartTimer",
+                                       use_text=True,
+                                       display_text=f"{name} (YOU)",
+                                       use_text_to_voice=False,
+                                       text_to_voice_text="",
+                                       interrupt_speech=False,
+                                       play_sound_file=False,
+                                       sound_file_path="",
+                                       restart_timer_matches=False,
+                                       restart_timer_regardless=False,
+                                       timer_end_early_triggers=[
+                                           {
+                                               "text": effect_text_worn_off,
+                                               "use_regex": True
+                                           }
+                                       ])
+                    node = Trigger(spec, parent=self)
                     #QApplication.instance()._signals["logreader"].new_line.connect(node.onLogUpdate)
                     root.addChild(node)
 
+            self._parent.triggers_manager.addItem(root)
 
 
     def importGinaConfig(self):
@@ -159,7 +239,7 @@ class ConfigManager(QWidget):
             #self._parent.triggers_manager.trigger_list.clear()
             for item in root.findall('./TriggerGroups/TriggerGroup'):
                 root_item = self.importGinaConfigNested(item)
-                self._parent.triggers_manager.trigger_list.addTopLevelItem(root_item)
+                self._parent.triggers_manager.addItem(root_item)
 
             #self._parent.categories_manager.category_list.clear()
             for item in root.findall('./Categories/Category'):
@@ -170,6 +250,7 @@ class ConfigManager(QWidget):
                                     timer_bar_color=item.find("TimerStyle/TimerBarColor").text,
                                     text_font_color=item.find("TextStyle/FontColor").text)
                 self._parent.categories_manager.category_list.addItem(category)
+            self._parent.categories_manager.router.invalidate()
 
 
     def importGinaConfigNested(self, item, parent=None):
@@ -204,24 +285,24 @@ class ConfigManager(QWidget):
            else:
                media_file = ""
 
-           node = Trigger(parent=self,
-                          name=item.find("Name").text,
-                          timer_name=item.find("TimerName").text,
-                          duration=int(item.find("TimerDuration").text),
-                          search_text=item.find("TriggerText").text,
-                          use_regex=bool(item.find("EnableRegex").text == "True"),
-                          category=item.find("Category").text,
-                          timer_type=timer_type,
-                          use_text=bool(item.find("UseText").text == "True"),
-                          display_text=item.find("DisplayText").text,
-                          use_text_to_voice=bool(item.find("UseTextToVoice").text == "True"),
-                          text_to_voice_text=item.find("TextToVoiceText").text,
-                          timer_start_behavior=timer_start_behavior,
-                          interrupt_speech=bool(item.find("InterruptSpeech").text == "True"),
-                          play_sound_file=bool(item.find("PlayMediaFile").text == "True"),
-                          sound_file_path=media_file,
-                          restart_timer_matches=bool(item.find("RestartBasedOnTimerName").text == "True"),
-                          restart_timer_regardless=bool(item.find("RestartBasedOnTimerName").text == "False"))
+           spec = TriggerSpec(name=item.find("Name").text,
+                              timer_name=item.find("TimerName").text,
+                              duration=float(item.find("TimerDuration").text),
+                              search_text=item.find("TriggerText").text,
+                              use_regex=bool(item.find("EnableRegex").text == "True"),
+                              category=item.find("Category").text,
+                              timer_type=timer_type,
+                              use_text=bool(item.find("UseText").text == "True"),
+                              display_text=item.find("DisplayText").text,
+                              use_text_to_voice=bool(item.find("UseTextToVoice").text == "True"),
+                              text_to_voice_text=item.find("TextToVoiceText").text,
+                              timer_start_behavior=timer_start_behavior,
+                              interrupt_speech=bool(item.find("InterruptSpeech").text == "True"),
+                              play_sound_file=bool(item.find("PlayMediaFile").text == "True"),
+                              sound_file_path=media_file,
+                              restart_timer_matches=bool(item.find("RestartBasedOnTimerName").text == "True"),
+                              restart_timer_regardless=bool(item.find("RestartBasedOnTimerName").text == "False"))
+           node = Trigger(spec, parent=self)
 
            node.notify_ending = bool(item.find("UseTimerEnding").text == "True")
            node.timer_ending_duration = int(item.find("TimerEndingTime").text)
@@ -1,4 +1,5 @@
-from PySide6.QtWidgets import QWidget, QGridLayout, QPushButton, QSizePolicy, QLabel, QCheckBox
+from PySide6.QtWidgets import (QApplication, QWidget, QGridLayout, QHBoxLayout, QPushButton, QSizePolicy, QLabel,
+                               QCheckBox, QSpinBox)
 from PySide6.QtCore import Signal, Slot, Qt
 from PySide6.QtGui import QStandardItemModel
 
@@ -6,6 +7,7 @@ from volt.managers.profiles_manager import ProfilesManager
 from volt.managers.triggers_manager import TriggersManager
 from volt.managers.webhooks_manager import WebhooksManager
 from volt.managers.config_manager import ConfigManager
+from volt.utils.config_store import SqliteConfigStore
 
 class HomeManager(QWidget):
     def __init__(self, parent):
@@ -45,9 +47,63 @@ class HomeManager(QWidget):
         self.home_layout.addWidget(button8, 1, 4)
         #self.home_layout.addWidget(button7, 2, 4)
 
+        self.resume_checkbox = QCheckBox("Resume From Checkpoint")
+        self.resume_checkbox.setToolTip("Read log lines written while Volt was closed, if it was closed recently")
+        self.resume_checkbox.clicked.connect(self.resumeCheckboxClicked)
+
+        self.catch_up_input = QSpinBox()
+        self.catch_up_input.setRange(0, 24 * 3600)
+        self.catch_up_input.setSuffix(" s")
+        self.catch_up_input.setToolTip("Only resume when Volt was closed for at most this many seconds")
+        self.catch_up_input.editingFinished.connect(self.catchUpChanged)
+
+        resume_widget = QWidget()
+        resume_layout = QHBoxLayout(resume_widget)
+        resume_layout.setContentsMargins(0, 0, 0, 0)
+        resume_layout.addWidget(self.resume_checkbox)
+        resume_layout.addWidget(self.catch_up_input)
+        self.home_layout.addWidget(resume_widget, 2, 4)
+
+        self.sqlite_checkbox = QCheckBox("SQLite Config Store")
+        self.sqlite_checkbox.setToolTip("Keep the config in data/config.db and only write what changed on save")
+        self.sqlite_checkbox.clicked.connect(self.sqliteCheckboxClicked)
+        self.home_layout.addWidget(self.sqlite_checkbox, 3, 4)
+
+        button9 = QPushButton("Export Config")
+        button9.clicked.connect(self._parent.config_manager.exportConfig)
+        self.home_layout.addWidget(button9, 1, 6)
+        self.home_layout.addWidget(self.webhooks_manager.status, 2, 6)
+
         self.home_tab.setLayout(self.home_layout)
 
-    def load(self, json):
+    def resumeCheckboxClicked(self, checked):
+        self.profiles_manager.logreader.setResume(checked)
+        QApplication.instance().save()
+
+    def catchUpChanged(self):
+        logreader = self.profiles_manager.logreader
+        if self.catch_up_input.value() != logreader.max_catch_up:
+            logreader.setResume(logreader.resume, self.catch_up_input.value())
+            QApplication.instance().save()
+
+    def sqliteCheckboxClicked(self, checked):
+        if not self._parent.config_manager.useSqliteStore(checked):
+            self.sqlite_checkbox.setChecked(not checked)
+
+    def load(self, json, startup_timer=None):
+        self.sqlite_checkbox.setChecked(isinstance(self._parent.config_manager.store, SqliteConfigStore))
+        # Must be set before the profiles start their log readers
+        # Off unless chosen, so upgrading does not replay a backlog unasked
+        self.resume_checkbox.setChecked(json.get("resume_from_checkpoint", False))
+        self.catch_up_input.setValue(json.get("max_catch_up", 600))
+        self.profiles_manager.logreader.setResume(self.resume_checkbox.isChecked(),
+                                                  self.catch_up_input.value())
         self.profiles_manager.load(json.get("profiles", []))
+        if startup_timer:
+            startup_timer.mark("profiles")
         self.triggers_manager.load(json.get("trigger_groups", []))
+        if startup_timer:
+            startup_timer.mark("triggers")
         self.webhooks_manager.load(json.get("webhooks", []))
+        if startup_timer:
+            startup_timer.mark("webhooks")
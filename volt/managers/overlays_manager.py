@@ -104,6 +104,7 @@ class OverlaysManager(QWidget):
             self.overlay_text_layout.addWidget(button)
             self.text_overlays.append(overlay)
             QApplication.instance().save()
+        self._parent.categories_manager.router.invalidate()
 
 
     def saveOverlayWindow(self, overlay):
@@ -114,8 +115,7 @@ class OverlaysManager(QWidget):
         overlay.data_model.sort_method = overlay.overlay_sort_method_input.currentText()
         overlay.button.setText(overlay.overlay_name_input.text())
 
-        for trigger in overlay.triggers:
-            trigger.updateFont()
+        overlay.updateFont()
 
         if overlay.data_model.type == "Timer":
             self.sortTriggers(overlay)
@@ -126,17 +126,13 @@ class OverlaysManager(QWidget):
         elif overlay.data_model.type == "Text":
             idx = self._parent.categories_manager.category_text_overlays.findText(old_name)
             self._parent.categories_manager.category_text_overlays.setItemText(idx, overlay.overlay_name_input.text())
+        self._parent.categories_manager.router.invalidate()
         overlay.toggleShow()
         QApplication.instance().save()
 
 
     def sortTriggers(self, overlay):
-        reverse = overlay.data_model.sort_method.endswith("(Desc)")
-
-        for trigger in overlay.triggers:
-            trigger.removeFromLayout()
-        for trigger in sorted(overlay.triggers, key=lambda x: x.sortValue(), reverse=reverse):
-            trigger.addToLayout()
+        overlay.timer_model.sortTimers(overlay.timerSortKey)
 
 
     def destroyOverlayWindow(self, overlay):
@@ -150,6 +146,7 @@ class OverlaysManager(QWidget):
             self._parent.categories_manager.category_text_overlays.removeItem(idx)
             self.overlay_text_layout.removeWidget(overlay)
             self.text_overlays.remove(overlay)
+        self._parent.categories_manager.router.invalidate()
         overlay.button.deleteLater()
         overlay.destroy()
         QApplication.instance().save()
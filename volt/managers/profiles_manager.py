@@ -1,3 +1,4 @@
+import time
 import contextlib
 
 from PySide6.QtWidgets import QApplication, QWidget, QPushButton, QListWidget
@@ -7,12 +8,18 @@ from PySide6.QtGui import QStandardItemModel, QColor
 from volt.windows import profile_window
 
 from volt.models.profile import Profile
-from volt.models.trigger import Trigger
 from volt.models.trigger_group import TriggerGroup
 
 from volt.utils.log_reader import LogReader
+from volt.utils.log_checkpoints import LogCheckpoints
+from volt.utils.helpers import resource_path
 
 class ProfilesManager(QWidget):
+    # Seconds the log of the active profile has to be quiet before another
+    # profile's log takes over, so two characters logging at once do not
+    # flip the active profile on every batch
+    ACTIVE_HOLD = 30
+
     def __init__(self, parent):
         super(ProfilesManager, self).__init__()
 
@@ -20,6 +27,8 @@ class ProfilesManager(QWidget):
         self.files = []
         self.current_profile = None
         self.selected_profile = None
+        # id() of a profile to the time.monotonic() its log last had lines
+        self.last_lines = {}
 
         self.button = QPushButton("Add Profile")
         self.buttona = QPushButton("Edit Profile")
@@ -40,14 +49,38 @@ class ProfilesManager(QWidget):
         self.profile_list.itemClicked.connect(self.profileListItemClicked)
         self.profile_list.doubleClicked.connect(self.editProfileWindow)
 
-        self.logreader = LogReader()
+        self.logreader = LogReader(LogCheckpoints(resource_path("data/log_checkpoints.json")))
+        QApplication.instance()._signals["logreader"].new_lines.connect(self.onLogLines)
 
     def load(self, json):
         for profile in json:
-            self.files.append(profile["log_file"])
             Profile(self.profile_list, name=profile["name"],
                                        log_file=profile["log_file"],
                                        trigger_ids=profile.get("trigger_ids", []))
+        self.refreshLogReaders()
+        self.logreader.start()
+
+    def profiles(self):
+        return [self.profile_list.item(i) for i in range(self.profile_list.count())]
+
+    def refreshLogReaders(self):
+        """Tail the log file of every profile, called whenever profiles change."""
+        profiles = self.profiles()
+        self.files = [profile.log_file for profile in profiles if profile.log_file]
+        self.logreader.setProfiles(profiles)
+        QApplication.instance().trigger_dispatcher.invalidate()
+
+    def onLogLines(self, profile, lines):
+        if profile is None:
+            return
+        now = time.monotonic()
+        self.last_lines[id(profile)] = now
+        current = self.current_profile
+        if profile is current:
+            return
+        if current is not None and now - self.last_lines.get(id(current), 0) < self.ACTIVE_HOLD:
+            return
+        self.setActive(profile)
 
 
     def serialize(self):
@@ -68,6 +101,15 @@ class ProfilesManager(QWidget):
     def removeProfileWindow(self):
         item = self.profile_list.currentItem()
         self.profile_list.takeItem(self.profile_list.row(item))
+        self.last_lines.pop(id(item), None)
+        for trigger in self._parent.triggers_manager.triggers():
+            trigger.removeProfile(item)
+        if item is self.current_profile:
+            self.current_profile = None
+            QApplication.instance().current_profile = None
+        if item is self.selected_profile:
+            self.selected_profile = None
+        self.refreshLogReaders()
         QApplication.instance().save()
 
     def profileListItemClicked(self, item):
@@ -77,37 +119,26 @@ class ProfilesManager(QWidget):
         self.buttona.setEnabled(True)
         self.buttonb.setEnabled(True)
 
-    def setActiveByFile(self, file):
-        for i in range(self.profile_list.count()):
-            item = self.profile_list.item(i)
-            item.setBackground( QColor('#ffffff'))
-            if item.log_file == file:
-                self.current_profile = item
-                QApplication.instance().current_profile = item
-                if self.selected_profile == None:
-                    self.profile_list.setCurrentItem(item)
-                self.profileListItemClicked(item)
-
-                item.setBackground( QColor('#7fc97f') )
-
-                self.button.setEnabled(True)
-                self.buttona.setEnabled(True)
-                self.buttonb.setEnabled(True)
-
-                self.logreader.stop()
-                if len(item.log_file) > 0:
-                    self.logreader.setLogFile(item.log_file)
-                    self.logreader.start()
+    def setActive(self, profile):
+        """Highlights profile as the character being played, repainting only the two items that change."""
+        previous = self.current_profile
+        if previous is profile:
+            return
+        if previous is not None:
+            previous.setBackground(QColor('#ffffff'))
+        self.current_profile = profile
+        QApplication.instance().current_profile = profile
+        profile.setBackground(QColor('#7fc97f'))
+
+        # Every profile log is read at once, so only follow the active
+        # character until a profile is picked
+        if self.selected_profile == None:
+            self.profile_list.setCurrentItem(profile)
+            self.profileListItemClicked(profile)
 
+        self.button.setEnabled(True)
+        self.buttona.setEnabled(True)
+        self.buttonb.setEnabled(True)
 
     def setTriggers(self, profile):
-        self._parent.triggers_manager.trigger_list.blockSignals(True)
-        triggers = self._parent.triggers_manager.trigger_list.findItems("*", Qt.MatchWrap | Qt.MatchWildcard | Qt.MatchRecursive);
-        for trigger in triggers:
-            trigger.setCheckState(0, Qt.Unchecked)
-        for trigger in triggers:
-            if type(trigger) is Trigger and trigger.trigger_id in profile.trigger_ids:
-                trigger.setCheckState(0, Qt.Checked)
-                self._parent.triggers_manager.triggerListItemChangedOnParents(trigger, 0, Qt.Checked)
-                trigger.manageEvents(True)
-        self._parent.triggers_manager.trigger_list.blockSignals(False)
+        self._parent.triggers_manager.showProfile(profile)
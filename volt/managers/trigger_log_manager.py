@@ -1,7 +1,19 @@
-from PySide6.QtWidgets import QApplication, QWidget, QGridLayout, QTableWidget, QTableWidgetItem, QHeaderView
+from PySide6.QtWidgets import QApplication, QWidget, QGridLayout, QTableView, QHeaderView, QAbstractItemView, QPushButton
 from PySide6.QtCore import Qt
 
+from volt.windows import fire_history_window
+
+from volt.models.trigger_log_model import TriggerLogModel
+
+from volt.utils.fire_history import FireHistory
+from volt.utils.helpers import resource_path
+
 class TriggerLogManager(QWidget):
+    # Rows kept in the log, older fires are dropped
+    LIMIT = 1000
+    # Rows looked at when fitting the columns to their contents
+    SAMPLE = 50
+
     def __init__(self, parent):
         super(TriggerLogManager, self).__init__()
 
@@ -11,31 +23,45 @@ class TriggerLogManager(QWidget):
         self.layout = QGridLayout()
         self.layout.setAlignment(Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop)
 
-        self.table = QTableWidget()
-        self.table.setRowCount(0)
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["Log Time", "Trigger", "Matched Text"])
-        self.table.resizeColumnsToContents()
-        self.table.resizeRowsToContents()
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.model = TriggerLogModel(self.LIMIT)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         header = self.table.horizontalHeader()
+        header.setResizeContentsPrecision(self.SAMPLE)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
 
-        self.layout.addWidget(self.table)
+        self.history = FireHistory(resource_path("data/fire_history.db"))
+        self.history_btn = QPushButton("History")
+        self.history_btn.clicked.connect(self.historyWindow)
+
+        self.layout.addWidget(self.history_btn, 0, 0, Qt.AlignRight)
+        self.layout.addWidget(self.table, 1, 0)
         self.tab.setLayout(self.layout)
 
+    def load(self, json):
+        self.model.setLimit(max(1, int(json.get("trigger_log_limit", self.LIMIT))))
+
     def addItem(self, time, trigger, text):
-        time_item = QTableWidgetItem(time)
-        trigger_item = QTableWidgetItem(trigger)
-        text_item = QTableWidgetItem(text)
-        #row_count = self.table.rowCount()
-        row_count = 0
-        self.table.insertRow(row_count)
-        self.table.setItem(row_count, 0, time_item)
-        self.table.setItem(row_count, 1, trigger_item)
-        self.table.setItem(row_count, 2, text_item)
-        self.table.resizeColumnsToContents()
-        self.table.resizeRowsToContents()
+        self.model.addRow(time, trigger, text)
+
+    def recordFire(self, timestamp, trigger, text, matches=None, profile=None):
+        groups = []
+        if matches:
+            groups = matches.groupdict() or list(matches.groups())
+        self.history.record(timestamp.isoformat(" ", "seconds"), trigger.trigger_id,
+                            trigger.getFullTriggerName(), profile.name if profile else None, text, groups)
+
+    def historyWindow(self):
+        # Show the fires still waiting for the writer too
+        self.history.flush(timeout=1)
+        self.history_window = fire_history_window.FireHistoryWindow(self, self.history,
+                                                                     self._parent.profiles_manager.profiles())
+        self.history_window.show()
+
+    def stop(self):
+        self.history.stop()
@@ -1,5 +1,9 @@
-from PySide6.QtWidgets import QApplication, QWidget, QPushButton, QTreeWidget
-from PySide6.QtCore import Signal, Slot, Qt
+import time
+
+from collections import deque
+
+from PySide6.QtWidgets import QApplication, QWidget, QPushButton, QTreeWidget, QTreeWidgetItem
+from PySide6.QtCore import Signal, Slot, Qt, QTimer
 from PySide6.QtGui import QStandardItemModel
 
 from volt.windows import trigger_window
@@ -7,8 +11,13 @@ from volt.windows import trigger_group_window
 
 from volt.models.trigger_group import TriggerGroup
 from volt.models.trigger import Trigger
+from volt.models.trigger_spec import TriggerSpec
+from volt.utils.trigger_registry import TriggerRegistry
 
 class TriggersManager(QWidget):
+    # Milliseconds of idle compiling per event loop pass
+    COMPILE_BUDGET = 10
+
     def __init__(self, parent):
         super(TriggersManager, self).__init__()
 
@@ -50,72 +59,87 @@ class TriggersManager(QWidget):
         self.trigger_list.itemChanged.connect(self.triggerListItemChanged)
         self.trigger_list.itemClicked.connect(self.triggerListItemClicked)
         self.trigger_list.doubleClicked.connect(self.addTriggerOrTriggerGroupWindow)
+        self.trigger_list.itemExpanded.connect(self.populate)
+
+        self.registry = TriggerRegistry()
+        # (trigger ids, group states) checked in the tree, None when unknown
+        self.shown = None
+        # id(profile) -> (trigger_id_set, registry version, group states)
+        self.profile_states = {}
+
+        self.compile_queue = deque()
+        self.compile_timer = QTimer(self)
+        self.compile_timer.timeout.connect(self.compileIdle)
+
+    def triggers(self):
+        return list(self.registry.triggers.values())
+
+    def addItem(self, item, parent=None):
+        """Adds a trigger or group, with its children, to the tree and the registry."""
+        if parent:
+            self.populate(parent)
+            parent.addChild(item)
+        else:
+            self.trigger_list.addTopLevelItem(item)
+        self.registry.add(item)
+        self.shown = None
+        QApplication.instance().trigger_dispatcher.invalidate()
+
+    def removeItem(self, item):
+        parent = item.parent()
+        if parent:
+            parent.removeChild(item)
+        else:
+            self.trigger_list.takeTopLevelItem(self.trigger_list.indexOfTopLevelItem(item))
+        self.registry.remove(item)
+        self.shown = None
+        QApplication.instance().trigger_dispatcher.invalidate()
+
+    def clear(self):
+        self.trigger_list.clear()
+        self.registry.clear()
+        self.shown = None
+        self.profile_states.clear()
+        self.compile_queue.clear()
+        QApplication.instance().trigger_dispatcher.invalidate()
+
+    def load(self, json, trigger_ids=None):
+        """
+        Only the groups holding triggers enabled in a profile (or in
+        trigger_ids) get their children created, the others are populated
+        when expanded. Enabled triggers are compiled now, the rest when idle.
+        """
+        if trigger_ids is None:
+            trigger_ids = set()
+            for profile in self._parent.profiles_manager.profiles():
+                trigger_ids.update(profile.trigger_ids)
 
-    def load(self, json):
         for item in json:
-            root = self.deserializeChildren(item)
-            self.trigger_list.addTopLevelItem(root)
+            root = self.deserializeChildren(item, trigger_ids=trigger_ids)
+            self.addItem(root)
 
-        triggers = self.trigger_list.findItems("*", Qt.MatchWrap | Qt.MatchWildcard | Qt.MatchRecursive);
-        for trigger in triggers:
-            if type(trigger) is Trigger:
-                parent = trigger.parent()
-                checkState = parent.checkState(0)
-                if checkState == Qt.CheckState.Checked:
-                    trigger.setCheckState(0, Qt.CheckState.Checked)
-                elif checkState == Qt.CheckState.Unchecked:
-                    trigger.setCheckState(0, Qt.CheckState.Unchecked)
+        for trigger in self.triggers():
+            parent = trigger.parent()
+            checkState = parent.checkState(0)
+            if checkState == Qt.CheckState.Checked:
+                trigger.setCheckState(0, Qt.CheckState.Checked)
+            elif checkState == Qt.CheckState.Unchecked:
+                trigger.setCheckState(0, Qt.CheckState.Unchecked)
 
 
-    def deserializeChildren(self, item, parent=None):
+    def deserializeChildren(self, item, parent=None, trigger_ids=None):
         node = None
         if item["type"] == "Trigger":
                 node = Trigger(parent=self._parent,
-                               name=item["name"],
+                               spec=TriggerSpec.deserialize(item),
                                trigger_group=parent,
-                               trigger_id=item.get("trigger_id", None),
-                               timer_name=item["timer_name"],
-                               search_text=item["search_text"],
-                               use_regex=bool(item["use_regex"]),
-                               duration=float(item["duration"]),
-                               category=item.get("category", ""),
-                               timer_type=item.get("timer_type", "Timer (Count Down)"),
-                               use_text=bool(item.get("use_text", False)),
-                               display_text=item.get("display_text", ""),
-                               use_text_to_voice=bool(item.get("use_text_to_voice", False)),
-                               text_to_voice_text=item.get("text_to_voice_text", ""),
-                               timer_start_behavior=item.get("timer_start_behavior", "Start a new timer"),
-                               interrupt_speech=bool(item.get("interrupt_speech", False)),
-                               play_sound_file=bool(item.get("play_sound_file", False)),
-                               sound_file_path=item.get("sound_file_path"),
-                               restart_timer_matches=bool(item.get("restart_timer_matches", False)),
-                               restart_timer_regardless=bool(item.get("restart_timer_regardless", False)),
-                               notify_ending=bool(item.get("notify_ending", False)),
-                               timer_ending_duration=int(item.get("timer_ending_duration", 0)),
-                               timer_ending_use_text=bool(item.get("timer_ending_use_text", False)),
-                               timer_ending_display_text=item.get("timer_ending_display_text"),
-                               timer_ending_use_text_to_voice=bool(item.get("timer_ending_use_text_to_voice", False)),
-                               timer_ending_text_to_voice_text=item.get("timer_ending_text_to_voice_text"),
-                               timer_ending_interrupt_speech=bool(item.get("timer_ending_interrupt_speech", False)),
-                               timer_ending_play_sound_file=bool(item.get("timer_ending_play_sound_file", False)),
-                               timer_ending_sound_file_path=item.get("timer_ending_sound_file_path"),
-                               notify_ended=bool(item.get("notify_ended", False)),
-                               timer_ended_use_text=bool(item.get("timer_ended_use_text", False)),
-                               timer_ended_display_text=item.get("timer_ended_display_text"),
-                               timer_ended_use_text_to_voice=bool(item.get("timer_ended_use_text_to_voice", False)),
-                               timer_ended_text_to_voice_text=item.get("timer_ended_text_to_voice_text"),
-                               timer_ended_interrupt_speech=bool(item.get("timer_ended_interrupt_speech", False)),
-                               timer_ended_play_sound_file=bool(item.get("timer_ended_play_sound_file", False)),
-                               timer_ended_sound_file_path=item.get("timer_ended_sound_file_path"),
-                               timer_end_early_triggers=item.get("timer_end_early_triggers", []),
-                               variables=item.get("variables", []),
                                checked=item.get("checked", 0),
-                               reset_counter_if_unmatched=bool(item.get("reset_counter_if_unmatched", False)),
-                               counter_duration=int(item.get("counter_duration", 0)),
-                               cooldown_duration=float(item.get("cooldown_duration", 0)),
-                               use_webhook=bool(item.get("use_webhook", False)),
-                               webhook_id=item.get("webhook_id"),
-                               webhook_message=item.get("webhook_message", ""))
+                               defer_compile=True)
+                if trigger_ids is not None and node.trigger_id in trigger_ids:
+                    node.ensureCompiled()
+                else:
+                    self.compile_queue.append(node)
+                    self.compile_timer.start()
                 #QApplication.instance()._signals["logreader"].new_line.connect(node.onLogUpdate)
         elif item["type"] == "TriggerGroup":
             node = TriggerGroup(name=item["name"],
@@ -123,10 +147,59 @@ class TriggersManager(QWidget):
                                 trigger_group=parent,
                                 group_id=item.get("group_id", None),
                                 checked=item.get("checked", 0))
+            if trigger_ids is not None and item["children"] and not self.hasTriggers(item, trigger_ids):
+                node.pending_children = item["children"]
+                node.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+                return node
         for child in item["children"]:
-            node.addChild(self.deserializeChildren(child, node))
+            node.addChild(self.deserializeChildren(child, node, trigger_ids))
         return node
 
+    def hasTriggers(self, item, trigger_ids):
+        if item["type"] == "Trigger":
+            return item.get("trigger_id") in trigger_ids
+        return any(self.hasTriggers(child, trigger_ids) for child in item["children"])
+
+    def populate(self, group):
+        """Creates the children of a group loaded without them."""
+        if type(group) is not TriggerGroup or group.pending_children is None:
+            return
+        children = group.pending_children
+        group.pending_children = None
+        group.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless)
+
+        self.trigger_list.blockSignals(True)
+        checkState = group.checkState(0)
+        for child in children:
+            node = self.deserializeChildren(child, group, set())
+            if checkState != Qt.CheckState.PartiallyChecked:
+                node.setCheckState(0, checkState)
+            group.addChild(node)
+            self.registry.add(node)
+        self.trigger_list.blockSignals(False)
+        self.shown = None
+        QApplication.instance().trigger_dispatcher.invalidate()
+
+    def compileIdle(self):
+        deadline = time.perf_counter() + self.COMPILE_BUDGET / 1000
+        while self.compile_queue and time.perf_counter() < deadline:
+            self.compile_queue.popleft().ensureCompiled()
+        if not self.compile_queue:
+            self.compile_timer.stop()
+
+    def maxGroupId(self):
+        max_group_id = -1
+        def walk(item):
+            nonlocal max_group_id
+            if item["type"] == "TriggerGroup":
+                if type(item["group_id"]) is int and item["group_id"] > max_group_id:
+                    max_group_id = item["group_id"]
+                for child in item["children"]:
+                    walk(child)
+        for item in self.serialize():
+            walk(item)
+        return max_group_id
+
 
     def serialize(self):
         trigger_groups = []
@@ -141,7 +214,9 @@ class TriggersManager(QWidget):
         hash = parent.serialize()
         hash["children"] = []
 
-        if parent.childCount() > 0:
+        if type(parent) is TriggerGroup and parent.pending_children is not None:
+            hash["children"] = parent.pending_children
+        elif parent.childCount() > 0:
             for i in range(parent.childCount()):
                 item = parent.child(i)
                 hash["children"].append(self.serializeTriggerGroup(item))
@@ -172,22 +247,103 @@ class TriggersManager(QWidget):
         self.triggerListItemChangedOnChildren(widgetItem, column, is_checked)
         self.triggerListItemChangedOnParents(widgetItem, column, is_checked)
         self.trigger_list.blockSignals(False)
+        self.shown = None
 
-        trigger_ids = []
         self.selected_profile = self._parent.profiles_manager.selected_profile;
         if self.selected_profile:
-            triggers = self.trigger_list.findItems("*", Qt.MatchWrap | Qt.MatchWildcard | Qt.MatchRecursive);
-            for trigger in triggers:
-                if type(trigger) is Trigger:
-                    if trigger.checkState(0) == Qt.Checked:
-                        trigger_ids.append(trigger.trigger_id)
-                        trigger.manageEvents(True)
-                    else:
-                        trigger.manageEvents(False)
-            self.selected_profile.trigger_ids = trigger_ids
+            changed = self.registry.subtreeIds(widgetItem)
+            enabled = is_checked == Qt.Checked
+            for trigger in self.registry.triggersById(changed):
+                trigger.manageEvents(enabled)
+            if enabled:
+                known = self.selected_profile.trigger_id_set
+                added = [trigger_id for trigger_id in dict.fromkeys(changed) if trigger_id not in known]
+                self.selected_profile.trigger_ids = self.selected_profile.trigger_ids + added
+            else:
+                removed = set(changed)
+                self.selected_profile.trigger_ids = [trigger_id for trigger_id in self.selected_profile.trigger_ids
+                                                     if trigger_id not in removed]
+            QApplication.instance().trigger_dispatcher.invalidate()
         QApplication.instance().save()
 
+    def showProfile(self, profile):
+        """
+        Checks the triggers of profile in the tree. Only triggers whose state
+        differs from what is shown are changed, group states come from one
+        bottom-up pass and are kept per profile for switching back.
+        """
+        trigger_ids = profile.trigger_id_set
+        cached = self.profile_states.get(id(profile))
+        if cached and cached[0] is trigger_ids and cached[1] == self.registry.version:
+            group_states = cached[2]
+        else:
+            group_states = self.groupStates(trigger_ids)
+            self.profile_states[id(profile)] = (trigger_ids, self.registry.version, group_states)
+
+        if self.shown is None:
+            self.shown = self.shownStates()
+        shown_ids, shown_groups = self.shown
+
+        self.trigger_list.blockSignals(True)
+        for trigger in self.registry.triggersById(shown_ids - trigger_ids):
+            trigger.setCheckState(0, Qt.Unchecked)
+            trigger.manageEvents(False)
+        for trigger in self.registry.triggersById(trigger_ids - shown_ids):
+            trigger.setCheckState(0, Qt.Checked)
+            trigger.manageEvents(True)
+        for group in shown_groups:
+            if group not in group_states:
+                group.setCheckState(0, Qt.Unchecked)
+        for group, state in group_states.items():
+            if shown_groups.get(group) != state:
+                group.setCheckState(0, state)
+        self.trigger_list.blockSignals(False)
+        self.shown = (trigger_ids, group_states)
+
+    def shownStates(self):
+        trigger_ids = frozenset(trigger.trigger_id for trigger in self.registry.triggers.values()
+                                if trigger.checkState(0) == Qt.CheckState.Checked)
+        group_states = {}
+        for group in self.registry.allGroups():
+            state = group.checkState(0)
+            if state != Qt.CheckState.Unchecked:
+                group_states[group] = state
+        return trigger_ids, group_states
+
+    def groupStates(self, trigger_ids):
+        """States of the groups above the triggers in trigger_ids, the Unchecked ones left out."""
+        depths = {}
+        for trigger in self.registry.triggersById(trigger_ids):
+            chain = []
+            group = trigger.parent()
+            while group is not None and group not in depths:
+                chain.append(group)
+                group = group.parent()
+            depth = depths[group] + 1 if group is not None else 0
+            for group in reversed(chain):
+                depths[group] = depth
+                depth += 1
+
+        group_states = {}
+        for group in sorted(depths, key=depths.get, reverse=True):
+            checked_count = 0
+            child_count = group.childCount()
+            for i in range(child_count):
+                child = group.child(i)
+                if type(child) is Trigger:
+                    if child.trigger_id in trigger_ids:
+                        checked_count += 1
+                elif group_states.get(child) == Qt.CheckState.Checked:
+                    checked_count += 1
+            # Every group here has a checked trigger below it
+            if checked_count == child_count:
+                group_states[group] = Qt.CheckState.Checked
+            else:
+                group_states[group] = Qt.CheckState.PartiallyChecked
+        return group_states
+
     def triggerListItemChangedOnChildren(self, widgetItem, column, is_checked):
+        self.populate(widgetItem)
         for i in range(widgetItem.childCount()):
             child = widgetItem.child(i)
             child.setCheckState(column, is_checked)
@@ -240,11 +396,7 @@ class TriggersManager(QWidget):
 
     def removeTriggerOrTriggerGroup(self):
         item = self.trigger_list.currentItem()
-        parent = item.parent()
-        if parent:
-            parent.removeChild(item)
-        else:
-            self.trigger_list.takeTopLevelItem(self.trigger_list.indexOfTopLevelItem(item))
+        self.removeItem(item)
         QApplication.instance().save()
 
     def addTriggerGroupWindow(self):
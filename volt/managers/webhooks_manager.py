@@ -1,5 +1,5 @@
-from PySide6.QtWidgets import QApplication, QWidget, QPushButton, QListWidget
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QWidget, QPushButton, QListWidget, QLabel
+from PySide6.QtCore import Qt, QTimer
 
 from volt.windows import webhook_window
 from volt.models.webhook import Webhook
@@ -29,6 +29,13 @@ class WebhooksManager(QWidget):
         self.webhook_list.itemClicked.connect(self.webhookListItemClicked)
         self.webhook_list.doubleClicked.connect(self.editWebhookWindow)
 
+        # Backlog of the webhook engine, refreshed every second
+        self.status = QLabel()
+        self.status_timer = QTimer(self)
+        self.status_timer.timeout.connect(self.updateStatus)
+        self.status_timer.start(1000)
+        self.updateStatus()
+
     def load(self, json):
         for webhook_data in json:
             webhook = Webhook(
@@ -41,10 +48,23 @@ class WebhooksManager(QWidget):
                 auth_type=webhook_data.get("auth_type", "None"),
                 auth_header=webhook_data.get("auth_header", ""),
                 auth_value=webhook_data.get("auth_value", ""),
-                custom_headers=webhook_data.get("custom_headers", {})
+                custom_headers=webhook_data.get("custom_headers", {}),
+                coalesce_window=webhook_data.get("coalesce_window", 0),
+                coalesce_count=webhook_data.get("coalesce_count", 50),
+                coalesce_size=webhook_data.get("coalesce_size", 2000)
             )
             self.webhooks.append(webhook)
 
+    def updateStatus(self):
+        metrics = QApplication.instance().webhook_engine.metrics()
+        text = f"Webhooks: {metrics['queued']} queued, {metrics['failed']} failed"
+        tooltip = (f"Sent {metrics['sent']}, retried {metrics['retried']}, dropped {metrics['dropped']}\n"
+                   f"Latency {metrics['latency']:.2f}s average, {metrics['latency_max']:.2f}s max")
+        if text != self.status.text():
+            self.status.setText(text)
+        if tooltip != self.status.toolTip():
+            self.status.setToolTip(tooltip)
+
     def serialize(self):
         webhooks = []
         for i in range(self.webhook_list.count()):
@@ -1,4 +1,5 @@
 from PySide6.QtWidgets import QListWidgetItem
+from PySide6.QtGui import QColor
 
 class Category(QListWidgetItem):
     def __init__(self, parent=None, name="", timer_overlay=None, text_overlay=None,
@@ -15,6 +16,8 @@ class Category(QListWidgetItem):
         self.timer_font_color = timer_font_color
         self.timer_bar_color = timer_bar_color
         self.text_font_color = text_font_color
+        self._timer_colors = None
+        self._text_style = None
 
     def setName(self, val):
         self.name = val
@@ -26,6 +29,23 @@ class Category(QListWidgetItem):
     def setTextOverlay(self, overlay):
         self.text_overlay = overlay
 
+    def timerColors(self):
+        """The timer font and bar QColors, resolved again only when they change."""
+        key = (self.timer_font_color, self.timer_bar_color)
+        if self._timer_colors is None or self._timer_colors[0] != key:
+            self._timer_colors = (key, QColor(self.timer_font_color), QColor(self.timer_bar_color))
+        return self._timer_colors[1], self._timer_colors[2]
+
+    def textStyleSheet(self):
+        """The style sheet of text overlay labels, built again only when the color changes."""
+        if self._text_style is None or self._text_style[0] != self.text_font_color:
+            style = ("OverlayWindow QLabel"
+                     "{"
+                         f"color: {self.text_font_color};"
+                     "}")
+            self._text_style = (self.text_font_color, style)
+        return self._text_style[1]
+
     def serialize(self):
         hash = {
             "name": self.name,
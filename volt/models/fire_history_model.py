@@ -0,0 +1,65 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+class FireHistoryModel(QAbstractTableModel):
+    """
+    Fires from a FireHistory matching filters, newest first. Rows are read
+    a page at a time as the view scrolls down to them (fetchMore).
+    """
+    HEADERS = ("Log Time", "Trigger", "Profile", "Matched Text")
+
+    def __init__(self, history, page_size=200):
+        super().__init__()
+        self.history = history
+        self.page_size = page_size
+        self.filters = {}
+        self.rows = []
+        self.exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        # Rows start with the fire id
+        return self.rows[index.row()][index.column() + 1]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def setFilters(self, **filters):
+        """Starts over with the fires matching filters, see FireHistory.query."""
+        self.beginResetModel()
+        self.filters = filters
+        self.rows = []
+        self.exhausted = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        before = self.rows[-1][0] if self.rows else None
+        try:
+            page = self.history.query(before=before, limit=self.page_size, **self.filters)
+        except Exception as e:
+            print(f"Could not read fire history: {e}")
+            page = []
+        if len(page) < self.page_size:
+            self.exhausted = True
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
@@ -15,6 +15,16 @@ class Profile(QListWidgetItem):
     def setLogFile(self, val):
         self.log_file = val
 
+    @property
+    def trigger_ids(self):
+        return self._trigger_ids
+
+    @trigger_ids.setter
+    def trigger_ids(self, val):
+        # Assigned whole, never changed in place, so the set stays in step
+        self._trigger_ids = list(val)
+        self.trigger_id_set = frozenset(self._trigger_ids)
+
     def serialize(self):
         hash = {
             "name": self.name,
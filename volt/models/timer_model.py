@@ -0,0 +1,92 @@
+import bisect
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+class Descending():
+    """Wraps a sort key so that it sorts in reverse order."""
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+class TimerModel(QAbstractListModel):
+    """
+    The timers of an overlay, one row each in display order. timers is the
+    overlay's own list, every change to it goes through the model so the
+    view only repaints the rows that changed. Each Timer keeps its row.
+
+    Rows are kept sorted: keys holds the sort key of every row, and timers
+    are inserted at their position with bisect instead of resorting.
+    """
+    TimerRole = Qt.UserRole
+
+    def __init__(self, timers):
+        super().__init__()
+        self.timers = timers
+        self.keys = []
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.timers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        timer = self.timers[index.row()]
+        if role == Qt.DisplayRole:
+            return timer.format
+        if role == self.TimerRole:
+            return timer
+        return None
+
+    def insertTimer(self, timer, key):
+        # After the timers with an equal key, as a stable sort would
+        row = bisect.bisect_right(self.keys, key)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.timers.insert(row, timer)
+        self.keys.insert(row, key)
+        self.renumber(row)
+        self.endInsertRows()
+
+    def removeTimer(self, timer):
+        row = timer.row
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.timers[row]
+        del self.keys[row]
+        self.renumber(row)
+        self.endRemoveRows()
+        timer.row = None
+
+    def moveTimer(self, timer, key):
+        """Repositions a timer whose sort key changed, e.g. when restarted."""
+        row = timer.row
+        if (row == 0 or not key < self.keys[row - 1]) and \
+           (row == len(self.keys) - 1 or not self.keys[row + 1] < key):
+            self.keys[row] = key
+            return
+        self.removeTimer(timer)
+        self.insertTimer(timer, key)
+
+    def sortTimers(self, key):
+        """Resorts every row, when the sort method changes."""
+        self.layoutAboutToBeChanged.emit()
+        rows = sorted(((key(timer), timer) for timer in self.timers), key=lambda row: row[0])
+        self.keys[:] = [row[0] for row in rows]
+        self.timers[:] = [row[1] for row in rows]
+        self.renumber(0)
+        self.layoutChanged.emit()
+
+    def timerChanged(self, timer):
+        index = self.index(timer.row)
+        self.dataChanged.emit(index, index)
+
+    def renumber(self, start):
+        for row in range(start, len(self.timers)):
+            self.timers[row].row = row
@@ -7,34 +7,11 @@ from PySide6.QtWidgets import QApplication
 from PySide6.QtWidgets import QTreeWidgetItem
 from PySide6.QtCore import Signal, Slot, Qt
 
-from volt.utils.regex_engine import RegexEngine
+from volt.models.trigger_spec import TriggerSpec, TriggerExpressions, TriggerRuntime
 
 class Trigger(QTreeWidgetItem):
-    def __init__(self, name="", timer_name="", search_text="", duration=0, use_regex=False,
-                       category="", timer_type="", use_text=False, display_text="", use_text_to_voice=False,
-                       text_to_voice_text="", timer_start_behavior="", interrupt_speech=False,
-                       play_sound_file=False, sound_file_path="", restart_timer_matches=False,
-                       restart_timer_regardless=False,
-                       notify_ending=False, timer_ending_duration=0, timer_ending_use_text=False,
-                       timer_ending_display_text="", timer_ending_use_text_to_voice=False,
-                       timer_ending_text_to_voice_text="", timer_ending_interrupt_speech=False,
-                       timer_ending_play_sound_file=False, timer_ending_sound_file_path="",
-                       notify_ended=False, timer_ended_use_text=False,
-                       timer_ended_display_text="", timer_ended_use_text_to_voice=False,
-                       timer_ended_text_to_voice_text="", timer_ended_interrupt_speech=False,
-                       timer_ended_play_sound_file=False, timer_ended_sound_file_path="",
-                       timer_end_early_triggers=[],
-                       variables=[],
-                       counter_duration=0,
-                       reset_counter_if_unmatched=False,
-                       cooldown_duration=0,
-                       use_webhook=False,
-                       webhook_id=None,
-                       webhook_message="",
-                       parent=None,
-                       trigger_group=None,
-                       checked=Qt.CheckState.Unchecked,
-                       trigger_id=None):
+    def __init__(self, spec=None, parent=None, trigger_group=None, checked=Qt.CheckState.Unchecked,
+                       defer_compile=False):
 
         checked = self.fromCheckState(checked)
 
@@ -43,82 +20,45 @@ class Trigger(QTreeWidgetItem):
         self.setCheckState(0, checked)
         self.is_checked = checked
 
+        if spec is None:
+            spec = TriggerSpec()
+        self.spec = spec
+        self.expressions = TriggerExpressions(spec)
+        # id() of a profile to the TriggerRuntime running this trigger for it
+        self.runtimes = {}
+
         self.enabled = False
-        self.counter = 0
-        self.last_matched_at = None
-        self.last_fired_at = None  # Track when trigger last fired for cooldown
-        self.search_text = search_text
-        self.use_regex = use_regex
         self.owner = parent
-        self.trigger_id = trigger_id
         if self.trigger_id == None:
             self.trigger_id = id(self)
-        self.last_timer = None
-        self.timers = []
-        self.variable_values = {}
-
-        # TODO: Fix this deep accessing
-        self.speaker = self.owner._parent.speaker
-        self.category_list = self.owner._parent.categories_manager.category_list
-        self.timer_overlays = self.owner._parent.overlays_manager.timer_overlays
-        self.text_overlays = self.owner._parent.overlays_manager.text_overlays
-        self.profiles_manager = self.owner._parent.profiles_manager
-        self.trigger_log_manager = self.owner._parent.trigger_log_manager
-
-        self.regex_engine = RegexEngine()
-        self.regex_engine_enders = []
-
-        self.setName(name)
+
+        self.setText(0, spec.name)
         self.setTriggerGroup(trigger_group)
-        self.setTimerName(timer_name)
-        self.setDuration(duration)
-        self.setCategory(category)
-        self.setTimerType(timer_type)
-        self.setUseText(use_text)
-        self.setDisplayText(display_text)
-        self.setUseTextToVoice(use_text_to_voice)
-        self.setTextToVoiceText(text_to_voice_text)
-        self.setTimerStartBehavior(timer_start_behavior)
-        self.setInterruptSpeech(interrupt_speech)
-        self.setPlaySoundFile(play_sound_file)
-        self.setSoundFilePath(sound_file_path)
-
-        self.restart_timer_matches = restart_timer_matches
-        self.restart_timer_regardless = restart_timer_regardless
-
-        self.notify_ending = notify_ending
-        self.timer_ending_duration = timer_ending_duration
-        self.timer_ending_use_text = timer_ending_use_text
-        self.timer_ending_display_text = timer_ending_display_text
-        self.timer_ending_use_text_to_voice = timer_ending_use_text_to_voice
-        self.timer_ending_text_to_voice_text = timer_ending_text_to_voice_text
-        self.timer_ending_interrupt_speech = timer_ending_interrupt_speech
-        self.timer_ending_play_sound_file = timer_ending_play_sound_file
-        self.timer_ending_sound_file_path = timer_ending_sound_file_path
-
-        self.notify_ended = notify_ended
-        self.timer_ended_use_text = timer_ended_use_text
-        self.timer_ended_display_text = timer_ended_display_text
-        self.timer_ended_use_text_to_voice = timer_ended_use_text_to_voice
-        self.timer_ended_text_to_voice_text = timer_ended_text_to_voice_text
-        self.timer_ended_interrupt_speech = timer_ended_interrupt_speech
-        self.timer_ended_play_sound_file = timer_ended_play_sound_file
-        self.timer_ended_sound_file_path = timer_ended_sound_file_path
-
-        self.timer_end_early_triggers = timer_end_early_triggers
-
-        self.variables = variables
-
-        self.counter_duration = counter_duration
-        self.reset_counter_if_unmatched = reset_counter_if_unmatched
-
-        self.cooldown_duration = cooldown_duration
-
-        self.use_webhook = use_webhook
-        self.webhook_id = webhook_id
-        self.webhook_message = webhook_message
-
-        self.compileExpressions()
+
+        # Deferred triggers are compiled by ensureCompiled before they first run
+        if not defer_compile:
+            self.compileExpressions()
+
+    # TODO: Fix this deep accessing
+    @property
+    def speaker(self):
+        return self.owner._parent.speaker
+
+    @property
+    def regex_engine(self):
+        return self.expressions.regex_engine
+
+    @property
+    def category_router(self):
+        return self.owner._parent.categories_manager.router
+
+    @property
+    def profiles_manager(self):
+        return self.owner._parent.profiles_manager
+
+    @property
+    def trigger_log_manager(self):
+        return self.owner._parent.trigger_log_manager
 
     def setTriggerGroup(self, trigger_group):
         self.trigger_group = trigger_group
@@ -133,18 +73,14 @@ class Trigger(QTreeWidgetItem):
 
 
     def manageEvents(self, is_checked):
+        # Which triggers run is decided per profile by the TriggerDispatcher,
+        # this only tracks the check state shown for the selected profile
         if is_checked:
             self.is_checked = True
-            if not self.enabled:
-                self.enabled = True
-                QApplication.instance()._signals["logreader"].new_line.connect(self.onLogUpdate)
+            self.enabled = True
         else:
             self.is_checked = False
             self.enabled = False
-            try:
-                QApplication.instance()._signals["logreader"].new_line.disconnect(self.onLogUpdate)
-            except:
-                pass
 
 
     def isChecked(self):
@@ -228,142 +164,57 @@ class Trigger(QTreeWidgetItem):
         self.cooldown_duration = float(val)
 
     def serialize(self):
-        hash = {
-            "type": "Trigger",
-            "trigger_id": self.trigger_id,
-            "name": self.name,
-            "timer_name": self.timer_name,
-            "search_text": self.search_text,
-            "duration": self.duration,
-            "use_regex": self.use_regex,
-            "category": self.category,
-            "timer_type": self.timer_type,
-            "use_text": self.use_text,
-            "display_text": self.display_text,
-            "use_text_to_voice": self.use_text_to_voice,
-            "text_to_voice_text": self.text_to_voice_text,
-            "timer_start_behavior": self.timer_start_behavior,
-            "interrupt_speech": self.interrupt_speech,
-            "play_sound_file": self.play_sound_file,
-            "sound_file_path": self.sound_file_path,
-            "restart_timer_matches": self.restart_timer_matches,
-            "restart_timer_regardless": self.restart_timer_regardless,
-            "notify_ending": self.notify_ending,
-            "timer_ending_duration": self.timer_ending_duration,
-            "timer_ending_use_text": self.timer_ending_use_text,
-            "timer_ending_display_text": self.timer_ending_display_text,
-            "timer_ending_use_text_to_voice": self.timer_ending_use_text_to_voice,
-            "timer_ending_text_to_voice_text": self.timer_ending_text_to_voice_text,
-            "timer_ending_interrupt_speech": self.timer_ending_interrupt_speech,
-            "timer_ending_play_sound_file": self.timer_ending_play_sound_file,
-            "timer_ending_sound_file_path": self.timer_ending_sound_file_path,
-            "notify_ended": self.notify_ended,
-            "timer_ended_use_text": self.timer_ended_use_text,
-            "timer_ended_display_text": self.timer_ended_display_text,
-            "timer_ended_use_text_to_voice": self.timer_ended_use_text_to_voice,
-            "timer_ended_text_to_voice_text": self.timer_ended_text_to_voice_text,
-            "timer_ended_interrupt_speech": self.timer_ended_interrupt_speech,
-            "timer_ended_play_sound_file": self.timer_ended_play_sound_file,
-            "timer_ended_sound_file_path": self.timer_ended_sound_file_path,
-            "timer_end_early_triggers": self.timer_end_early_triggers,
-            "variables": self.variables,
-            "counter_duration": self.counter_duration,
-            "reset_counter_if_unmatched": self.reset_counter_if_unmatched,
-            "cooldown_duration": self.cooldown_duration,
-            "use_webhook": self.use_webhook,
-            "webhook_id": self.webhook_id,
-            "webhook_message": self.webhook_message,
-            "checked": self.checkStateToInt(self.checkState(0))
-        }
+        hash = self.spec.serialize()
+        hash["checked"] = self.checkStateToInt(self.checkState(0))
         return hash
 
-    def compileExpressions(self):
-        self.regex_engine_enders = []
-        self.regex_variables = []
-        self.regex_engine_enders.clear()
-        self.regex_variables.clear()
-        
-        search_text = self.search_text
+    def ensureCompiled(self):
+        self.expressions.ensureCompiled()
 
-        if not self.use_regex:
-            search_text = search_text.replace("*", "\w+")
-        try:
-            self.regex_engine.compile(search_text)
-        except Exception as e:
-            print(e)
-            print(self.search_text)
-
-        for trigger in self.timer_end_early_triggers:
-            regex_engine = RegexEngine()
-            text = trigger["text"]
-            if len(text) > 0:
-                if not trigger["use_regex"]:
-                    text = text.replace("*", "\w+")
-                regex_engine.compile(text)
-                self.regex_engine_enders.append(regex_engine)
-
-        for variable in self.variables:
-            regex_engine = RegexEngine()
-            text = variable["search"]
-            if len(text) > 0:
-                text = text.replace("*", "\w+")
-                regex_engine.compile(text)
-                item = {
-                  "regex_engine": regex_engine,
-                  "variable": variable
-                }
-                self.regex_variables.append(item)
-
-    def onLogUpdate(self, timestamp, text):
-        for item in self.regex_variables:
-            engine = item["regex_engine"]
-            var = item["variable"]
-
-            var_matches = engine.match(text)
-            if var_matches:
-                result = engine.execute(var["value"], matches=var_matches)
-                if result:
-                    self.variable_values[var["name"]] = result
-
-        if len(self.timers) > 0:
-            for ender in self.regex_engine_enders:
-                m = ender.match(text)
-                if m:
-                    for timer in self.timers.copy():
-                        timer.destroy()
-
-        if self.owner and self.regex_engine.expression and self.is_checked:
-            m = self.regex_engine.match(text)
-
-            now = time.time()
-
-            if self.last_matched_at and now > self.last_matched_at + int(self.counter_duration):
-                self.counter = 0
+    def compileExpressions(self, invalidate=True):
+        self.expressions.compile()
+        if invalidate:
+            QApplication.instance().trigger_dispatcher.invalidate()
 
-            if m:
-                self.last_matched_at = now
+    def regexEngines(self):
+        return self.expressions.regexEngines()
 
-                # Check cooldown - if cooldown is active, ignore this trigger
-                if self.cooldown_duration > 0 and self.last_fired_at:
-                    time_since_last_fire = now - self.last_fired_at
-                    if time_since_last_fire < self.cooldown_duration:
-                        # Cooldown is still active, ignore this trigger
-                        return
+    def runtime(self, profile=None):
+        """The TriggerRuntime running this trigger for profile."""
+        runtime = self.runtimes.get(id(profile))
+        if runtime is None:
+            runtime = self.runtimes[id(profile)] = TriggerRuntime(self.spec, self.expressions)
+        return runtime
 
-                # Update last fired timestamp
-                self.last_fired_at = now
+    def removeProfile(self, profile):
+        """Forgets the state this trigger kept for a deleted profile."""
+        self.runtimes.pop(id(profile), None)
 
-                name = self.timer_name
-                name = self.regex_engine.execute(name, matches=m)
+    def onLogUpdate(self, timestamp, text, now=None, hits=None, profile=None):
+        if profile is None:
+            profile = self.profiles_manager.current_profile
 
-                # Replace counter
-                self.counter += 1
+        runtime = self.runtime(profile)
+        runtime.updateVariables(text, hits, profile)
+
+        if runtime.timers and runtime.endedEarly(text, hits):
+            for timer in runtime.timers.copy():
+                timer.destroy()
+
+        if self.owner:
+            if now is None:
+                now = time.time()
+
+            m = runtime.match(text, hits, now)
+            if m:
+                name = self.timer_name
+                name = self.regex_engine.execute(name, matches=m, profile=profile)
 
                 if name:
-                    name = name.replace("{COUNTER}", str(self.counter))
-                    name = name.replace("{counter}", str(self.counter))
+                    name = name.replace("{COUNTER}", str(runtime.counter))
+                    name = name.replace("{counter}", str(runtime.counter))
 
-                for key, value in self.variable_values.items():
+                for key, value in runtime.variable_values.items():
                     name = name.replace(f"{{var:{key}}}", str(value))
 
                 if self.interrupt_speech:
@@ -371,8 +222,8 @@ class Trigger(QTreeWidgetItem):
 
                 if self.use_text_to_voice:
                     text_to_say = self.text_to_voice_text
-                    if self.profiles_manager.current_profile:
-                        text_to_say = self.regex_engine.execute(text_to_say, matches=m)
+                    if profile:
+                        text_to_say = self.regex_engine.execute(text_to_say, matches=m, profile=profile)
                     self.speaker.say(text_to_say)
 
                 if self.play_sound_file and len(self.sound_file_path) > 0:
@@ -381,49 +232,55 @@ class Trigger(QTreeWidgetItem):
 
                 # Execute webhook if enabled
                 if self.use_webhook and self.webhook_id:
-                    self._execute_webhook(m)
+                    self._execute_webhook(m, profile, runtime)
+
+                self.trigger_log_manager.recordFire(timestamp, self, text, m, profile)
 
-                categories = self.category_list.findItems(self.category, Qt.MatchExactly)
-                for category in categories:
+                for route in self.category_router.routes(self.category):
+                    category = route.category
                     if name and len(name) > 0:
-                        for overlay in self.timer_overlays:
-                            if overlay.data_model.name == category.timer_overlay:
-                                add_timer = True
-
-                                if len(self.timers) > 0:
-                                    if self.timer_start_behavior == "Restart current timer":
-                                        for timer in self.timers:
-                                            if self.restart_timer_matches:
-                                                if timer.label == name:
-                                                    timer.restartTimer()
-                                                    add_timer = False
-                                            else:
+                        for overlay in route.timer_overlays:
+                            add_timer = True
+
+                            if len(runtime.timers) > 0:
+                                if self.timer_start_behavior == "Restart current timer":
+                                    for timer in runtime.timers:
+                                        if self.restart_timer_matches:
+                                            if timer.label == name:
                                                 timer.restartTimer()
                                                 add_timer = False
-                                    elif self.timer_start_behavior == "Do Nothing":
-                                        add_timer = False
-
-                                if add_timer:
-                                    duration = self.duration
-                                    if self.regex_engine.duration != None:
-                                        duration = self.regex_engine.duration
-
-                                    timer = overlay.addTimer(name, duration, trigger=self, category=category, matches=m)
-                                    self.trigger_log_manager.addItem(timestamp.strftime("%Y-%m-%d %I:%M:%S %p"), self.getFullTriggerName(), text)
-                                    QApplication.instance()._signals['timers'].append(timer)
-                                    self.timers.append(timer)
-
-                    for overlay in self.text_overlays:
-                        if overlay.data_model.name == category.text_overlay:
-                            if self.use_text:
-                                display_text = self.display_text
-                                for key, value in self.variable_values.items():
-                                    display_text = display_text.replace(f"{{var:{key}}}", str(value))
-
-                                overlay.addTextTrigger(self.regex_engine.execute(display_text, matches=m), category=category, matches=m)
+                                        else:
+                                            timer.restartTimer()
+                                            add_timer = False
+                                elif self.timer_start_behavior == "Do Nothing":
+                                    add_timer = False
+
+                            if add_timer:
+                                duration = self.duration
+                                if self.regex_engine.duration != None:
+                                    duration = self.regex_engine.duration
+
+                                timer = overlay.addTimer(name, duration, trigger=self, category=category, matches=m, profile=profile)
                                 self.trigger_log_manager.addItem(timestamp.strftime("%Y-%m-%d %I:%M:%S %p"), self.getFullTriggerName(), text)
+                                QApplication.instance()._signals['timers'].append(timer)
+                                runtime.timers.append(timer)
 
-    def _execute_webhook(self, matches):
+                    for overlay in route.text_overlays:
+                        if self.use_text:
+                            display_text = self.display_text
+                            for key, value in runtime.variable_values.items():
+                                display_text = display_text.replace(f"{{var:{key}}}", str(value))
+
+                            overlay.addTextTrigger(self.regex_engine.execute(display_text, matches=m, profile=profile), category=category, matches=m)
+                            self.trigger_log_manager.addItem(timestamp.strftime("%Y-%m-%d %I:%M:%S %p"), self.getFullTriggerName(), text)
+
+    def onLogReplay(self, text, now, hits=None, profile=None):
+        """Catches up on a line logged before Volt started, without firing."""
+        runtime = self.runtime(profile)
+        runtime.updateVariables(text, hits, profile)
+        runtime.match(text, hits, now)
+
+    def _execute_webhook(self, matches, profile, runtime):
         """Execute webhook with variable substitution"""
         try:
             # Get webhooks manager
@@ -440,27 +297,33 @@ class Trigger(QTreeWidgetItem):
             message = self.webhook_message
 
             # Use regex engine to substitute variables like {S}, {C}, {1}, {2}, etc.
-            message = self.regex_engine.execute(message, matches=matches)
+            message = self.regex_engine.execute(message, matches=matches, profile=profile)
 
             # Replace counter variables
             if message:
-                message = message.replace("{COUNTER}", str(self.counter))
-                message = message.replace("{counter}", str(self.counter))
+                message = message.replace("{COUNTER}", str(runtime.counter))
+                message = message.replace("{counter}", str(runtime.counter))
 
                 # Replace custom variables
-                for key, value in self.variable_values.items():
+                for key, value in runtime.variable_values.items():
                     message = message.replace(f"{{var:{key}}}", str(value))
 
-            # Send the webhook
-            from volt.utils.webhook_executor import WebhookExecutor
-            WebhookExecutor.send_webhook(webhook, message, async_mode=True)
+            QApplication.instance().webhook_engine.send(webhook, message)
 
         except Exception as e:
             print(f"Error executing webhook: {str(e)}")
 
     def removeTimer(self, timer):
         QApplication.instance()._signals['timers'].remove(timer)
-        self.timers.remove(timer)
+        self.runtime(timer.profile).timers.remove(timer)
 
     def getTimers(self):
-        return self.timers
+        return [timer for runtime in self.runtimes.values() for timer in runtime.timers]
+
+
+def _delegate(owner, name):
+    return property(lambda self: getattr(getattr(self, owner), name),
+                    lambda self, value: setattr(getattr(self, owner), name, value))
+
+for _name in TriggerSpec.__slots__:
+    setattr(Trigger, _name, _delegate("spec", _name))
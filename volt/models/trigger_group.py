@@ -13,6 +13,8 @@ class TriggerGroup(QTreeWidgetItem):
         self.setComments(comments)
 
         self.group_id = group_id
+        # Serialized children not turned into items yet, see TriggersManager.populate
+        self.pending_children = None
 
     def setName(self, val):
         self.name = val
@@ -0,0 +1,73 @@
+from itertools import islice
+from collections import deque
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+
+class TriggerLogModel(QAbstractTableModel):
+    """
+    The most recent fires, newest first, at most limit rows: older rows are
+    dropped as new ones come in. Added rows wait in pending and are inserted
+    together once per event loop pass, so a burst of fires is one insert.
+    """
+    HEADERS = ("Log Time", "Trigger", "Matched Text")
+
+    def __init__(self, limit=1000):
+        super().__init__()
+        self.limit = limit
+        self.rows = deque(maxlen=limit)
+        self.pending = []
+
+        self.flush_timer = QTimer()
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(0)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self.rows[index.row()][index.column()]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def addRow(self, time, trigger, text):
+        self.pending.append((time, trigger, text))
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        if not self.pending:
+            return
+        rows = self.pending[-self.limit:]
+        self.pending = []
+
+        overflow = len(self.rows) + len(rows) - self.limit
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), len(self.rows) - overflow, len(self.rows) - 1)
+            for i in range(overflow):
+                self.rows.pop()
+            self.endRemoveRows()
+
+        self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+        # extendleft reverses them, putting the newest first
+        self.rows.extendleft(rows)
+        self.endInsertRows()
+
+    def setLimit(self, limit):
+        self.flush()
+        self.beginResetModel()
+        self.limit = limit
+        self.rows = deque(islice(self.rows, limit), maxlen=limit)
+        self.endResetModel()
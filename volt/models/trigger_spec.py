@@ -0,0 +1,287 @@
+from volt.utils.regex_engine import RegexEngine
+
+class TriggerSpec():
+    """
+    The configuration of a trigger as saved in the config, without any Qt.
+    Trigger is the tree item showing one, a TriggerRuntime runs one for
+    a profile.
+    """
+    __slots__ = (
+        "trigger_id", "name", "timer_name", "search_text", "duration", "use_regex",
+        "category", "timer_type", "use_text", "display_text", "use_text_to_voice",
+        "text_to_voice_text", "timer_start_behavior", "interrupt_speech",
+        "play_sound_file", "sound_file_path", "restart_timer_matches",
+        "restart_timer_regardless",
+        "notify_ending", "timer_ending_duration", "timer_ending_use_text",
+        "timer_ending_display_text", "timer_ending_use_text_to_voice",
+        "timer_ending_text_to_voice_text", "timer_ending_interrupt_speech",
+        "timer_ending_play_sound_file", "timer_ending_sound_file_path",
+        "notify_ended", "timer_ended_use_text", "timer_ended_display_text",
+        "timer_ended_use_text_to_voice", "timer_ended_text_to_voice_text",
+        "timer_ended_interrupt_speech", "timer_ended_play_sound_file",
+        "timer_ended_sound_file_path",
+        "timer_end_early_triggers", "variables", "counter_duration",
+        "reset_counter_if_unmatched", "cooldown_duration",
+        "use_webhook", "webhook_id", "webhook_message"
+    )
+
+    def __init__(self, trigger_id=None, name="", timer_name="", search_text="", duration=0.0,
+                       use_regex=False, category="", timer_type="", use_text=False, display_text="",
+                       use_text_to_voice=False, text_to_voice_text="", timer_start_behavior="",
+                       interrupt_speech=False, play_sound_file=False, sound_file_path="",
+                       restart_timer_matches=False, restart_timer_regardless=False,
+                       notify_ending=False, timer_ending_duration=0, timer_ending_use_text=False,
+                       timer_ending_display_text="", timer_ending_use_text_to_voice=False,
+                       timer_ending_text_to_voice_text="", timer_ending_interrupt_speech=False,
+                       timer_ending_play_sound_file=False, timer_ending_sound_file_path="",
+                       notify_ended=False, timer_ended_use_text=False, timer_ended_display_text="",
+                       timer_ended_use_text_to_voice=False, timer_ended_text_to_voice_text="",
+                       timer_ended_interrupt_speech=False, timer_ended_play_sound_file=False,
+                       timer_ended_sound_file_path="", timer_end_early_triggers=None, variables=None,
+                       counter_duration=0, reset_counter_if_unmatched=False, cooldown_duration=0.0,
+                       use_webhook=False, webhook_id=None, webhook_message=""):
+        self.trigger_id = trigger_id
+        self.name = name
+        self.timer_name = timer_name
+        self.search_text = search_text
+        self.duration = duration
+        self.use_regex = use_regex
+        self.category = category
+        self.timer_type = timer_type
+        self.use_text = use_text
+        self.display_text = display_text
+        self.use_text_to_voice = use_text_to_voice
+        self.text_to_voice_text = text_to_voice_text
+        self.timer_start_behavior = timer_start_behavior
+        self.interrupt_speech = interrupt_speech
+        self.play_sound_file = play_sound_file
+        self.sound_file_path = sound_file_path
+        self.restart_timer_matches = restart_timer_matches
+        self.restart_timer_regardless = restart_timer_regardless
+
+        self.notify_ending = notify_ending
+        self.timer_ending_duration = timer_ending_duration
+        self.timer_ending_use_text = timer_ending_use_text
+        self.timer_ending_display_text = timer_ending_display_text
+        self.timer_ending_use_text_to_voice = timer_ending_use_text_to_voice
+        self.timer_ending_text_to_voice_text = timer_ending_text_to_voice_text
+        self.timer_ending_interrupt_speech = timer_ending_interrupt_speech
+        self.timer_ending_play_sound_file = timer_ending_play_sound_file
+        self.timer_ending_sound_file_path = timer_ending_sound_file_path
+
+        self.notify_ended = notify_ended
+        self.timer_ended_use_text = timer_ended_use_text
+        self.timer_ended_display_text = timer_ended_display_text
+        self.timer_ended_use_text_to_voice = timer_ended_use_text_to_voice
+        self.timer_ended_text_to_voice_text = timer_ended_text_to_voice_text
+        self.timer_ended_interrupt_speech = timer_ended_interrupt_speech
+        self.timer_ended_play_sound_file = timer_ended_play_sound_file
+        self.timer_ended_sound_file_path = timer_ended_sound_file_path
+
+        self.timer_end_early_triggers = timer_end_early_triggers if timer_end_early_triggers is not None else []
+        self.variables = variables if variables is not None else []
+        self.counter_duration = counter_duration
+        self.reset_counter_if_unmatched = reset_counter_if_unmatched
+        self.cooldown_duration = cooldown_duration
+
+        self.use_webhook = use_webhook
+        self.webhook_id = webhook_id
+        self.webhook_message = webhook_message
+
+    @classmethod
+    def deserialize(cls, item):
+        return cls(trigger_id=item.get("trigger_id", None),
+                   name=item.get("name", ""),
+                   timer_name=item.get("timer_name", ""),
+                   search_text=item.get("search_text", ""),
+                   use_regex=bool(item.get("use_regex", False)),
+                   duration=float(item.get("duration", 0)),
+                   category=item.get("category", ""),
+                   timer_type=item.get("timer_type", "Timer (Count Down)"),
+                   use_text=bool(item.get("use_text", False)),
+                   display_text=item.get("display_text", ""),
+                   use_text_to_voice=bool(item.get("use_text_to_voice", False)),
+                   text_to_voice_text=item.get("text_to_voice_text", ""),
+                   timer_start_behavior=item.get("timer_start_behavior", "Start a new timer"),
+                   interrupt_speech=bool(item.get("interrupt_speech", False)),
+                   play_sound_file=bool(item.get("play_sound_file", False)),
+                   sound_file_path=item.get("sound_file_path"),
+                   restart_timer_matches=bool(item.get("restart_timer_matches", False)),
+                   restart_timer_regardless=bool(item.get("restart_timer_regardless", False)),
+                   notify_ending=bool(item.get("notify_ending", False)),
+                   timer_ending_duration=int(item.get("timer_ending_duration", 0)),
+                   timer_ending_use_text=bool(item.get("timer_ending_use_text", False)),
+                   timer_ending_display_text=item.get("timer_ending_display_text"),
+                   timer_ending_use_text_to_voice=bool(item.get("timer_ending_use_text_to_voice", False)),
+                   timer_ending_text_to_voice_text=item.get("timer_ending_text_to_voice_text"),
+                   timer_ending_interrupt_speech=bool(item.get("timer_ending_interrupt_speech", False)),
+                   timer_ending_play_sound_file=bool(item.get("timer_ending_play_sound_file", False)),
+                   timer_ending_sound_file_path=item.get("timer_ending_sound_file_path"),
+                   notify_ended=bool(item.get("notify_ended", False)),
+                   timer_ended_use_text=bool(item.get("timer_ended_use_text", False)),
+                   timer_ended_display_text=item.get("timer_ended_display_text"),
+                   timer_ended_use_text_to_voice=bool(item.get("timer_ended_use_text_to_voice", False)),
+                   timer_ended_text_to_voice_text=item.get("timer_ended_text_to_voice_text"),
+                   timer_ended_interrupt_speech=bool(item.get("timer_ended_interrupt_speech", False)),
+                   timer_ended_play_sound_file=bool(item.get("timer_ended_play_sound_file", False)),
+                   timer_ended_sound_file_path=item.get("timer_ended_sound_file_path"),
+                   timer_end_early_triggers=item.get("timer_end_early_triggers", []),
+                   variables=item.get("variables", []),
+                   reset_counter_if_unmatched=bool(item.get("reset_counter_if_unmatched", False)),
+                   counter_duration=int(item.get("counter_duration", 0)),
+                   cooldown_duration=float(item.get("cooldown_duration", 0)),
+                   use_webhook=bool(item.get("use_webhook", False)),
+                   webhook_id=item.get("webhook_id"),
+                   webhook_message=item.get("webhook_message", ""))
+
+    def serialize(self):
+        hash = {"type": "Trigger"}
+        for name in self.__slots__:
+            hash[name] = getattr(self, name)
+        return hash
+
+
+class TriggerExpressions():
+    """
+    The compiled expressions of a TriggerSpec: its search text, early
+    enders and variables. Shared by the TriggerRuntime of every profile.
+    """
+    __slots__ = ("spec", "regex_engine", "regex_engine_enders", "regex_variables", "compiled", "evaluations")
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.regex_engine = RegexEngine()
+        self.regex_engine_enders = []
+        self.regex_variables = []
+        self.compiled = False
+        # Expressions evaluated, for profiling
+        self.evaluations = 0
+
+    def ensureCompiled(self):
+        if not self.compiled:
+            self.compile()
+
+    def compile(self):
+        spec = self.spec
+        self.regex_engine_enders = []
+        self.regex_variables = []
+
+        search_text = spec.search_text
+        if not spec.use_regex:
+            search_text = search_text.replace("*", "\\w+")
+        try:
+            self.regex_engine.compile(search_text)
+        except Exception as e:
+            print(e)
+            print(spec.search_text)
+
+        for trigger in spec.timer_end_early_triggers:
+            regex_engine = RegexEngine()
+            text = trigger["text"]
+            if len(text) > 0:
+                if not trigger["use_regex"]:
+                    text = text.replace("*", "\\w+")
+                regex_engine.compile(text)
+                self.regex_engine_enders.append(regex_engine)
+
+        for variable in spec.variables:
+            regex_engine = RegexEngine()
+            text = variable["search"]
+            if len(text) > 0:
+                text = text.replace("*", "\\w+")
+                regex_engine.compile(text)
+                item = {
+                  "regex_engine": regex_engine,
+                  "variable": variable
+                }
+                self.regex_variables.append(item)
+
+        self.compiled = True
+
+    def regexEngines(self):
+        engines = [self.regex_engine] + self.regex_engine_enders
+        engines.extend(item["regex_engine"] for item in self.regex_variables)
+        return engines
+
+    def evaluate(self, engine, text, hits):
+        """engine.match(text), unless the prefilter hits rule it out."""
+        if not engine.wants(hits):
+            return None
+        self.evaluations += 1
+        return engine.match(text)
+
+
+class TriggerRuntime():
+    """
+    The state of a trigger running for one profile: its counter, cooldown,
+    captured variables and running timers. Every boxed character gets its
+    own, so a fire in one log never cools down or ends the timers of the
+    trigger in another. Matching only needs this and a TriggerSpec, see
+    volt.replay.
+    """
+    __slots__ = (
+        "spec", "expressions", "counter", "last_matched_at", "last_fired_at",
+        "variable_values", "timers", "last_timer"
+    )
+
+    def __init__(self, spec, expressions=None):
+        self.spec = spec
+        self.expressions = expressions if expressions is not None else TriggerExpressions(spec)
+
+        self.counter = 0
+        self.last_matched_at = None
+        self.last_fired_at = None
+        self.variable_values = {}
+        self.timers = []
+        self.last_timer = None
+
+    def compile(self):
+        self.expressions.compile()
+
+    def regexEngines(self):
+        return self.expressions.regexEngines()
+
+    def updateVariables(self, text, hits, profile=None):
+        expressions = self.expressions
+        for item in expressions.regex_variables:
+            engine = item["regex_engine"]
+            var = item["variable"]
+            var_matches = expressions.evaluate(engine, text, hits)
+            if var_matches:
+                result = engine.execute(var["value"], matches=var_matches, profile=profile)
+                if result:
+                    self.variable_values[var["name"]] = result
+
+    def endedEarly(self, text, hits):
+        """True when one of the early ender expressions matches."""
+        expressions = self.expressions
+        for ender in expressions.regex_engine_enders:
+            if expressions.evaluate(ender, text, hits):
+                return True
+        return False
+
+    def match(self, text, hits, now):
+        """
+        Returns the match when the trigger fires for text at now (seconds),
+        counting it, or None when it does not match or is cooling down.
+        """
+        expressions = self.expressions
+        if not expressions.regex_engine.expression:
+            return None
+        m = expressions.evaluate(expressions.regex_engine, text, hits)
+
+        if self.last_matched_at and now > self.last_matched_at + int(self.spec.counter_duration):
+            self.counter = 0
+
+        if not m:
+            return None
+        self.last_matched_at = now
+
+        # Check cooldown - if cooldown is active, ignore this trigger
+        if self.spec.cooldown_duration > 0 and self.last_fired_at:
+            if now - self.last_fired_at < self.spec.cooldown_duration:
+                return None
+
+        self.last_fired_at = now
+        self.counter += 1
+        return m
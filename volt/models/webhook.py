@@ -3,7 +3,8 @@ from PySide6.QtWidgets import QListWidgetItem
 class Webhook(QListWidgetItem):
     def __init__(self, parent=None, webhook_id=None, name="", url="", method="POST", 
                  content_type="application/json", auth_type="None", auth_header="", 
-                 auth_value="", custom_headers=None):
+                 auth_value="", custom_headers=None, coalesce_window=0, coalesce_count=50,
+                 coalesce_size=2000):
         super().__init__(name, parent)
         self._parent = parent
         self.webhook_id = webhook_id if webhook_id is not None else id(self)
@@ -15,6 +16,11 @@ class Webhook(QListWidgetItem):
         self.setAuthHeader(auth_header)
         self.setAuthValue(auth_value)
         self.custom_headers = custom_headers if custom_headers is not None else {}
+        # Messages fired within coalesce_window seconds are sent together,
+        # at most coalesce_count of them and coalesce_size characters
+        self.coalesce_window = coalesce_window
+        self.coalesce_count = coalesce_count
+        self.coalesce_size = coalesce_size
 
     def setName(self, val):
         self.name = val
@@ -48,7 +54,10 @@ class Webhook(QListWidgetItem):
             "auth_type": self.auth_type,
             "auth_header": self.auth_header,
             "auth_value": self.auth_value,
-            "custom_headers": self.custom_headers
+            "custom_headers": self.custom_headers,
+            "coalesce_window": self.coalesce_window,
+            "coalesce_count": self.coalesce_count,
+            "coalesce_size": self.coalesce_size
         }
         return hash
 
@@ -0,0 +1,178 @@
+"""
+Replays an EverQuest log through the triggers of a Volt config without the
+GUI, as fast as the engine allows, and reports which triggers fired along
+with the engine's throughput.
+
+    python -m volt.replay data/config.json eqlog_Name_server.txt
+"""
+import sys
+import time
+import argparse
+import ujson as json
+
+from collections import Counter
+from datetime import timedelta
+
+from volt.models.trigger_spec import TriggerSpec, TriggerRuntime
+from volt.utils.timestamp_parser import TimestampParser
+from volt.utils.trigger_set import TriggerSet
+
+
+class ReplayTrigger():
+    """
+    A TriggerSpec run by a TriggerRuntime, with log timestamps standing in
+    for the wall clock and a deadline standing in for the timer that keeps
+    the early enders live.
+    """
+    def __init__(self, item, group_name):
+        self.spec = TriggerSpec.deserialize(item)
+        self.runtime = TriggerRuntime(self.spec)
+        self.runtime.compile()
+        self.trigger_id = self.spec.trigger_id
+        self.name = group_name + " / " + self.spec.name if group_name else self.spec.name
+        self.timer_ends_at = None
+
+    def regexEngines(self):
+        return self.runtime.regexEngines()
+
+    def onLogUpdate(self, timestamp, text, hits):
+        """Returns True when the trigger fires for the line."""
+        runtime = self.runtime
+        runtime.updateVariables(text, hits)
+
+        if self.timer_ends_at is not None:
+            if timestamp >= self.timer_ends_at or runtime.endedEarly(text, hits):
+                self.timer_ends_at = None
+
+        if not runtime.match(text, hits, timestamp.timestamp()):
+            return False
+
+        if self.spec.timer_name and self.spec.duration > 0 and runtime.expressions.regex_engine_enders:
+            self.timer_ends_at = timestamp + timedelta(seconds=self.spec.duration)
+        return True
+
+
+def load_triggers(config, profile_name=None):
+    """
+    Returns the triggers of a config in tree order, limited to those enabled
+    in the named profile when one is given.
+    """
+    trigger_ids = None
+    if profile_name:
+        for profile in config.get("profiles", []):
+            if profile["name"] == profile_name:
+                trigger_ids = set(profile.get("trigger_ids", []))
+                break
+        else:
+            raise ValueError(f"No profile named {profile_name}")
+
+    triggers = []
+    def walk(item, group_name):
+        if item["type"] == "Trigger":
+            if trigger_ids is None or item.get("trigger_id") in trigger_ids:
+                triggers.append(ReplayTrigger(item, group_name))
+        else:
+            name = group_name + " / " + item["name"] if group_name else item["name"]
+            for child in item["children"]:
+                walk(child, name)
+
+    for item in config.get("trigger_groups", []):
+        walk(item, "")
+    return triggers
+
+
+def read_log(log_file):
+    """Yields the (timestamp, text) of every well formed line of a log."""
+    parser = TimestampParser()
+    with open(log_file, 'rb') as f:
+        for raw in f:
+            line = raw.decode('utf-8', errors='replace')
+            index = line.find("]") + 1
+            if not index:
+                continue
+            try:
+                timestamp = parser.parse(line[1:index - 1].strip())
+            except ValueError:
+                continue
+            text = line[index:].strip()
+            if text:
+                yield timestamp, text
+
+
+def percentile(histogram, total, fraction):
+    rank = fraction * total
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= rank:
+            return value
+    return 0
+
+
+def replay(triggers, lines, stats, prefilter=True):
+    """
+    Feeds lines through the triggers. Returns the fire count per trigger
+    name and a histogram of per line latency in microseconds.
+    """
+    trigger_set = TriggerSet(triggers)
+    fired = Counter()
+    latencies = Counter()
+    clock = time.perf_counter_ns
+
+    for timestamp, text in lines:
+        start = clock()
+        if prefilter:
+            candidates, hits = trigger_set.candidates(text)
+        else:
+            candidates, hits = triggers, None
+        for trigger in candidates:
+            if trigger.onLogUpdate(timestamp, text, hits):
+                fired[trigger.name] += 1
+        latencies[(clock() - start) // 1000] += 1
+        stats["lines"] += 1
+
+    stats["evaluations"] += sum(trigger.runtime.expressions.evaluations for trigger in triggers)
+    return fired, latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m volt.replay",
+                                     description="Replay an EverQuest log through the triggers of a Volt config.")
+    parser.add_argument("config", help="Volt config.json")
+    parser.add_argument("log_file", help="EverQuest log file")
+    parser.add_argument("--profile", help="only use the triggers enabled in this profile")
+    parser.add_argument("--no-prefilter", action="store_true", help="evaluate every trigger on every line")
+    parser.add_argument("--top", type=int, default=50, help="number of fired triggers to list (default 50)")
+    args = parser.parse_args(argv)
+
+    with open(args.config, 'r') as openfile:
+        config = json.load(openfile)
+
+    stats = Counter()
+    start = time.perf_counter()
+    try:
+        triggers = load_triggers(config, args.profile)
+    except ValueError as e:
+        print(e)
+        return 1
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fired, latencies = replay(triggers, read_log(args.log_file), stats, prefilter=not args.no_prefilter)
+    elapsed = time.perf_counter() - start
+
+    lines = stats["lines"]
+    print(f"Triggers:     {len(triggers)} (compiled in {compile_time:.2f}s)")
+    print(f"Lines:        {lines:,} in {elapsed:.2f}s, {lines / elapsed if elapsed else 0:,.0f} lines/sec")
+    print(f"Evaluations:  {stats['evaluations']:,} ({stats['evaluations'] / lines if lines else 0:.2f} per line)")
+    print(f"Latency:      p50 {percentile(latencies, lines, 0.50)}us, "
+          f"p99 {percentile(latencies, lines, 0.99)}us, "
+          f"max {max(latencies) if latencies else 0}us")
+    print(f"Fired:        {sum(fired.values()):,} times by {len(fired)} triggers")
+    for name, count in fired.most_common(args.top):
+        print(f"{count:>12,}  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
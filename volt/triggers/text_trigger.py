@@ -5,8 +5,6 @@ from PySide6.QtGui import QPainter, QColor, QFont
 from datetime import datetime, timedelta
 
 class TextTrigger(QLabel):
-    signal = Signal()
-
     def __init__(self, parent, label, category=None, matches=None):
         super().__init__()
 
@@ -19,12 +17,7 @@ class TextTrigger(QLabel):
         self.matches = matches
 
         if self.category:
-            self.setStyleSheet(
-                "OverlayWindow QLabel"
-                "{"
-                    f"color: {self.category.text_font_color};"
-                "}"
-            )
+            self.setStyleSheet(self.category.textStyleSheet())
         else:
             self.setStyleSheet(
                 "OverlayWindow QLabel"
@@ -37,30 +30,22 @@ class TextTrigger(QLabel):
         self.adjustSize()
         self.setText(label)
 
-        self.signal.connect(self.onUpdate)
-
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.onUpdateEmit)
-        self.timer.start(100)
+        # Removed by the app's TickScheduler once its time is up
+        self.scheduler = QApplication.instance().tick_scheduler
+        self.scheduler.schedule(self, self.endtime.timestamp() * 1000, self.onEnded)
 
 
     def updateFont(self):
         font = QFont(self.parent.data_model.font, self.parent.data_model.font_size)
         self.setFont(font)
 
-    def onUpdateEmit(self):
-        self.signal.emit()
-
     def onDoubleClick(self):
         self.destroy()
 
-    @Slot()
-    def onUpdate(self):
+    def onEnded(self):
         if self.active:
-            ratio = 1 - (datetime.now() - self.starttime) / (self.endtime - self.starttime)
-            if(ratio < 0):
-                self.active = False
-                self.destroy()
+            self.active = False
+            self.destroy()
 
     def removeFromLayout(self):
         self.setVisible(False)
@@ -71,12 +56,7 @@ class TextTrigger(QLabel):
         self.setVisible(True)
 
     def destroy(self):
-        self.timer.stop()
-        try:
-            self.signal.disconnect(self.onUpdate)
-            self.timer.timeout.disconnect(self.onUpdateEmit)
-        except:
-            pass
+        self.scheduler.remove(self)
         self.parent.triggers.remove(self)
         self.removeFromLayout()
         self.setParent(None)
@@ -1,176 +1,151 @@
 import time
 import re
+from playsound import playsound
 
-from PySide6.QtWidgets import QApplication, QProgressBar, QSizePolicy, QWidget, QVBoxLayout
-from PySide6.QtCore import Signal, Slot, QObject, Qt, QTimer, QPropertyAnimation
-from PySide6.QtGui import QFont
+from functools import lru_cache
 
-class Timer(QWidget):
-    RESOLUTION = 200
+from PySide6.QtWidgets import QApplication
 
-    signal = Signal()
-
-    def __init__(self, parent, label, duration, trigger=None, category=None, matches=None):
-        super().__init__()
+@lru_cache(maxsize=4096)
+def natural_key(label):
+    """Sorts "Timer 9" before "Timer 10", computed once per label."""
+    return tuple(int(t) if t.isdigit() else t.lower() for t in re.split(r'(\d+)', label))
 
+class Timer():
+    """
+    A timer bar, one row of its overlay's TimerModel painted by the
+    TimerDelegate. Updated by the app's TickScheduler on every frame, with
+    the ending notification and the end itself scheduled as deadlines.
+    """
+    def __init__(self, parent, label, duration, trigger=None, category=None, matches=None, profile=None):
         self.trigger = trigger
         self.category = category
         self.matches = matches
+        self.profile = profile
         self.active = True
         self.label = label
         self.parent = parent
         self.duration = duration
-        self.layout = QVBoxLayout(self)
-        self.layout.setAlignment(Qt.AlignTop)
-        self.layout.setSpacing(1)
-        self.layout.setContentsMargins(0, 0, 0, 1);
-
-        self.pbar = QProgressBar(self)
-        self.pbar.setMinimum(0)
-        self.pbar.setMaximum(1000)
-        self.pbar.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        # Kept up to date by the TimerModel
+        self.row = None
+
+        self.scheduler = QApplication.instance().tick_scheduler
         self.restartTimer()
-        #self.pbar.valueChanged.connect(self.onUpdate)
-        self.pbar.show()
-        self.pbar.setStyleSheet(
-            "QProgressBar"
-            "{"
-                f"color: {self.category.timer_font_color};"
-                "background-color: rgba(0, 0, 0, 100);"
-                "border: 0;"
-            "}"
-
-            "QProgressBar::chunk"
-            "{"
-                f"color: {self.category.timer_bar_color};"
-                f"background: {self.category.timer_bar_color};"
-            "}"
-        )
-        self.updateFont()
-        self.adjustSize()
-
-
-        #self.timer = QPropertyAnimation(self.pbar, b"value", self)
-        #self.timer.setDuration(self.duration * 1000)
-        #self.timer.setStartValue(1000)
-        #self.timer.setEndValue(0)
-        #self.timer.start()
-
-        timer_update_ms = int(self.duration * 1000 / Timer.RESOLUTION)
-        if timer_update_ms < 50:
-            timer_update_ms = 50
-        if timer_update_ms > 1000:
-            timer_update_ms = 1000
-
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.onUpdate)
-        self.timer.start(timer_update_ms)
-        self.layout.addWidget(self.pbar)
-
-    def updateFont(self):
-        font = QFont(self.parent.data_model.font, self.parent.data_model.font_size)
-        self.pbar.setFont(font)
+        self.scheduler.add(self)
+
+    def isVisible(self):
+        return self.parent is not None and self.parent.isVisible()
 
     def restartTimer(self):
         self.ending_notified = False
         self.starttime = time.time() * 1000
         self.endtime = self.starttime + (self.duration * 1000)
+        self.next_tick = 0
         ts = self.strfdelta((self.endtime - self.starttime), '%M:%S')
-        self.pbar.setFormat(f"{ts} - {self.label}")
-        self.pbar.setValue(1000)
-        if self.trigger and self.trigger.timer_type == "Stopwatch (Count Up)":
-            self.pbar.setValue(0)
+        self.format = f"{ts} - {self.label}"
+        self.value = 1000
+        if self.isStopwatch():
+            self.value = 0
+        if self.row is not None:
+            self.parent.timer_model.moveTimer(self, self.parent.timerSortKey(self))
+            self.parent.timer_model.timerChanged(self)
+
+        self.scheduler.reschedule(self)
+        if self.isStopwatch():
+            if self.duration > 0:
+                self.scheduler.schedule(self, self.endtime, self.onEnded)
+        else:
+            ending_duration = self.trigger.timer_ending_duration * 1000 if self.trigger else 0
+            self.scheduler.schedule(self, self.endtime - ending_duration, self.onEnding)
+            self.scheduler.schedule(self, self.endtime, self.onEnded)
 
-    def onUpdateEmit(self):
-        self.signal.emit()
+    def isStopwatch(self):
+        return self.trigger and self.trigger.timer_type == "Stopwatch (Count Up)"
 
     def onDoubleClick(self):
         self.destroy()
 
-    def sortValue(self):
-        if self.parent.data_model.sort_method == "Time Remaining":
-            return self.endtime - (time.time() * 1000)
-        elif self.parent.data_model.sort_method[:10] == "Timer Text":
-            return [int(t) if t.isdigit() else t.lower() for t in re.split(r'(\d+)', self.label)]
+    def sortKey(self, sort_method):
+        """The key this timer sorts by, fixed until it is restarted."""
+        if sort_method == "Time Remaining":
+            return self.endtime
+        elif sort_method[:10] == "Timer Text":
+            return natural_key(self.label)
         else:
             return self.starttime
 
-
-    def onUpdate(self):
-        done = False
-        current_time = time.time() * 1000
+    def onTick(self, current_time):
+        if current_time < self.next_tick:
+            return
         ratio = 1
 
         if self.duration > 0:
             ratio = (current_time - self.starttime) / (self.endtime - self.starttime)
 
-        if self.trigger and self.trigger.timer_type == "Stopwatch (Count Up)":
+        if self.isStopwatch():
             if self.duration > 0:
-                done = ratio > 1
-                delta = (ratio * (self.endtime - self.starttime))
+                delta = (min(ratio, 1) * (self.endtime - self.starttime))
             else:
-                done = False
                 delta = (current_time - self.starttime)
                 ratio = 1
         else:
-            ratio = 1 - ratio
+            ratio = max(1 - ratio, 0)
             delta = (ratio * (self.endtime - self.starttime))
-            done = ratio <= 0
-
 
-        ts = self.strfdelta(delta, '%M:%S')
-        self.pbar.setValue(int(ratio * 1000))
-        self.pbar.setFormat(f"{ts} - {self.label}")
-        self.pbar.update()
-
-        if (self.ending_notified == False and delta <= self.trigger.timer_ending_duration * 1000):
-            self.notifyEnding()
+        # Nothing on the bar changes before the clock reaches its next whole
+        # second or the value its next step (a thousandth of the duration)
+        if self.isStopwatch():
+            second = 1000 - delta % 1000
+        else:
+            second = delta % 1000
+        self.next_tick = current_time + min(second or 1000, self.duration if self.duration > 0 else 1000)
+
+        value = int(ratio * 1000)
+        format = f"{self.strfdelta(delta, '%M:%S')} - {self.label}"
+        if value != self.value or format != self.format:
+            self.value = value
+            self.format = format
+            self.parent.timer_model.timerChanged(self)
+
+    def onEnding(self):
+        if not self.ending_notified:
             self.ending_notified = True
+            self.notifyEnding()
 
-        if(done):
-            self.active = False
-            self.notifyEnded()
-            if self.trigger and self.trigger.timer_type == "Repeating Timer":
-                self.parent.addTimer(self.label, self.duration, self.trigger)
-            self.destroy()
-
-    def removeFromLayout(self):
-        self.pbar.setVisible(False)
-        self.pbar.setTextVisible(False)
-        self.parent.trigger_layout.removeWidget(self)
-
-    def addToLayout(self):
-        self.pbar.setVisible(True)
-        self.pbar.setTextVisible(True)
-        self.parent.trigger_layout.addWidget(self)
+    def onEnded(self):
+        self.active = False
+        self.notifyEnded()
+        if self.trigger and self.trigger.timer_type == "Repeating Timer":
+            timer = self.parent.addTimer(self.label, self.duration, self.trigger, category=self.category,
+                                         matches=self.matches, profile=self.profile)
+            QApplication.instance()._signals['timers'].append(timer)
+            self.trigger.runtime(self.profile).timers.append(timer)
+        self.destroy()
 
     def destroy(self):
-        self.timer.stop()
-        self.parent.triggers.remove(self)
-        self.removeFromLayout()
+        self.scheduler.remove(self)
+        self.parent.timer_model.removeTimer(self)
         self.trigger.removeTimer(self)
         try:
             QApplication.instance()._signals['timers'].remove(self)
         except (ValueError, AttributeError):
             pass
         self.parent = None
-        self.deleteLater()
 
     def notifyEnding(self):
         if self.trigger.notify_ending:
-            for overlay in self.trigger.text_overlays:
-                if overlay.data_model.name == self.category.text_overlay:
-                    if self.trigger.timer_ending_use_text:
-                        display_text = self.trigger.regex_engine.execute(self.trigger.timer_ending_display_text, self.matches)
-                        overlay.addTextTrigger(self.trigger.timer_ending_display_text)
+            for overlay in self.trigger.category_router.route(self.category).text_overlays:
+                if self.trigger.timer_ending_use_text:
+                    display_text = self.trigger.regex_engine.execute(self.trigger.timer_ending_display_text, self.matches, profile=self.profile)
+                    overlay.addTextTrigger(self.trigger.timer_ending_display_text)
 
             if self.trigger.timer_ending_interrupt_speech:
                 self.trigger.speaker.stop()
 
             if self.trigger.timer_ending_use_text_to_voice:
                 text_to_say = self.trigger.timer_ending_text_to_voice_text
-                if self.trigger.profiles_manager.current_profile:
-                    text_to_say = self.trigger.regex_engine.execute(text_to_say)
+                if self.profile:
+                    text_to_say = self.trigger.regex_engine.execute(text_to_say, self.matches, profile=self.profile)
                 self.trigger.speaker.say(text_to_say)
 
             if self.trigger.timer_ending_play_sound_file:
@@ -180,19 +155,18 @@ class Timer(QWidget):
 
     def notifyEnded(self):
         if self.trigger.notify_ended:
-            for overlay in self.trigger.text_overlays:
-                if overlay.data_model.name == self.category.text_overlay:
-                    if self.trigger.timer_ended_use_text:
-                        display_text = self.trigger.regex_engine.execute(self.trigger.timer_ended_display_text, self.matches)
-                        overlay.addTextTrigger(display_text)
+            for overlay in self.trigger.category_router.route(self.category).text_overlays:
+                if self.trigger.timer_ended_use_text:
+                    display_text = self.trigger.regex_engine.execute(self.trigger.timer_ended_display_text, self.matches, profile=self.profile)
+                    overlay.addTextTrigger(display_text)
 
             if self.trigger.timer_ended_interrupt_speech:
                 self.trigger.speaker.stop()
 
             if self.trigger.timer_ended_use_text_to_voice:
                 text_to_say = self.trigger.timer_ended_text_to_voice_text
-                if self.trigger.profiles_manager.current_profile:
-                    text_to_say = self.trigger.regex_engine.execute(text_to_say, self.matches)
+                if self.profile:
+                    text_to_say = self.trigger.regex_engine.execute(text_to_say, self.matches, profile=self.profile)
                 self.trigger.speaker.say(text_to_say)
 
             if self.trigger.timer_ended_play_sound_file:
@@ -0,0 +1,47 @@
+from PySide6.QtWidgets import QStyledItemDelegate
+from PySide6.QtCore import Qt, QSize, QRect
+from PySide6.QtGui import QColor, QFont, QFontMetrics
+
+from volt.models.timer_model import TimerModel
+
+class TimerDelegate(QStyledItemDelegate):
+    """
+    Paints the rows of a TimerModel as timer bars: a translucent background,
+    the bar in the category's bar color and the remaining time and label in
+    its font color.
+    """
+    BACKGROUND = QColor(0, 0, 0, 100)
+    FONT_COLOR = QColor("#ffff00")
+    BAR_COLOR = QColor("#ff0000")
+    # Gap below each bar and padding around its text
+    SPACING = 3
+    PADDING = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFont(QFont())
+
+    def setFont(self, font):
+        self.font = font
+        self.height = QFontMetrics(font).height() + self.PADDING * 2
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.height + self.SPACING)
+
+    def paint(self, painter, option, index):
+        timer = index.data(TimerModel.TimerRole)
+        if timer.category:
+            font_color, bar_color = timer.category.timerColors()
+        else:
+            font_color, bar_color = self.FONT_COLOR, self.BAR_COLOR
+
+        rect = QRect(option.rect.x(), option.rect.y(), option.rect.width(), self.height)
+
+        painter.save()
+        painter.fillRect(rect, self.BACKGROUND)
+        if timer.value > 0:
+            painter.fillRect(QRect(rect.x(), rect.y(), rect.width() * timer.value // 1000, rect.height()), bar_color)
+        painter.setFont(self.font)
+        painter.setPen(font_color)
+        painter.drawText(rect.adjusted(self.PADDING, 0, -self.PADDING, 0), Qt.AlignLeft | Qt.AlignVCenter, timer.format)
+        painter.restore()
@@ -0,0 +1,54 @@
+class CategoryRoute():
+    """The overlays the timers and texts of one category go to."""
+    __slots__ = ("category", "timer_overlays", "text_overlays")
+
+    def __init__(self, category, timer_overlays, text_overlays):
+        self.category = category
+        self.timer_overlays = [overlay for overlay in timer_overlays
+                               if overlay.data_model.name == category.timer_overlay]
+        self.text_overlays = [overlay for overlay in text_overlays
+                              if overlay.data_model.name == category.text_overlay]
+
+
+class CategoryRouter():
+    """
+    Category name to the routes of the categories with that name, so firing
+    a trigger does not search the category list and the overlays. Rebuilt
+    from categories(), timer_overlays() and text_overlays() on the first
+    lookup after invalidate(), which is called whenever one of them is edited.
+    """
+    def __init__(self, categories, timer_overlays, text_overlays):
+        self._categories = categories
+        self._timer_overlays = timer_overlays
+        self._text_overlays = text_overlays
+        self._routes = None
+        self._by_category = None
+
+    def invalidate(self):
+        self._routes = None
+        self._by_category = None
+
+    def rebuild(self):
+        timer_overlays = list(self._timer_overlays())
+        text_overlays = list(self._text_overlays())
+        self._routes = {}
+        self._by_category = {}
+        for category in self._categories():
+            route = CategoryRoute(category, timer_overlays, text_overlays)
+            self._routes.setdefault(category.name, []).append(route)
+            # Categories are list items, which cannot be hashed
+            self._by_category[id(category)] = route
+
+    def routes(self, name):
+        if self._routes is None:
+            self.rebuild()
+        return self._routes.get(name, ())
+
+    def route(self, category):
+        """The route of category, worked out on the spot when it was removed since."""
+        if self._routes is None:
+            self.rebuild()
+        route = self._by_category.get(id(category))
+        if route is None or route.category is not category:
+            route = CategoryRoute(category, self._timer_overlays(), self._text_overlays())
+        return route
@@ -0,0 +1,200 @@
+"""
+Where the config lives: a JSON file rewritten whole on every save, or an
+SQLite database holding one row per trigger, trigger group, profile,
+category, overlay and webhook, where a save only writes the rows that
+changed.
+
+    python -m volt.utils.config_store import data/config.json data/config.db
+    python -m volt.utils.config_store export data/config.db shared.json
+"""
+import os
+import sys
+import sqlite3
+import argparse
+import ujson as json
+
+# Lists of the config stored one item per row, with the field naming the row
+LIST_TABLES = {
+    "profiles": "name",
+    "overlays": "name",
+    "categories": "name",
+    "webhooks": "webhook_id"
+}
+TREE_TABLES = ("trigger_groups", "triggers")
+TABLES = TREE_TABLES + tuple(LIST_TABLES) + ("settings",)
+
+
+class JsonConfigStore():
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not os.path.isfile(self.path):
+            return {}
+        with open(self.path, 'r') as openfile:
+            return json.load(openfile)
+
+    def save(self, config):
+        tmp_path = self.path + ".tmp"
+        data = json.dumps(config, indent=4)
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class SqliteConfigStore():
+    """
+    Every table holds (key, parent, position, data) rows, data being the
+    item as JSON without its children. The trigger tree is rebuilt from the
+    parent keys and positions, groups and triggers share positions within
+    their parent. The rows last loaded or saved are kept to diff the next
+    save against.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.rows = None
+        self.changes = 0
+
+    def connect(self):
+        connection = sqlite3.connect(self.path)
+        for table in TABLES:
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ("
+                               "key TEXT PRIMARY KEY, parent TEXT, position INTEGER NOT NULL, data TEXT NOT NULL)")
+        return connection
+
+    def readRows(self, connection):
+        rows = {}
+        for table in TABLES:
+            rows[table] = {key: (parent, position, data) for key, parent, position, data in
+                           connection.execute(f"SELECT key, parent, position, data FROM {table}")}
+        return rows
+
+    def load(self):
+        connection = self.connect()
+        try:
+            self.rows = self.readRows(connection)
+        finally:
+            connection.close()
+        return to_config(self.rows)
+
+    def save(self, config):
+        rows = to_rows(config)
+        connection = self.connect()
+        try:
+            if self.rows is None:
+                self.rows = self.readRows(connection)
+            self.changes = 0
+            with connection:
+                for table in TABLES:
+                    new, old = rows[table], self.rows[table]
+                    changed = [(key,) + row for key, row in new.items() if old.get(key) != row]
+                    removed = [(key,) for key in old if key not in new]
+                    connection.executemany(f"INSERT OR REPLACE INTO {table} (key, parent, position, data) "
+                                           "VALUES (?, ?, ?, ?)", changed)
+                    connection.executemany(f"DELETE FROM {table} WHERE key = ?", removed)
+                    self.changes += len(changed) + len(removed)
+            self.rows = rows
+        except sqlite3.Error:
+            # The database may not match what was last seen anymore
+            self.rows = None
+            raise
+        finally:
+            connection.close()
+
+
+def unique_key(keys, value):
+    """str(value), suffixed when it is already taken (GINA imports can repeat group ids)."""
+    key = str(value)
+    if key in keys:
+        index = 1
+        while f"{key}#{index}" in keys:
+            index += 1
+        key = f"{key}#{index}"
+    keys.add(key)
+    return key
+
+def to_rows(config):
+    """Splits a config into {table: {key: (parent, position, data)}}."""
+    rows = {table: {} for table in TABLES}
+    tree_keys = {table: set() for table in TREE_TABLES}
+
+    def walk(item, parent, position):
+        if item["type"] == "Trigger":
+            key = unique_key(tree_keys["triggers"], item.get("trigger_id"))
+            rows["triggers"][key] = (parent, position, json.dumps(item))
+        else:
+            key = unique_key(tree_keys["trigger_groups"], item.get("group_id"))
+            data = {name: value for name, value in item.items() if name != "children"}
+            rows["trigger_groups"][key] = (parent, position, json.dumps(data))
+            for index, child in enumerate(item.get("children", [])):
+                walk(child, key, index)
+
+    for index, item in enumerate(config.get("trigger_groups", [])):
+        walk(item, None, index)
+
+    for table, field in LIST_TABLES.items():
+        keys = set()
+        for index, item in enumerate(config.get(table, [])):
+            rows[table][unique_key(keys, item.get(field))] = (None, index, json.dumps(item))
+
+    for name, value in config.items():
+        if name not in TREE_TABLES and name not in LIST_TABLES:
+            rows["settings"][name] = (None, 0, json.dumps(value))
+    return rows
+
+def to_config(rows):
+    """Rebuilds the config from to_rows output."""
+    config = {}
+    for key, (parent, position, data) in rows["settings"].items():
+        config[key] = json.loads(data)
+
+    for table in LIST_TABLES:
+        config[table] = [json.loads(data) for parent, position, data in sorted(rows[table].values(), key=lambda row: row[1])]
+
+    groups = {}
+    for key, (parent, position, data) in rows["trigger_groups"].items():
+        groups[key] = json.loads(data)
+        groups[key]["children"] = []
+
+    children = {}
+    for table in TREE_TABLES:
+        for key, (parent, position, data) in rows[table].items():
+            item = groups[key] if table == "trigger_groups" else json.loads(data)
+            if parent is not None and parent not in groups:
+                print(f"Config: {table} row {key} has no parent {parent}, moved to the top level")
+                parent = None
+            children.setdefault(parent, []).append((position, item))
+
+    for parent, items in children.items():
+        items.sort(key=lambda item: item[0])
+        if parent is not None:
+            groups[parent]["children"] = [item for position, item in items]
+    config["trigger_groups"] = [item for position, item in children.get(None, [])]
+    return config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m volt.utils.config_store",
+                                     description="Move a Volt config between JSON and SQLite.")
+    parser.add_argument("command", choices=["import", "export"],
+                        help="import: JSON into SQLite, export: SQLite to JSON")
+    parser.add_argument("source")
+    parser.add_argument("destination")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        source, destination = JsonConfigStore(args.source), SqliteConfigStore(args.destination)
+    else:
+        source, destination = SqliteConfigStore(args.source), JsonConfigStore(args.destination)
+
+    if not os.path.isfile(args.source):
+        print(f"No such file: {args.source}")
+        return 1
+    destination.save(source.load())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import time
+
+from threading import Condition, Thread
+
+class ConfigWriter():
+    """
+    Saves config snapshots to a store (see volt.utils.config_store) on a
+    single worker thread. A snapshot handed over while another is still
+    waiting replaces it, only the most recent one is ever written.
+    Snapshots must not be changed once handed over.
+    """
+    def __init__(self, store):
+        self.store = store
+        self.condition = Condition()
+        self.pending = None
+        self.writing = False
+        self.running = False
+        self.thread = None
+
+        self.saves = 0
+        self.last_ms = 0
+        self.total_ms = 0
+        self.max_ms = 0
+
+    def write(self, config):
+        with self.condition:
+            self.pending = config
+            if self.thread is None:
+                self.running = True
+                self.thread = Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and self.running:
+                    self.condition.wait()
+                if self.pending is None:
+                    return
+                config = self.pending
+                self.pending = None
+                self.writing = True
+
+            start = time.perf_counter()
+            try:
+                self.store.save(config)
+            except Exception as e:
+                print(f"Could not save config: {e}")
+            elapsed = (time.perf_counter() - start) * 1000
+
+            with self.condition:
+                self.writing = False
+                self.saves += 1
+                self.last_ms = elapsed
+                self.total_ms += elapsed
+                self.max_ms = max(self.max_ms, elapsed)
+                self.condition.notify_all()
+
+    def wait(self, timeout=None):
+        """Blocks until every handed over snapshot is on disk."""
+        with self.condition:
+            return self.condition.wait_for(lambda: self.pending is None and not self.writing, timeout)
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def metrics(self):
+        with self.condition:
+            return {
+                "saves": self.saves,
+                "last_ms": self.last_ms,
+                "average_ms": self.total_ms / self.saves if self.saves else 0,
+                "max_ms": self.max_ms
+            }
@@ -0,0 +1,165 @@
+"""
+Every trigger fire, kept in an SQLite database so weeks of them can be
+searched without holding them in widgets:
+
+    sqlite3 data/fire_history.db "SELECT trigger_name, COUNT(*) FROM fires GROUP BY trigger_name"
+"""
+import time
+import sqlite3
+import ujson as json
+
+from threading import Condition, Thread
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS fires ("
+    "id INTEGER PRIMARY KEY, log_time TEXT NOT NULL, wall_time REAL NOT NULL, trigger_id TEXT, "
+    "trigger_name TEXT NOT NULL, profile TEXT, text TEXT NOT NULL, groups TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS fires_log_time ON fires (log_time)",
+    "CREATE INDEX IF NOT EXISTS fires_trigger_id ON fires (trigger_id)",
+    "CREATE INDEX IF NOT EXISTS fires_profile ON fires (profile)"
+)
+COLUMNS = ("log_time", "wall_time", "trigger_id", "trigger_name", "profile", "text", "groups")
+
+
+class FireHistory():
+    """
+    record() queues a fire, a writer thread inserts whatever was queued in
+    one transaction every flush_interval seconds. Queries run on the
+    calling thread with their own connection, the database is in WAL mode
+    so they do not wait on the writer. Once the database could not be
+    opened, or after stop(), record() drops the fires.
+    """
+    def __init__(self, path, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.condition = Condition()
+        self.pending = []
+        self.writing = False
+        self.flushing = False
+        self.running = False
+        self.failed = False
+        self.stopped = False
+        self.thread = None
+        self.written = 0
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            connection.execute(statement)
+        return connection
+
+    def record(self, log_time, trigger_id, trigger_name, profile, text, groups=None):
+        """log_time is the time the log line was written, as YYYY-MM-DD HH:MM:SS."""
+        row = (log_time, time.time(), trigger_id, trigger_name, profile, text, json.dumps(groups or []))
+        with self.condition:
+            if self.failed or self.stopped:
+                return
+            self.pending.append(row)
+            if self.thread is None:
+                self.running = True
+                self.thread = Thread(target=self.run, daemon=True)
+                self.thread.start()
+            elif len(self.pending) == 1:
+                # The writer only sleeps without a timeout while nothing is queued
+                self.condition.notify_all()
+
+    def run(self):
+        try:
+            connection = self.connect()
+        except sqlite3.Error as e:
+            print(f"Could not open fire history: {e}")
+            with self.condition:
+                self.failed = True
+                self.pending = []
+                self.condition.notify_all()
+            return
+
+        try:
+            while True:
+                with self.condition:
+                    while not self.pending and self.running:
+                        self.condition.wait()
+                    if not self.pending:
+                        return
+                    # Let the fires of the next flush_interval join this transaction
+                    self.condition.wait_for(lambda: self.flushing or not self.running, self.flush_interval)
+                    rows = self.pending
+                    self.pending = []
+                    self.writing = True
+
+                try:
+                    with connection:
+                        connection.executemany(f"INSERT INTO fires ({', '.join(COLUMNS)}) "
+                                               "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                except sqlite3.Error as e:
+                    print(f"Could not save {len(rows)} fires: {e}")
+
+                with self.condition:
+                    self.writing = False
+                    self.written += len(rows)
+                    self.condition.notify_all()
+        finally:
+            connection.close()
+
+    def flush(self, timeout=None):
+        """Writes the queued fires now and blocks until they are on disk."""
+        with self.condition:
+            self.flushing = True
+            self.condition.notify_all()
+            try:
+                return self.condition.wait_for(lambda: not self.pending and not self.writing, timeout)
+            finally:
+                self.flushing = False
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.running = False
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def query(self, trigger_id=None, trigger_name=None, profile=None, text=None,
+                    since=None, until=None, before=None, limit=100):
+        """
+        Fires as (id, log_time, trigger_name, profile, text) rows, newest
+        first. trigger_name and text match anywhere, since and until bound
+        log_time, and before pages on: pass the id of the last row seen.
+        """
+        clauses = []
+        params = []
+        if trigger_id is not None:
+            clauses.append("trigger_id = ?")
+            params.append(trigger_id)
+        if trigger_name:
+            clauses.append("trigger_name LIKE ?")
+            params.append(f"%{trigger_name}%")
+        if profile:
+            clauses.append("profile = ?")
+            params.append(profile)
+        if text:
+            clauses.append("text LIKE ?")
+            params.append(f"%{text}%")
+        if since:
+            clauses.append("log_time >= ?")
+            params.append(since)
+        if until:
+            clauses.append("log_time < ?")
+            params.append(until)
+        if before is not None:
+            clauses.append("id < ?")
+            params.append(before)
+
+        sql = "SELECT id, log_time, trigger_name, profile, text FROM fires"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        connection = self.connect()
+        try:
+            return connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
@@ -0,0 +1,133 @@
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, "POSSESSIVE_REPEAT"):
+    REPEATS.add(sre_constants.POSSESSIVE_REPEAT)
+
+# Zero width opcodes never consume text, so literals on either side of them
+# are still adjacent in any matching line.
+ZERO_WIDTH = {sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT}
+
+
+def required_literals(expression):
+    """
+    Returns a frozenset of lowercase literals, at least one of which appears
+    in every line the compiled expression can match, or None when no such
+    literal could be extracted and the expression must always be evaluated.
+    """
+    if expression is None:
+        return None
+    try:
+        parsed = sre_parse.parse(expression.pattern, expression.flags)
+    except Exception:
+        return None
+    return _sequence(parsed)
+
+
+def _sequence(items):
+    options = []
+    run = []
+
+    def flush():
+        if run:
+            options.append(frozenset(["".join(run)]))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            ch = chr(av)
+            if ch.isascii():
+                run.append(ch.lower())
+                continue
+            flush()
+        elif op in ZERO_WIDTH:
+            continue
+        else:
+            flush()
+            option = None
+            if op is sre_constants.SUBPATTERN:
+                option = _sequence(av[-1])
+            elif op is sre_constants.BRANCH:
+                option = _branch(av[1])
+            elif op in REPEATS and av[0] >= 1:
+                option = _sequence(av[2])
+            elif op is getattr(sre_constants, "ATOMIC_GROUP", None):
+                option = _sequence(av)
+            if option:
+                options.append(option)
+    flush()
+
+    if not options:
+        return None
+    # Prefer the alternative whose weakest literal is the longest
+    return max(options, key=lambda option: min(len(literal) for literal in option))
+
+
+def _branch(branches):
+    literals = set()
+    for branch in branches:
+        option = _sequence(branch)
+        if option is None:
+            return None
+        literals.update(option)
+    return frozenset(literals)
+
+
+class LiteralPrefilter():
+    """
+    Aho-Corasick automaton over a set of lowercase literals. scan() returns
+    every literal contained in a line in a single pass over its characters.
+    """
+
+    def __init__(self, literals=()):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+
+        for literal in set(literals):
+            self._add(literal)
+        self._link()
+
+    def _add(self, literal):
+        state = 0
+        for ch in literal:
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = next_state
+        self.output[state] = (literal,)
+
+    def _link(self):
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def scan(self, text):
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        found = set()
+        state = 0
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
@@ -0,0 +1,112 @@
+import os
+import time
+import zlib
+import ujson as json
+
+from threading import Lock, Timer
+
+SIGNATURE_BYTES = 64
+
+def file_signature(log_file, stat=None):
+    """
+    Identifies a log file by inode and a checksum of its first bytes, so a
+    replaced or rotated file is not mistaken for the one a checkpoint was
+    taken from.
+    """
+    stat = stat or os.stat(log_file)
+    with open(log_file, 'rb') as f:
+        head = f.read(SIGNATURE_BYTES)
+    return {
+        "inode": stat.st_ino,
+        "signature": "%08x" % zlib.crc32(head),
+        "signature_size": len(head)
+    }
+
+class LogCheckpoints():
+    """
+    Durable per log checkpoints (offset, file signature and last timestamp).
+    Updates are kept in memory and written on a coalesced schedule, at most
+    once per flush_interval, by writing a temp file and renaming it over the
+    previous one.
+    """
+    def __init__(self, path, flush_interval=5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.checkpoints = {}
+        self.lock = Lock()
+        self.dirty = False
+        self.timer = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                self.checkpoints = json.load(f)
+        except (OSError, ValueError):
+            self.checkpoints = {}
+
+    def get(self, key):
+        with self.lock:
+            return self.checkpoints.get(key)
+
+    def update(self, key, offset, signature, timestamp=None):
+        with self.lock:
+            checkpoint = dict(signature)
+            checkpoint["offset"] = offset
+            checkpoint["saved_at"] = time.time()
+            previous = self.checkpoints.get(key)
+            if timestamp is not None:
+                checkpoint["timestamp"] = timestamp.isoformat()
+            elif previous:
+                checkpoint["timestamp"] = previous.get("timestamp")
+            self.checkpoints[key] = checkpoint
+            self.dirty = True
+            if self.timer is None:
+                self.timer = Timer(self.flush_interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            if not self.dirty:
+                return
+            data = json.dumps(self.checkpoints, indent=4)
+            self.dirty = False
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save log checkpoints: {e}")
+
+    def resumeOffset(self, key, log_file, max_catch_up):
+        """
+        Returns the checkpointed offset to resume log_file from, or None when
+        there is no usable checkpoint: the file was replaced or truncated
+        since, or the checkpoint is older than max_catch_up seconds.
+        """
+        checkpoint = self.get(key)
+        if not checkpoint:
+            return None
+        if time.time() - checkpoint.get("saved_at", 0) > max_catch_up:
+            return None
+        try:
+            stat = os.stat(log_file)
+            signature = file_signature(log_file, stat)
+        except OSError:
+            return None
+        offset = checkpoint.get("offset", 0)
+        if signature["inode"] != checkpoint.get("inode") or offset > stat.st_size:
+            return None
+        # The head checksum only covers what existed when it was taken
+        if checkpoint.get("signature_size") == signature["signature_size"] and \
+           checkpoint.get("signature") != signature["signature"]:
+            return None
+        return offset
@@ -1,44 +1,124 @@
-import time
 import os
-import signal
-import select
-import sys
-import re
 
 from datetime import datetime
-from PySide6.QtCore import QFileSystemWatcher
+from threading import Lock, Thread
+
 from PySide6.QtWidgets import QApplication
 
-from volt.utils.log_watcher import LogWatcher
-from threading import Thread
-from threading import Event
+from volt.utils.timestamp_parser import TimestampParser
+from volt.utils.log_checkpoints import file_signature, SIGNATURE_BYTES
 
 from watchdog.observers import Observer
-from watchdog.events import PatternMatchingEventHandler
+from watchdog.events import FileSystemEventHandler
+
+def normalize_path(path):
+    return os.path.normcase(os.path.abspath(path))
+
+CHUNK_SIZE = 65536
+# Upper bound on the bytes read per batch, so a large backlog is emitted in
+# several batches instead of one
+BATCH_SIZE = 1048576
 
-class LogReaderHandler(PatternMatchingEventHandler):
-    def __init__(self, *args, **kwargs):
-        # Keep track of the last read position for each file
+class LogFileReader():
+    """
+    Reads new lines from one log file, keeping its own offset and the
+    profile its lines belong to.
+
+    The file is kept open in binary mode between reads. Bytes are read into a
+    reusable buffer and only complete lines are decoded; a line the game is
+    still writing stays in pending until its newline arrives. file_position
+    is the offset just past the last complete line. The file is reopened when
+    it is replaced (a new inode) and reread from the start when it shrinks.
+    """
+    def __init__(self, log_file, profile):
+        self.log_file = log_file
+        self.profile = profile
+        # Keep track of the last read position
         self.file_position = None
+        self.timestamp_parser = TimestampParser()
+        # Identity of the file the offset belongs to, and the last line read
+        self.signature = None
+        self.last_timestamp = None
+        # Set when the offset was restored from a checkpoint at startup
+        self.backlog = False
+        self.lock = Lock()
+        self.file = None
+        self.inode = None
+        self.buffer = bytearray(CHUNK_SIZE)
+        self.pending = bytearray()
 
-        super(LogReaderHandler, self).__init__(*args, **kwargs)
+    def open(self):
+        self.file = open(self.log_file, 'rb', buffering=0)
+        stat = os.fstat(self.file.fileno())
+        self.inode = stat.st_ino
+        if self.file_position is None:
+            self.file_position = stat.st_size
+        elif self.file_position > stat.st_size:
+            self.file_position = 0
+            self.signature = None
+        self.file.seek(self.file_position)
+        self.pending.clear()
 
-    def process_new_lines(self, file_path):
-        last_pos = self.file_position or os.path.getsize(file_path)
-        with open(file_path, 'r') as f:
-            f.seek(last_pos)
-            for line in f:
-                if(len(line.strip()) > 0):
-                    timestamp, text = self.parse_line(line)
-                    QApplication.instance()._signals["logreader"].new_line.emit(timestamp, text)
-            self.file_position = f.tell()  # update last read position
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+        self.pending.clear()
 
-    def on_created(self, event):
-        print(event)
+    def reset(self):
+        """Starts over from the beginning of a newly created file."""
+        self.close()
+        self.file_position = 0
+        self.signature = None
 
-    def on_modified(self, event):
-        if not event.is_directory:
-            self.process_new_lines(event.src_path)
+    def read_new_lines(self):
+        try:
+            stat = os.stat(self.log_file)
+        except OSError:
+            return []
+
+        lines = []
+        if self.file and stat.st_ino != self.inode:
+            # Replaced, finish what is left of the old file first
+            lines = self._read()
+            self.reset()
+        if self.file is None:
+            self.open()
+        elif stat.st_size < self.file_position + len(self.pending):
+            # Truncated
+            self.file_position = 0
+            self.signature = None
+            self.pending.clear()
+            self.file.seek(0)
+
+        lines.extend(self._read())
+        if self.signature is None or self.signature["signature_size"] < SIGNATURE_BYTES:
+            self.signature = file_signature(self.log_file)
+        if lines:
+            self.last_timestamp = lines[-1][0]
+        return lines
+
+    def _read(self):
+        total = 0
+        while total < BATCH_SIZE:
+            size = self.file.readinto(self.buffer)
+            if not size:
+                break
+            self.pending += memoryview(self.buffer)[:size]
+            total += size
+
+        end = self.pending.rfind(b'\n') + 1
+        if not end:
+            return []
+        data = self.pending[:end].decode('utf-8', errors='replace')
+        del self.pending[:end]
+        self.file_position += end
+
+        lines = []
+        for line in data.split('\n'):
+            if(len(line.strip()) > 0):
+                lines.append(self.parse_line(line))
+        return lines
 
     def parse_line(self, line):
         """
@@ -47,75 +127,143 @@ class LogReaderHandler(PatternMatchingEventHandler):
         index = line.find("]") + 1
         sdate = line[1:index - 1].strip()
         text = line[index:].strip()
-        return datetime.strptime(sdate, '%a %b %d %H:%M:%S %Y'), text
+        return self.timestamp_parser.parse(sdate), text
+
+class LogReaderHandler(FileSystemEventHandler):
+    def __init__(self, log_reader):
+        super(LogReaderHandler, self).__init__()
+        self.log_reader = log_reader
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.log_reader.process(event.src_path, created=True)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.log_reader.process(event.src_path)
 
 class LogReader():
-    def __init__(self):
-        self.running = Event()
-        self.thread = None
-        self.observer = None
-        self.watcher = None
-        self.watching = True
+    """
+    Tails the log files of every profile at once. A single watchdog observer
+    watches each log directory, and modification events are routed to the
+    LogFileReader registered for that path. Lines are emitted per read chunk
+    together with the profile of the file they came from.
 
-    def start(self):
-        filename = os.path.basename(self.log_file)
-        path = os.path.dirname(self.log_file)
+    With a LogCheckpoints store, the offset of every file is checkpointed as
+    it is read. When resume is enabled, logs registered before start() pick
+    up from their checkpoint, if it is recent enough, and the backlog is read
+    in one pass before live tailing takes over. Backlog lines logged before
+    start() are emitted as backlog_lines instead of new_lines: they already
+    happened, so they only catch up state and fire nothing.
+    """
+    def __init__(self, checkpoints=None):
+        self.observer = None
+        self.handler = LogReaderHandler(self)
+        self.readers = {}
+        self.watches = {}
+        self.lock = Lock()
+        self.checkpoints = checkpoints
+        self.resume = False
+        self.max_catch_up = 600
+        # Lines logged before this are backlog
+        self.started_at = None
 
-        handler = LogReaderHandler(patterns = [filename])
+    def setResume(self, resume, max_catch_up=None):
+        self.resume = resume
+        if max_catch_up is not None:
+            self.max_catch_up = max_catch_up
 
-        # Set up observer
-        self.observer = Observer()
-        self.observer.schedule(handler, path=path, recursive=False)
-        self.observer.start()
+    def start(self):
+        with self.lock:
+            if self.observer:
+                return
+            self.started_at = datetime.now().replace(microsecond=0)
+            self.observer = Observer()
+            self.observer.start()
+            self._schedule()
+            backlog = [path for path, reader in self.readers.items() if reader.backlog]
+        if backlog:
+            Thread(target=self.catchUp, args=(backlog,), daemon=True).start()
 
-        self.running.set()
-        #self.thread = Thread(target=self.run, args=(self.running,))
-        #self.thread.start()
+    def catchUp(self, paths):
+        for path in paths:
+            self.process(path)
 
     def stop(self):
-        self.running.clear()
-        if self.watcher:
-            self.watcher.close()
-        if self.thread:
-            self.thread.join()
-        if self.observer:
-            self.observer.stop()
-            self.observer.join()
-            self.observer = None
-        if hasattr(self, 'handler'):
-            self.handler.file_positions.clear()
-            self.handler = None
-
-    def setLogFile(self, log_file):
-        self.log_file = log_file
+        with self.lock:
+            if self.observer:
+                self.observer.stop()
+                self.observer.join()
+                self.observer = None
+            self.watches.clear()
+            for reader in self.readers.values():
+                with reader.lock:
+                    reader.close()
+        if self.checkpoints:
+            self.checkpoints.flush()
 
-    def run(self, running):
-        if os.path.isfile(self.log_file):
-            self.watcher = self.init_tail_file(self.log_file)
-            while running.is_set():
-                self.watcher.loop(blocking=False)
-                time.sleep(0.1)
+    def setProfiles(self, profiles):
+        """Registers a reader per profile log file, keeping existing offsets."""
+        with self.lock:
+            readers = {}
+            for profile in profiles:
+                if not profile.log_file:
+                    continue
+                path = normalize_path(profile.log_file)
+                reader = self.readers.get(path)
+                if reader is None:
+                    reader = LogFileReader(profile.log_file, profile)
+                    if self.resume and self.checkpoints and not self.observer:
+                        reader.file_position = self.checkpoints.resumeOffset(path, profile.log_file, self.max_catch_up)
+                        reader.backlog = reader.file_position is not None
+                    if reader.file_position is None and os.path.isfile(profile.log_file):
+                        # Tail from the end as of registration, not as of the first event
+                        reader.file_position = os.path.getsize(profile.log_file)
+                reader.profile = profile
+                readers[path] = reader
+            for path, reader in self.readers.items():
+                if path not in readers:
+                    with reader.lock:
+                        reader.close()
+            self.readers = readers
+            if self.observer:
+                self._schedule()
 
-    def parse_line(self, line):
-        """
-        Parses and then returns an everquest log entry's date and text.
-        """
-        index = line.find("]") + 1
-        sdate = line[1:index - 1].strip()
-        text = line[index:].strip()
-        return datetime.strptime(sdate, '%a %b %d %H:%M:%S %Y'), text
+    def _schedule(self):
+        directories = {os.path.dirname(path) for path in self.readers}
+        for directory, watch in list(self.watches.items()):
+            if directory not in directories:
+                self.observer.unschedule(watch)
+                del self.watches[directory]
+        for directory in directories:
+            if directory not in self.watches and os.path.isdir(directory):
+                self.watches[directory] = self.observer.schedule(self.handler, path=directory, recursive=False)
 
-    def callback(self, filename, lines):
-        for line in lines:
-            if(len(line.strip()) > 0):
-                timestamp, text = self.parse_line(line)
-                QApplication.instance()._signals["logreader"].new_line.emit(timestamp, text)
-
-    def init_tail_file(self, filename):
-        return LogWatcher(".",
-                          self.callback,
-                          ["log"],
-                          filename,
-                          persistent_checkpoint=False,
-                          file_signature_bytes=32,
-                          strict_extension_check=True)
+    def process(self, file_path, created=False):
+        path = normalize_path(file_path)
+        with self.lock:
+            reader = self.readers.get(path)
+        if reader is None:
+            return
+        with reader.lock:
+            if created:
+                reader.reset()
+            backlog, reader.backlog = reader.backlog, False
+            signals = QApplication.instance()._signals["logreader"]
+            while True:
+                lines = reader.read_new_lines()
+                if not lines:
+                    break
+                if backlog:
+                    split = 0
+                    while split < len(lines) and lines[split][0] < self.started_at:
+                        split += 1
+                    if split:
+                        signals.backlog_lines.emit(reader.profile, lines[:split])
+                    if split < len(lines):
+                        backlog = False
+                        signals.new_lines.emit(reader.profile, lines[split:])
+                else:
+                    signals.new_lines.emit(reader.profile, lines)
+            if self.checkpoints:
+                self.checkpoints.update(path, reader.file_position, reader.signature, reader.last_timestamp)
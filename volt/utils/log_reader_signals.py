@@ -1,6 +1,24 @@
 from PySide6.QtCore import QObject, Signal
 
 class LogReaderSignals(QObject):
+    # One emit per read chunk: the source profile and a list of (timestamp, text) tuples
+    new_lines = Signal(object, list)
+    # Per line compatibility signal, relayed from new_lines on the GUI thread
     new_line = Signal(object, str)
+    # Lines logged before Volt started, read when resuming from a checkpoint
+    backlog_lines = Signal(object, list)
     def __init__(self):
         super().__init__()
+        self.new_lines.connect(self.relayLines)
+
+    def relayLines(self, profile, lines):
+        for timestamp, text in lines:
+            self.new_line.emit(timestamp, text)
+
+
+def each_line(parse):
+    """Adapts a per line parse(timestamp, text) consumer to new_lines batches."""
+    def parse_lines(profile, lines):
+        for timestamp, text in lines:
+            parse(timestamp, text)
+    return parse_lines
@@ -0,0 +1,79 @@
+import os
+import hashlib
+import ujson as json
+
+from threading import Lock, Timer
+
+class PatternCache():
+    """
+    Persistent cache of what RegexEngine.compile derives from a search text:
+    the translated pattern, replace_char and required literals, keyed by a
+    hash of the text and flags. The whole cache is dropped when version
+    (a hash of the translation code) changes. Like LogCheckpoints, new
+    entries are written on a coalesced schedule through a temp file.
+    """
+    # Entries not used since startup are dropped on save above this size
+    MAX_ENTRIES = 20000
+
+    def __init__(self, path, version, flush_interval=5.0):
+        self.path = path
+        self.version = version
+        self.flush_interval = flush_interval
+        self.entries = {}
+        self.used = set()
+        self.lock = Lock()
+        self.dirty = False
+        self.timer = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.version:
+            self.entries = data.get("patterns", {})
+
+    @staticmethod
+    def key(text, flags):
+        return hashlib.sha1(f"{flags}:{text}".encode("utf-8")).hexdigest()
+
+    def get(self, text, flags):
+        key = self.key(text, flags)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.used.add(key)
+            return entry
+
+    def put(self, text, flags, entry):
+        key = self.key(text, flags)
+        with self.lock:
+            self.entries[key] = entry
+            self.used.add(key)
+            self.dirty = True
+            if self.timer is None:
+                self.timer = Timer(self.flush_interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            if not self.dirty:
+                return
+            if len(self.entries) > self.MAX_ENTRIES:
+                self.entries = {key: entry for key, entry in self.entries.items() if key in self.used}
+            data = json.dumps({"version": self.version, "patterns": self.entries})
+            self.dirty = False
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save pattern cache: {e}")
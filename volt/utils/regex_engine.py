@@ -1,8 +1,30 @@
 import re
+import sys
+import inspect
+import marshal
+import hashlib
+
+from volt.utils import literal_prefilter
+from volt.utils.literal_prefilter import required_literals
+
+def translation_version():
+    """
+    Hash of the code turning search texts into expressions and literals,
+    so cached translations are dropped when it changes.
+    """
+    digest = hashlib.sha1(sys.version.encode("utf-8"))
+    digest.update(RegexEngine.REGEX_CONVERT_TAGS.pattern.encode("utf-8"))
+    functions = [RegexEngine.compile, RegexEngine.translate.__func__]
+    functions += [value for value in vars(literal_prefilter).values() if inspect.isfunction(value)]
+    for function in functions:
+        digest.update(marshal.dumps(function.__code__))
+    return digest.hexdigest()
 
-from PySide6.QtWidgets import QApplication
 
 class RegexEngine():
+    # Set to a PatternCache to reuse translations between runs
+    cache = None
+
     REGEX_INTERGER_ONLY = re.compile("\{([0-9]?)\}")
     REGEX_CONVERT_TAGS = re.compile("\{([A-Za-z][0-9]?)\}")
 
@@ -10,22 +32,56 @@ class RegexEngine():
         self.expression = None
         self.duration = None
         self.replace_char = ""
+        self.literals = None
         self.m = None
 
     def compile(self, text):
+        """
+        Compiles a GINA style search text. With a cache set (see PatternCache)
+        the translation and literal extraction of texts seen before are read
+        from it and only re.compile runs.
+        """
+        flags = re.IGNORECASE
+        entry = self.cache.get(text, flags) if self.cache else None
+        if entry is not None:
+            self.replace_char = entry["replace_char"]
+            self.expression = re.compile(entry["pattern"], flags)
+            self.literals = frozenset(entry["literals"]) if entry["literals"] is not None else None
+            return
+
+        pattern, self.replace_char = self.translate(text)
+        try:
+            self.expression = re.compile(pattern, flags)
+        except Exception as e:
+            self.expression = re.compile(re.escape(pattern), flags)
+
+        self.literals = required_literals(self.expression)
+
+        if self.cache:
+            self.cache.put(text, flags, {
+                "pattern": self.expression.pattern,
+                "replace_char": self.replace_char,
+                "literals": sorted(self.literals) if self.literals is not None else None
+            })
+
+    @classmethod
+    def translate(cls, text):
+        """Returns the Python regex for a search text and its replace_char."""
+        replace_char = ""
+
         # Clean up some weirdness
         text = text.replace("^{", "{")
         text = text.replace("${", "{")
 
-        matches = self.REGEX_CONVERT_TAGS.findall(text)
+        matches = cls.REGEX_CONVERT_TAGS.findall(text)
 
         if len(set(matches)) == 1 and len(matches) > 1:
-            self.replace_char = matches[0]
+            replace_char = matches[0]
             for index, match in enumerate(matches):
                 text = text.replace(f"{{{match}}}", f"(?<{match}{index+1}>.+)", 1)
 
         # Find all the {X} style tags and convert them
-        for index, match in enumerate(self.REGEX_CONVERT_TAGS.findall(text)):
+        for index, match in enumerate(cls.REGEX_CONVERT_TAGS.findall(text)):
             text = text.replace(f"{{{match}}}", f"(?<{match}>.+)", 1)
 
         # Replace timestamp matcher
@@ -35,11 +91,15 @@ class RegexEngine():
         # Fix for newer perl regex stuff
         text = text.replace("?<", "?P<")
 
-        try:
-            self.expression = re.compile(text, re.IGNORECASE)
-        except Exception as e:
-            self.expression = re.compile(re.escape(text), re.IGNORECASE)
+        return text, replace_char
 
+    def wants(self, hits):
+        """
+        True when the prefilter hits for a line (see LiteralPrefilter.scan)
+        leave a chance of this expression matching. None means no prefilter
+        information, so the expression is always evaluated.
+        """
+        return self.literals is None or hits is None or not self.literals.isdisjoint(hits)
 
     def match(self, text):
         self.m = self.expression.search(text)
@@ -54,7 +114,8 @@ class RegexEngine():
                 pass
         return seconds
 
-    def execute(self, text, matches=None):
+    def execute(self, text, matches=None, profile=None):
+        """Fills the tags of text from matches, {c} is the name of profile."""
         if matches == None:
             return None
 
@@ -92,8 +153,8 @@ class RegexEngine():
                         text = text.replace(f"{{{index + 1}}}", match)
                         text = text.replace(f"{{{self.replace_char}{index + 1}}}", match)
 
-            if QApplication.instance().current_profile:
-                text = text.replace("{c}", QApplication.instance().current_profile.name)
-                text = text.replace("{C}", QApplication.instance().current_profile.name)
+            if profile:
+                text = text.replace("{c}", profile.name)
+                text = text.replace("{C}", profile.name)
 
         return text
@@ -0,0 +1,22 @@
+import time
+
+class StartupTimer():
+    """
+    Times the phases of startup. mark(name) ends the phase running since the
+    previous mark, report() lists them all.
+    """
+    def __init__(self):
+        self.started_at = self.marked_at = time.perf_counter()
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.marked_at) * 1000))
+        self.marked_at = now
+
+    def total(self):
+        return (self.marked_at - self.started_at) * 1000
+
+    def report(self):
+        phases = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.phases)
+        return f"Startup took {self.total():.0f} ms: {phases}"
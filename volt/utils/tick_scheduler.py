@@ -0,0 +1,98 @@
+import time
+import heapq
+import traceback
+
+from PySide6.QtCore import QObject, QTimer
+
+class TickScheduler(QObject):
+    """
+    Drives every Timer and TextTrigger from a single QTimer. Ticking items
+    have onTick(now) called once per FRAME_INTERVAL while visible, and
+    deadlines (ending, ended, text expiry) are kept in a heap and fired when
+    due. With nothing ticking the QTimer only wakes for the next deadline,
+    and with nothing scheduled it is stopped. Times are in milliseconds,
+    as returned by now().
+    """
+    FRAME_INTERVAL = 100
+
+    def __init__(self):
+        super().__init__()
+
+        self.ticking = {}
+        self.deadlines = []
+        self.sequence = 0
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.tick)
+
+    @staticmethod
+    def now():
+        return time.time() * 1000
+
+    def add(self, item):
+        """Calls item.onTick(now) every frame until removed."""
+        self.ticking[id(item)] = item
+        self.wake()
+
+    def remove(self, item):
+        self.ticking.pop(id(item), None)
+        self.reschedule(item)
+
+    def schedule(self, item, when, callback):
+        """
+        Calls callback() at when, unless item is removed or rescheduled
+        (see reschedule) first.
+        """
+        self.sequence += 1
+        heapq.heappush(self.deadlines, (when, self.sequence, getattr(item, "generation", 0), item, callback))
+        self.wake()
+
+    def reschedule(self, item):
+        """
+        Drops every pending deadline of item, they are skipped when they come
+        up. The caller schedules new ones.
+        """
+        item.generation = getattr(item, "generation", 0) + 1
+
+    def wake(self):
+        interval = self.interval(self.now())
+        if interval is None:
+            self.timer.stop()
+        elif not self.timer.isActive() or interval < self.timer.remainingTime():
+            self.timer.start(interval)
+
+    def interval(self, now):
+        # Drop deadlines of removed items rather than waking up for them
+        while self.deadlines and self.deadlines[0][2] != getattr(self.deadlines[0][3], "generation", 0):
+            heapq.heappop(self.deadlines)
+
+        intervals = []
+        if self.ticking:
+            intervals.append(self.FRAME_INTERVAL)
+        if self.deadlines:
+            intervals.append(max(0, int(self.deadlines[0][0] - now)))
+        return min(intervals) if intervals else None
+
+    def tick(self):
+        now = self.now()
+
+        while self.deadlines and self.deadlines[0][0] <= now:
+            when, sequence, generation, item, callback = heapq.heappop(self.deadlines)
+            if generation != getattr(item, "generation", 0):
+                continue
+            try:
+                callback()
+            except Exception:
+                traceback.print_exc()
+
+        for item in list(self.ticking.values()):
+            if item.isVisible():
+                try:
+                    item.onTick(now)
+                except Exception:
+                    traceback.print_exc()
+
+        interval = self.interval(self.now())
+        if interval is not None:
+            self.timer.start(interval)
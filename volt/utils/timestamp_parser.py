@@ -0,0 +1,43 @@
+from datetime import datetime
+
+MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12
+}
+
+WEEKDAYS = {"Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"}
+
+class TimestampParser():
+    """
+    Parses the fixed "Www Mmm dd HH:MM:SS YYYY" prefix of EverQuest log lines
+    by slicing at fixed offsets. Consecutive lines almost always share the
+    same second, so the last parsed string is memoized. Anything that does
+    not fit the fixed layout falls back to strptime.
+    """
+    FORMAT = '%a %b %d %H:%M:%S %Y'
+
+    def __init__(self):
+        # Single tuple so readers on other threads never see a torn pair
+        self._last = (None, None)
+
+    def parse(self, sdate):
+        last_sdate, last_value = self._last
+        if sdate == last_sdate:
+            return last_value
+
+        value = None
+        if len(sdate) == 24 and sdate[3] == " " and sdate[7] == " " and sdate[10] == " " and \
+           sdate[13] == ":" and sdate[16] == ":" and sdate[19] == " " and sdate[:3] in WEEKDAYS:
+            month = MONTHS.get(sdate[4:7])
+            if month:
+                try:
+                    value = datetime(int(sdate[20:24]), month, int(sdate[8:10]),
+                                     int(sdate[11:13]), int(sdate[14:16]), int(sdate[17:19]))
+                except ValueError:
+                    value = None
+
+        if value is None:
+            value = datetime.strptime(sdate, self.FORMAT)
+
+        self._last = (sdate, value)
+        return value
@@ -0,0 +1,79 @@
+import time
+import traceback
+
+from PySide6.QtCore import QObject
+from PySide6.QtWidgets import QApplication
+
+from volt.utils.trigger_set import TriggerSet
+
+
+class TriggerDispatcher(QObject):
+    """
+    Single subscriber to the log reader signals. Every batch of new lines is
+    evaluated in one loop against the triggers enabled in the profile the
+    lines came from, so each boxed character runs its own trigger set.
+    """
+
+    def __init__(self, signals):
+        super().__init__()
+
+        self._source = None
+        self._triggers = None
+        self._sets = {}
+
+        signals.new_lines.connect(self.onLogLines)
+        signals.backlog_lines.connect(self.onBacklogLines)
+
+    def setTriggerSource(self, source):
+        """source() returns every Trigger in tree order."""
+        self._source = source
+        self.invalidate()
+
+    def invalidate(self):
+        self._triggers = None
+        self._sets.clear()
+
+    def triggerSet(self, profile):
+        key = id(profile)
+        trigger_set = self._sets.get(key)
+        if trigger_set is None:
+            if self._triggers is None:
+                self._triggers = list(self._source()) if self._source else []
+            trigger_ids = profile.trigger_id_set if profile else frozenset()
+            triggers = [trigger for trigger in self._triggers if trigger.trigger_id in trigger_ids]
+            for trigger in triggers:
+                trigger.ensureCompiled()
+            trigger_set = TriggerSet(triggers)
+            self._sets[key] = trigger_set
+        return trigger_set
+
+    def onLogLines(self, profile, lines):
+        if profile is None:
+            profile = QApplication.instance().current_profile
+        trigger_set = self.triggerSet(profile)
+        now = time.time()
+        for timestamp, text in lines:
+            triggers, hits = trigger_set.candidates(text)
+            for trigger in triggers:
+                try:
+                    trigger.onLogUpdate(timestamp, text, now, hits, profile)
+                except Exception:
+                    traceback.print_exc()
+
+    def onBacklogLines(self, profile, lines):
+        """
+        Lines logged while Volt was not running. They are over, so they only
+        bring counters, cooldowns and variables up to date, as of the time
+        each was logged.
+        """
+        if profile is None:
+            profile = QApplication.instance().current_profile
+        trigger_set = self.triggerSet(profile)
+        for timestamp, text in lines:
+            triggers, hits = trigger_set.candidates(text)
+            now = timestamp.timestamp()
+            for trigger in triggers:
+                try:
+                    trigger.onLogReplay(text, now, hits, profile)
+                except Exception:
+                    traceback.print_exc()
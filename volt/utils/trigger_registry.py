@@ -0,0 +1,67 @@
+from volt.models.trigger import Trigger
+
+class TriggerRegistry():
+    """
+    Index over the items of the trigger tree: trigger id to Trigger and
+    group id to TriggerGroups (GINA imports can repeat group ids). Items are
+    registered with their whole subtree when they are added to the tree and
+    unregistered when removed, see TriggersManager.addItem and removeItem.
+    Groups still waiting to be populated only have themselves registered.
+    version changes whenever items are added or removed.
+    """
+    def __init__(self):
+        self.triggers = {}
+        self.groups = {}
+        self.version = 0
+
+    def clear(self):
+        self.triggers.clear()
+        self.groups.clear()
+        self.version += 1
+
+    def add(self, item):
+        self.version += 1
+        if type(item) is Trigger:
+            self.triggers[item.trigger_id] = item
+        else:
+            self.groups.setdefault(item.group_id, []).append(item)
+            for i in range(item.childCount()):
+                self.add(item.child(i))
+
+    def remove(self, item):
+        self.version += 1
+        if type(item) is Trigger:
+            if self.triggers.get(item.trigger_id) is item:
+                del self.triggers[item.trigger_id]
+        else:
+            groups = [group for group in self.groups.get(item.group_id, []) if group is not item]
+            if groups:
+                self.groups[item.group_id] = groups
+            else:
+                self.groups.pop(item.group_id, None)
+            for i in range(item.childCount()):
+                self.remove(item.child(i))
+
+    def trigger(self, trigger_id):
+        return self.triggers.get(trigger_id)
+
+    def group(self, group_id):
+        groups = self.groups.get(group_id)
+        return groups[0] if groups else None
+
+    def allGroups(self):
+        return [group for groups in self.groups.values() for group in groups]
+
+    def triggersById(self, trigger_ids):
+        """The registered triggers among trigger_ids, unknown ids are skipped."""
+        triggers = self.triggers
+        return [triggers[trigger_id] for trigger_id in trigger_ids if trigger_id in triggers]
+
+    def subtreeIds(self, item):
+        """Ids of the triggers at or below item."""
+        if type(item) is Trigger:
+            return [item.trigger_id]
+        ids = []
+        for i in range(item.childCount()):
+            ids.extend(self.subtreeIds(item.child(i)))
+        return ids
@@ -0,0 +1,46 @@
+from volt.utils.literal_prefilter import LiteralPrefilter
+
+
+class TriggerSet():
+    """
+    The enabled triggers of one profile, with a LiteralPrefilter built over
+    the required literals of every trigger, early ender and variable. Only
+    the triggers whose literals appear in a line are evaluated for it.
+    Triggers with any pattern lacking an extractable literal are always
+    evaluated.
+    """
+
+    def __init__(self, triggers):
+        self.triggers = triggers
+        self.always = []
+        self.by_literal = {}
+
+        for index, trigger in enumerate(self.triggers):
+            engines = [engine for engine in trigger.regexEngines() if engine.expression]
+            if any(engine.literals is None for engine in engines):
+                self.always.append(index)
+                continue
+            for engine in engines:
+                for literal in engine.literals:
+                    self.by_literal.setdefault(literal, set()).add(index)
+
+        self.prefilter = LiteralPrefilter(self.by_literal.keys())
+
+    def candidates(self, text):
+        """
+        Returns the triggers to evaluate for a line along with the prefilter
+        hits, or every trigger and None when the line cannot be prefiltered.
+        """
+        if not text.isascii():
+            # Case folding outside ASCII can match literals in ways a plain
+            # lower() scan would miss
+            return self.triggers, None
+
+        hits = self.prefilter.scan(text)
+        if not hits:
+            return [self.triggers[index] for index in self.always], hits
+
+        indexes = set(self.always)
+        for literal in hits:
+            indexes.update(self.by_literal[literal])
+        return [self.triggers[index] for index in sorted(indexes)], hits
@@ -0,0 +1,443 @@
+"""
+Delivers webhook messages from a small pool of worker threads. Every host
+gets one requests.Session, so messages reuse kept-alive connections
+instead of paying a TCP and TLS handshake each.
+"""
+import json
+import math
+import time
+import heapq
+import itertools
+import requests
+
+from collections import deque
+from email.utils import parsedate_to_datetime
+from threading import Condition, Thread
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+# Longest coalesce_window in seconds a webhook may hold messages back for
+MAX_COALESCE_WINDOW = 60.0
+
+class WebhookRequest():
+    """A message ready to send, built on the GUI thread from a Webhook."""
+    __slots__ = ("name", "method", "url", "headers", "body", "host", "attempts",
+                 "webhook_id", "message", "created", "outbox_id")
+
+    def __init__(self, name, method, url, headers=None, body=None, webhook_id=None, message=None):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.headers = headers or {}
+        # Keyword arguments of requests: json or data
+        self.body = body or {}
+        parts = urlsplit(url)
+        self.host = f"{parts.scheme}://{parts.netloc}"
+        self.attempts = 0
+        self.webhook_id = webhook_id
+        self.message = message
+        self.created = time.time()
+        self.outbox_id = None
+
+    @classmethod
+    def fromWebhook(cls, webhook, message):
+        return cls(webhook.name, webhook.method, webhook.url, headers(webhook), payload(webhook.content_type, [message]),
+                   webhook.webhook_id, message)
+
+
+def headers(webhook):
+    """The HTTP headers of webhook, with its authorization."""
+    headers = {}
+    if webhook.content_type:
+        headers['Content-Type'] = webhook.content_type
+
+    if webhook.auth_type == "Bearer Token" and webhook.auth_value:
+        headers['Authorization'] = f'Bearer {webhook.auth_value}'
+    elif webhook.auth_type == "API Key" and webhook.auth_value:
+        headers['Authorization'] = webhook.auth_value
+    elif webhook.auth_type == "Custom Header" and webhook.auth_header and webhook.auth_value:
+        headers[webhook.auth_header] = webhook.auth_value
+
+    if webhook.custom_headers:
+        headers.update(webhook.custom_headers)
+    return headers
+
+
+def payload(content_type, messages):
+    """Keyword arguments of requests sending messages in one body."""
+    if content_type == "application/json":
+        # Discord/Slack webhooks expect {"content": "message"}, messages
+        # that already are JSON are sent as they are, in an array if several
+        objects = []
+        plain = True
+        for message in messages:
+            try:
+                objects.append(json.loads(message))
+                plain = False
+            except (json.JSONDecodeError, TypeError):
+                objects.append({"content": message})
+        if len(objects) == 1:
+            return {"json": objects[0]}
+        if plain:
+            return {"json": {"content": "\n".join(messages)}}
+        return {"json": objects}
+    text = messages[0] if len(messages) == 1 else "\n".join(messages)
+    if content_type == "application/x-www-form-urlencoded":
+        return {"data": {"message": text}}
+    return {"data": text}
+
+
+def coalescing(webhook):
+    """
+    The (window, count, size) webhook coalesces with. The values come
+    straight from the config, so anything that is not a finite number
+    turns coalescing off and the window is capped at MAX_COALESCE_WINDOW.
+    """
+    try:
+        window = float(webhook.coalesce_window)
+        count = int(webhook.coalesce_count)
+        size = int(webhook.coalesce_size)
+    except (TypeError, ValueError, OverflowError):
+        return 0.0, 1, 1
+    if not math.isfinite(window) or window <= 0:
+        return 0.0, 1, 1
+    return min(window, MAX_COALESCE_WINDOW), max(1, count), max(1, size)
+
+
+class WebhookBatch():
+    """Messages to one webhook waiting out its coalescing window."""
+    __slots__ = ("request", "content_type", "messages", "size", "deadline")
+
+    def __init__(self, webhook, message, window):
+        self.request = WebhookRequest.fromWebhook(webhook, message)
+        self.content_type = webhook.content_type
+        self.messages = [message]
+        self.size = len(message)
+        self.deadline = time.monotonic() + window
+
+    def add(self, message):
+        self.messages.append(message)
+        self.size += 1 + len(message)
+
+    def close(self):
+        request = self.request
+        if len(self.messages) > 1:
+            request.body = payload(self.content_type, self.messages)
+            request.message = "\n".join(self.messages)
+        return request
+
+
+def retry_after(response):
+    """Seconds a 429 response asks to wait, None when it does not say."""
+    value = response.headers.get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    # Discord also puts it in the body
+    try:
+        return max(0.0, float(response.json()["retry_after"]))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class WebhookEngine():
+    """
+    Requests wait in a queue of at most queue_size, when it is full the
+    oldest one is dropped (overflow "drop_oldest") or the new one is
+    refused ("drop_newest"). Up to workers threads send them. Connection
+    errors, timeouts, 429 and 5xx responses are retried up to retries
+    times, after backoff * 2^n seconds or what a 429 Retry-After asks for.
+    A 429 holds back every request to that host until it runs out.
+
+    Webhooks with a coalesce_window collect the messages fired within it
+    into one request, see WebhookBatch.
+
+    With a WebhookOutbox every request is saved as it is queued, requests
+    still queued when the engine stops are sent after resume(). The outbox
+    keeps no headers, resume() takes them from the webhook as it is then.
+    """
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+    # Deliveries metrics() averages the latency over
+    LATENCY_SAMPLE = 100
+
+    def __init__(self, outbox=None, workers=4, queue_size=200, overflow="drop_oldest",
+                       retries=3, backoff=1.0, max_backoff=60.0, timeout=10):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.outbox = outbox
+
+        self.condition = Condition()
+        self.queue = deque()
+        # (due, sequence, request) of the requests waiting to be retried
+        self.delayed = []
+        self.sequence = itertools.count()
+        # Host to the time.monotonic() its Retry-After runs out
+        self.blocked = {}
+        # Webhook id to its open WebhookBatch
+        self.batches = {}
+        self.sessions = {}
+        self.threads = []
+        self.idle = 0
+        self.busy = 0
+        self.running = True
+
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+        # Seconds from queueing to delivery of the latest requests sent
+        self.latencies = deque(maxlen=self.LATENCY_SAMPLE)
+
+    def send(self, webhook, message):
+        window, count, size = coalescing(webhook)
+        if window > 0 and message:
+            return self.coalesce(webhook, message, window, count, size)
+        return self.submit(WebhookRequest.fromWebhook(webhook, message))
+
+    def coalesce(self, webhook, message, window, count, size):
+        """Adds message to the open batch of webhook, sending the batch once it is full."""
+        ready = []
+        with self.condition:
+            if not self.running:
+                return False
+            batch = self.batches.get(webhook.webhook_id)
+            if batch is not None and batch.size + 1 + len(message) > size:
+                ready.append(self.batches.pop(webhook.webhook_id))
+                batch = None
+            if batch is None:
+                batch = self.batches[webhook.webhook_id] = WebhookBatch(webhook, message, window)
+                # Someone has to wake up when the window ends
+                if self.idle == 0:
+                    self.startWorker()
+                self.condition.notify()
+            else:
+                batch.add(message)
+            if len(batch.messages) >= count:
+                ready.append(self.batches.pop(webhook.webhook_id))
+
+        for batch in ready:
+            self.submit(batch.close())
+        return True
+
+    def submit(self, request):
+        """Queues request, False when it was refused."""
+        if not self.running:
+            return False
+        if self.outbox:
+            self.outbox.add(request)
+
+        dropped = None
+        with self.condition:
+            if len(self.queue) >= self.queue_size:
+                self.dropped += 1
+                if self.overflow == "drop_newest":
+                    dropped = request
+                else:
+                    dropped = self.queue.popleft()
+            if dropped is not request:
+                self.queue.append(request)
+                if self.idle == 0:
+                    self.startWorker()
+                self.condition.notify()
+
+        if dropped is not None:
+            print(f"Webhook queue full, dropped a message to {dropped.name}")
+            if self.outbox:
+                self.outbox.update(dropped, "dropped")
+        return dropped is not request
+
+    def resume(self, webhooks):
+        """
+        Queues the requests the outbox still has pending, returns how many.
+        webhooks(webhook_id) is the Webhook a request goes to, or None when
+        it was deleted and its requests are dropped.
+        """
+        if not self.outbox:
+            return 0
+        pending = []
+        for request, next_attempt in self.outbox.pending():
+            webhook = webhooks(request.webhook_id)
+            if webhook is None:
+                self.outbox.update(request, "dropped", error="Webhook deleted")
+                continue
+            request.headers = headers(webhook)
+            pending.append((request, next_attempt))
+
+        now, wall = time.monotonic(), time.time()
+        with self.condition:
+            for request, next_attempt in pending:
+                if next_attempt > wall:
+                    heapq.heappush(self.delayed, (now + next_attempt - wall, next(self.sequence), request))
+                else:
+                    self.queue.append(request)
+            for i in range(min(len(pending), self.workers)):
+                self.startWorker()
+            self.condition.notify_all()
+        return len(pending)
+
+    def startWorker(self):
+        """Holds the condition."""
+        if len(self.threads) < self.workers:
+            thread = Thread(target=self.work, daemon=True)
+            self.threads.append(thread)
+            thread.start()
+
+    def work(self):
+        while True:
+            with self.condition:
+                request = self.next()
+                if request is None:
+                    return
+                self.busy += 1
+
+            delay = None
+            try:
+                delay = self.deliver(request)
+            finally:
+                with self.condition:
+                    self.busy -= 1
+                    if delay is not None:
+                        heapq.heappush(self.delayed, (time.monotonic() + delay, next(self.sequence), request))
+                    self.condition.notify_all()
+
+    def next(self):
+        """The next request due, waiting for one, None once stopped. Holds the condition."""
+        while self.running:
+            now = time.monotonic()
+            if self.batches:
+                for webhook_id, batch in list(self.batches.items()):
+                    if batch.deadline <= now:
+                        del self.batches[webhook_id]
+                        self.submit(batch.close())
+
+            if self.delayed and self.delayed[0][0] <= now:
+                request = heapq.heappop(self.delayed)[2]
+            elif self.queue:
+                request = self.queue.popleft()
+            else:
+                deadlines = [batch.deadline for batch in self.batches.values()]
+                if self.delayed:
+                    deadlines.append(self.delayed[0][0])
+                self.idle += 1
+                self.condition.wait(min(deadlines) - now if deadlines else None)
+                self.idle -= 1
+                continue
+
+            blocked = self.blocked.get(request.host, 0)
+            if blocked > now:
+                heapq.heappush(self.delayed, (blocked, next(self.sequence), request))
+                continue
+            return request
+        return None
+
+    def session(self, host):
+        with self.condition:
+            session = self.sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.sessions[host] = session
+            return session
+
+    def deliver(self, request):
+        """Sends request once, returns the seconds to wait before retrying it, or None."""
+        request.attempts += 1
+        wait = None
+        try:
+            response = self.session(request.host).request(request.method, request.url, headers=request.headers,
+                                                          timeout=self.timeout, **request.body)
+        except requests.exceptions.RequestException as e:
+            error = str(e)
+            retry = True
+        else:
+            if 200 <= response.status_code < 300:
+                with self.condition:
+                    self.sent += 1
+                    self.latencies.append(time.time() - request.created)
+                if self.outbox:
+                    self.outbox.update(request, "sent")
+                return None
+            error = f"{response.status_code} - {response.text[:200]}"
+            retry = response.status_code in self.RETRY_STATUS
+            if response.status_code == 429:
+                wait = retry_after(response)
+
+        if not retry or request.attempts > self.retries:
+            with self.condition:
+                self.failed += 1
+            print(f"Webhook failed for {request.name}: {error}")
+            if self.outbox:
+                self.outbox.update(request, "failed", error=error)
+            return None
+
+        with self.condition:
+            self.retried += 1
+            if wait is not None:
+                self.blocked[request.host] = time.monotonic() + wait
+        if wait is None:
+            wait = min(self.max_backoff, self.backoff * 2 ** (request.attempts - 1))
+        if self.outbox:
+            self.outbox.update(request, "pending", time.time() + wait, error)
+        return wait
+
+    def wait(self, timeout=None):
+        """Blocks until every queued request was sent or given up on."""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.queue and not self.delayed and not self.busy
+                                                   and not self.batches, timeout)
+
+    def stop(self, timeout=None):
+        """
+        Stops the workers, waiting at most timeout seconds for all of them,
+        requests still queued are only kept by the outbox. The outbox is
+        closed once every worker is done. A worker still in deliver() when
+        the timeout runs out keeps it open, if Volt exits before it finishes
+        its message stays pending and is sent again on the next start.
+        """
+        with self.condition:
+            batches = list(self.batches.values())
+            self.batches = {}
+            self.running = False
+            self.condition.notify_all()
+        if self.outbox:
+            for batch in batches:
+                self.outbox.add(batch.close())
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in self.threads:
+            thread.join(max(0, deadline - time.monotonic()) if deadline is not None else None)
+        self.threads = [thread for thread in self.threads if thread.is_alive()]
+        if self.threads:
+            return
+        for session in self.sessions.values():
+            session.close()
+        self.sessions = {}
+        if self.outbox:
+            self.outbox.close()
+
+    def metrics(self):
+        """Counts since the engine started, queued includes the requests in flight and
+        latency is the average and max seconds to deliver the latest requests sent."""
+        with self.condition:
+            latencies = self.latencies
+            return {
+                "sent": self.sent,
+                "failed": self.failed,
+                "retried": self.retried,
+                "dropped": self.dropped,
+                "queued": len(self.queue) + len(self.delayed) + self.busy + len(self.batches),
+                "latency": sum(latencies) / len(latencies) if latencies else 0.0,
+                "latency_max": max(latencies, default=0.0)
+            }
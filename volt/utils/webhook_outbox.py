@@ -0,0 +1,108 @@
+"""
+Webhook messages waiting to be delivered, kept in an SQLite database so
+the ones still queued when Volt exits or the network drops are sent on
+the next start. Their headers are not saved, as they hold the webhook's
+authorization:
+
+    sqlite3 data/webhook_outbox.db "SELECT state, COUNT(*) FROM outbox GROUP BY state"
+"""
+import os
+import time
+import sqlite3
+import ujson as json
+
+from threading import Lock
+
+from volt.utils.webhook_engine import WebhookRequest
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS outbox ("
+    "id INTEGER PRIMARY KEY, webhook_id, name TEXT NOT NULL, message TEXT, "
+    "method TEXT NOT NULL, url TEXT NOT NULL, headers TEXT NOT NULL, body TEXT NOT NULL, "
+    "attempts INTEGER NOT NULL, next_attempt REAL NOT NULL, created REAL NOT NULL, "
+    "state TEXT NOT NULL, error TEXT)",
+    "CREATE INDEX IF NOT EXISTS outbox_state ON outbox (state, id)"
+)
+# Sent, failed and dropped messages are kept this many seconds
+KEEP = 7 * 24 * 3600
+
+
+class WebhookOutbox():
+    """
+    Every message is inserted as "pending" when it is queued and marked
+    "sent", "failed" or "dropped" once the engine is done with it. The
+    database is in WAL mode without a sync per commit, so this survives
+    Volt exiting or crashing but not the machine losing power.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = Lock()
+        self.connection = None
+
+    def connect(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+            with self.connection:
+                self.connection.execute("DELETE FROM outbox WHERE state != 'pending' AND created < ?",
+                                        (time.time() - KEEP,))
+                # Saved by versions that kept the headers
+                self.connection.execute("UPDATE outbox SET headers = '{}' WHERE headers != '{}'")
+        return self.connection
+
+    def add(self, request):
+        with self.lock:
+            try:
+                connection = self.connect()
+                with connection:
+                    cursor = connection.execute(
+                        "INSERT INTO outbox (webhook_id, name, message, method, url, headers, body, "
+                        "attempts, next_attempt, created, state) VALUES (?, ?, ?, ?, ?, '{}', ?, ?, ?, ?, 'pending')",
+                        (request.webhook_id, request.name, request.message, request.method, request.url,
+                         json.dumps(request.body), request.attempts, request.created, request.created))
+                request.outbox_id = cursor.lastrowid
+            except sqlite3.Error as e:
+                print(f"Could not save webhook message to {request.name}: {e}")
+
+    def update(self, request, state, next_attempt=0, error=None):
+        with self.lock:
+            if request.outbox_id is None or self.connection is None:
+                return
+            try:
+                with self.connection:
+                    self.connection.execute("UPDATE outbox SET state = ?, attempts = ?, next_attempt = ?, error = ? "
+                                            "WHERE id = ?",
+                                            (state, request.attempts, next_attempt, error, request.outbox_id))
+            except sqlite3.Error as e:
+                print(f"Could not update webhook message to {request.name}: {e}")
+
+    def pending(self):
+        """The pending messages as (WebhookRequest, next_attempt) pairs, oldest first, without headers."""
+        with self.lock:
+            if self.connection is None and not os.path.exists(self.path):
+                return []
+            try:
+                rows = self.connect().execute(
+                    "SELECT id, webhook_id, name, message, method, url, body, attempts, next_attempt, "
+                    "created FROM outbox WHERE state = 'pending' ORDER BY id").fetchall()
+            except sqlite3.Error as e:
+                print(f"Could not read webhook outbox: {e}")
+                return []
+
+        pending = []
+        for outbox_id, webhook_id, name, message, method, url, body, attempts, next_attempt, created in rows:
+            request = WebhookRequest(name, method, url, None, json.loads(body), webhook_id, message)
+            request.outbox_id = outbox_id
+            request.attempts = attempts
+            request.created = created
+            pending.append((request, next_attempt))
+        return pending
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
@@ -0,0 +1,64 @@
+from PySide6.QtWidgets import QWidget, QGridLayout, QLineEdit, QPushButton, QLabel, QComboBox, QTableView, QHeaderView, QAbstractItemView
+from PySide6.QtCore import Qt
+
+from volt.models.fire_history_model import FireHistoryModel
+
+class FireHistoryWindow(QWidget):
+    def __init__(self, parent, history, profiles):
+        super(FireHistoryWindow, self).__init__()
+
+        self.setWindowTitle("Trigger History")
+        self._parent = parent
+        self.resize(800, 500)
+
+        self.layout = QGridLayout()
+
+        self.trigger_input = QLineEdit(self)
+        self.trigger_input.setPlaceholderText("Any trigger")
+        self.trigger_input.returnPressed.connect(self.search)
+        self.layout.addWidget(QLabel("Trigger"), 0, 0)
+        self.layout.addWidget(self.trigger_input, 0, 1)
+
+        self.profile_select = QComboBox(self)
+        self.profile_select.addItem("All Profiles")
+        for profile in profiles:
+            self.profile_select.addItem(profile.name)
+        self.layout.addWidget(QLabel("Profile"), 0, 2)
+        self.layout.addWidget(self.profile_select, 0, 3)
+
+        self.text_input = QLineEdit(self)
+        self.text_input.setPlaceholderText("Any text")
+        self.text_input.returnPressed.connect(self.search)
+        self.layout.addWidget(QLabel("Matched Text"), 1, 0)
+        self.layout.addWidget(self.text_input, 1, 1)
+
+        self.since_input = QLineEdit(self)
+        self.since_input.setPlaceholderText("YYYY-MM-DD")
+        self.since_input.returnPressed.connect(self.search)
+        self.layout.addWidget(QLabel("Since"), 1, 2)
+        self.layout.addWidget(self.since_input, 1, 3)
+
+        self.search_btn = QPushButton("Search")
+        self.search_btn.clicked.connect(self.search)
+        self.layout.addWidget(self.search_btn, 0, 4, 2, 1)
+
+        self.model = FireHistoryModel(history)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.layout.addWidget(self.table, 2, 0, 1, 5)
+
+        self.setLayout(self.layout)
+        self.search()
+
+    def search(self):
+        profile = None
+        if self.profile_select.currentIndex() > 0:
+            profile = self.profile_select.currentText()
+        self.model.setFilters(trigger_name=self.trigger_input.text(),
+                              profile=profile,
+                              text=self.text_input.text(),
+                              since=self.since_input.text())
+        self.table.resizeColumnToContents(0)
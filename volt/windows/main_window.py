@@ -7,8 +7,8 @@ from PySide6.QtGui import QStandardItemModel
 
 from volt.models.category import Category
 
-from volt.utils.log_monitor import LogMonitor
 from volt.utils.speaker import Speaker
+from volt.utils.startup_timer import StartupTimer
 
 from volt.managers.home_manager import HomeManager
 from volt.managers.categories_manager import CategoriesManager
@@ -24,6 +24,7 @@ elif sys.platform == "win32":
 class MainWindow(QWidget):
     def __init__(self, application_path):
         super(MainWindow, self).__init__()
+        self.startup_timer = StartupTimer()
 
         geo = self.geometry()
         geo.moveCenter(self.screen().availableGeometry().center())
@@ -34,6 +35,7 @@ class MainWindow(QWidget):
         self.layout = QVBoxLayout()
         self.layout.setAlignment(Qt.AlignCenter | Qt.AlignTop)
         self.speaker = Speaker()
+        self.startup_timer.mark("speaker")
 
         self.main_widget = QWidget()
         self.main_layout = QHBoxLayout(self.main_widget)
@@ -48,6 +50,7 @@ class MainWindow(QWidget):
         self.categories_manager = CategoriesManager(self)
         self.overlays_manager = OverlaysManager(self)
         self.trigger_log_manager = TriggerLogManager(self)
+        self.startup_timer.mark("managers")
 
         self.main_layout.addWidget(self.profiles_manager.profile_list)
         self.main_layout.addWidget(self.triggers_manager.trigger_list)
@@ -55,12 +58,12 @@ class MainWindow(QWidget):
 
         self.setLayout(self.layout)
 
-        self.config_manager.load()
+        QApplication.instance().trigger_dispatcher.setTriggerSource(self.triggers_manager.triggers)
+        self.config_manager.load(self.startup_timer)
 
         self.setupTabs()
         self.layout.addWidget(self.main_widget)
-
-        self.log_monitor = LogMonitor(self.profiles_manager)
+        self.startup_timer.mark("tabs")
 
         self.toggle_lock_overlays = False
         self.focusManager = QTimer()
@@ -71,6 +74,10 @@ class MainWindow(QWidget):
             "project1999"
         ]
 
+        # Opt in with: python main.py --startup-timing
+        if "--startup-timing" in QApplication.instance().arguments():
+            print(self.startup_timer.report())
+
     def toggleLockOverlays(self, event):
         if self.toggle_lock_overlays:
             self.toggle_lock_overlays = False
@@ -132,8 +139,11 @@ class MainWindow(QWidget):
         except:
             pass
 
+        self.config_manager.stop()
+        self.trigger_log_manager.stop()
+        QApplication.instance().webhook_engine.stop(timeout=2)
+        QApplication.instance().pattern_cache.flush()
         self.speaker.stop()
-        self.log_monitor.stop()
         self.profiles_manager.logreader.stop()
         self.overlays_manager.destroy()
 
@@ -2,16 +2,18 @@ import sys
 import time
 from functools import partial
 
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QLineEdit, QPushButton, QApplication, QFontComboBox, QComboBox
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QLineEdit, QPushButton, QApplication, QFontComboBox, QComboBox, QListView, QFrame, QAbstractItemView
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
 
 from volt.triggers.timer import Timer
+from volt.triggers.timer_delegate import TimerDelegate
 from volt.triggers.text_trigger import TextTrigger
 
 from volt.utils.frameless_window_manager import FramelessWindowManager
 
 from volt.models.overlay import Overlay
+from volt.models.timer_model import TimerModel, Descending
 
 if sys.platform == "darwin":
     from AppKit import NSWorkspace
@@ -92,6 +94,24 @@ class OverlayWindow(FramelessWindowManager):
         self.layout.addWidget(self.toolbar)
         self.layout.addLayout(self.trigger_layout)
 
+        if self.data_model.type == "Timer":
+            # Timers are rows of a model painted by one delegate
+            self.timer_model = TimerModel(self.triggers)
+            self.timer_delegate = TimerDelegate(self)
+            self.timer_view = QListView()
+            self.timer_view.setModel(self.timer_model)
+            self.timer_view.setItemDelegate(self.timer_delegate)
+            self.timer_view.setUniformItemSizes(True)
+            self.timer_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+            self.timer_view.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+            self.timer_view.setFrameShape(QFrame.Shape.NoFrame)
+            self.timer_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+            self.timer_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+            self.timer_view.setStyleSheet("QListView { background: transparent; }")
+            self.timer_view.doubleClicked.connect(self.onTimerDoubleClicked)
+            self.layout.addWidget(self.timer_view, 1)
+            self.updateFont()
+
         self.setWidget(self.widget)
         self.setWidgetResizable(True)
         self.base_window_flags = self.windowFlags() | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.FramelessWindowHint | Qt.WindowType.Tool
@@ -103,14 +123,27 @@ class OverlayWindow(FramelessWindowManager):
     def setButton(self, button):
         self.button = button
 
-    def addTimer(self, text, duration, trigger=None, category=None, matches=None):
-        timer = Timer(self, text, duration, trigger=trigger, category=category, matches=matches)
-        self.trigger_layout.addWidget(timer)
-        self.triggers.append(timer)
+    def addTimer(self, text, duration, trigger=None, category=None, matches=None, profile=None):
+        timer = Timer(self, text, duration, trigger=trigger, category=category, matches=matches, profile=profile)
+        self.timer_model.insertTimer(timer, self.timerSortKey(timer))
+        return timer
 
-        self._parent.sortTriggers(self)
+    def timerSortKey(self, timer):
+        key = timer.sortKey(self.data_model.sort_method)
+        if self.data_model.sort_method.endswith("(Desc)"):
+            return Descending(key)
+        return key
 
-        return timer
+    def onTimerDoubleClicked(self, index):
+        index.data(TimerModel.TimerRole).onDoubleClick()
+
+    def updateFont(self):
+        if self.data_model.type == "Timer":
+            self.timer_delegate.setFont(QFont(self.data_model.font, self.data_model.font_size))
+            self.timer_view.doItemsLayout()
+        else:
+            for trigger in self.triggers:
+                trigger.updateFont()
 
     def addTextTrigger(self, text, category=None, matches=None):
         text_trigger = TextTrigger(self, text, category=category, matches=matches)
@@ -178,7 +211,7 @@ class OverlayWindow(FramelessWindowManager):
 
 
     def destroy(self):
-        for trigger in self.triggers:
+        for trigger in list(self.triggers):
             trigger.destroy()
         self.deleteLater()
 
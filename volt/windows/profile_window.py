@@ -62,6 +62,7 @@ class ProfileWindow(QWidget):
         self._profile.setName(self.name_input.text())
         self._profile.setLogFile(self.logfile_input.text())
         self._parent.profile_list.addItem(self._profile)
+        self._parent.refreshLogReaders()
         QApplication.instance().save()
         self.destroy()
 
@@ -47,17 +47,9 @@ class TriggerGroupWindow(QWidget):
         self._trigger_group.setName(self.trigger_groupname_input.text())
         self._trigger_group.setComments(self.comments_input.toPlainText())
 
-        max_group_id = -1
-        items = self._parent.trigger_list.findItems("*", Qt.MatchWrap | Qt.MatchWildcard | Qt.MatchRecursive);
-        for item in items:
-            if type(item) is TriggerGroup and item.group_id > max_group_id:
-                max_group_id = item.group_id
-        self._trigger_group.group_id = max_group_id + 1
-
-        if self._parent_group == None:
-            self._parent.trigger_list.addTopLevelItem(self._trigger_group)
-        else:
-            self._parent_group.addChild(self._trigger_group)
+        self._trigger_group.group_id = self._parent.maxGroupId() + 1
+
+        self._parent.addItem(self._trigger_group, self._parent_group)
 
         QApplication.instance().save()
         self.destroy()
@@ -751,10 +751,7 @@ class TriggerWindow(QWidget):
         self._trigger.setWebhookMessage(self.webhook_message.text())
 
         if self._is_new:
-            if self._trigger_group:
-                self._trigger_group.addChild(self._trigger)
-            else:
-                self._parent.trigger_list.addTopLevelItem(self._trigger)
+            self._parent.addItem(self._trigger, self._trigger_group)
 
         self._trigger.compileExpressions()
         QApplication.instance().save()
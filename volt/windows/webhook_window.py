@@ -1,8 +1,11 @@
+import math
+
 from PySide6.QtWidgets import (QApplication, QWidget, QGridLayout, QLineEdit, QPushButton, 
                                 QLabel, QComboBox, QTextEdit, QGroupBox, QVBoxLayout)
 from PySide6.QtCore import Qt
 
 from volt.models.webhook import Webhook
+from volt.utils.webhook_engine import MAX_COALESCE_WINDOW
 
 class WebhookWindow(QWidget):
     def __init__(self, parent, webhook=None):
@@ -99,11 +102,36 @@ class WebhookWindow(QWidget):
         headers_group.setLayout(headers_layout)
         self.layout.addWidget(headers_group, 5, 0, 1, 3)
 
+        # Coalescing Section
+        coalesce_group = QGroupBox("Coalescing")
+        coalesce_layout = QGridLayout()
+
+        self.coalesce_window_input = QLineEdit(self)
+        self.coalesce_window_input.setText(str(self._webhook.coalesce_window))
+        self.coalesce_window_input.setToolTip(f"Send the messages fired within this many seconds as one, 0 sends each alone, "
+                                              f"at most {MAX_COALESCE_WINDOW:.0f}")
+        coalesce_layout.addWidget(QLabel("Window (s):"), 0, 0)
+        coalesce_layout.addWidget(self.coalesce_window_input, 0, 1)
+
+        self.coalesce_count_input = QLineEdit(self)
+        self.coalesce_count_input.setText(str(self._webhook.coalesce_count))
+        coalesce_layout.addWidget(QLabel("Max Messages:"), 0, 2)
+        coalesce_layout.addWidget(self.coalesce_count_input, 0, 3)
+
+        self.coalesce_size_input = QLineEdit(self)
+        self.coalesce_size_input.setText(str(self._webhook.coalesce_size))
+        self.coalesce_size_input.setToolTip("Discord rejects content over 2000 characters")
+        coalesce_layout.addWidget(QLabel("Max Characters:"), 0, 4)
+        coalesce_layout.addWidget(self.coalesce_size_input, 0, 5)
+
+        coalesce_group.setLayout(coalesce_layout)
+        self.layout.addWidget(coalesce_group, 6, 0, 1, 3)
+
         # Help text
         help_label = QLabel("Tip: Use variables like {S}, {C}, {1}, {2} in your trigger's webhook message")
         help_label.setStyleSheet("color: gray; font-style: italic;")
         help_label.setWordWrap(True)
-        self.layout.addWidget(help_label, 6, 0, 1, 3)
+        self.layout.addWidget(help_label, 7, 0, 1, 3)
 
         # Buttons
         self.saveBtn = QPushButton("Save")
@@ -116,7 +144,7 @@ class WebhookWindow(QWidget):
         self.button_layout.addWidget(self.saveBtn, 0, 0)
         self.button_layout.addWidget(self.cancelBtn, 0, 1)
 
-        self.layout.addLayout(self.button_layout, 7, 0, 1, 3, alignment=Qt.AlignRight)
+        self.layout.addLayout(self.button_layout, 8, 0, 1, 3, alignment=Qt.AlignRight)
 
         self.setLayout(self.layout)
         
@@ -173,6 +201,22 @@ class WebhookWindow(QWidget):
             # If invalid JSON, just use empty dict
             self._webhook.custom_headers = {}
         
+        # Invalid numbers keep the previous value
+        try:
+            window = float(self.coalesce_window_input.text() or 0)
+            if math.isfinite(window):
+                self._webhook.coalesce_window = min(max(0.0, window), MAX_COALESCE_WINDOW)
+        except ValueError:
+            pass
+        try:
+            self._webhook.coalesce_count = max(1, int(self.coalesce_count_input.text() or 1))
+        except ValueError:
+            pass
+        try:
+            self._webhook.coalesce_size = max(1, int(self.coalesce_size_input.text() or 1))
+        except ValueError:
+            pass
+
         self._parent.webhook_list.addItem(self._webhook)
         QApplication.instance().save()
         self.destroy()